@@ -0,0 +1,68 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.container import Container, get_container
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+)
+
+
+@router.get("/stats")
+def get_stats(container: Container = Depends(get_container)):
+    """
+    Runtime counters for monitoring (connection pool, group-commit
+    writer, read cache).
+    """
+    return container.stats()
+
+
+@router.get("/validation")
+def get_validation_metrics(container: Container = Depends(get_container)):
+    """
+    Per-rule validation timings and fire counts, slowest (by total time)
+    first, aggregated over sampled and explicitly profiled validations.
+    """
+    metrics = container.resolve("validation_metrics")
+
+    return {
+        "sample_rate": metrics.sample_rate,
+        "profiled": metrics.profiled,
+        "rules": [asdict(stats) for stats in metrics.stats()],
+    }
+
+
+@router.delete("/validation")
+def reset_validation_metrics(container: Container = Depends(get_container)):
+    container.resolve("validation_metrics").reset()
+    return {"reset": True}
+
+
+@router.get("/revalidation")
+def get_revalidation(container: Container = Depends(get_container)):
+    """
+    Progress and throughput of the stored-warnings revalidation job.
+    """
+    return asdict(container.resolve("revalidation_job").progress())
+
+
+@router.post("/revalidation", status_code=202)
+def start_revalidation(
+    restart: bool = False,
+    container: Container = Depends(get_container),
+):
+    """
+    Starts recomputing every stored warning that is stale for the current
+    rule set, resuming from the last checkpoint unless `restart` is set.
+    """
+    job = container.resolve("revalidation_job")
+
+    try:
+        job.start(restart=restart)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return asdict(job.progress())
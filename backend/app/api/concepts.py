@@ -1,9 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional
-
-from app.application.concept_app_service import ConceptApplicationService
+import json
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from app.application.concept_app_service import ConceptApplicationService, version_fieldset
+from app.domain.common.errors import StatusConflict, VersionConflict
+from app.api.http_caching import (
+    REVALIDATE,
+    concept_etag,
+    if_match_satisfied,
+    not_modified,
+    set_validators,
+    version_etag,
+)
+from app.api.serialization import (
+    concept_to_dict,
+    json_response,
+    ndjson_line,
+    profile_to_dict,
+    version_to_dict,
+)
 from app.container import get_concept_app_service
+from app.core import config
 
 
 router = APIRouter(
@@ -40,95 +62,599 @@ class UpdateConceptRequest(BaseModel):
 
     change_note: str
 
+    # Optimistic concurrency: the version this edit was based on. The
+    # update fails (409) if the concept has moved on. An If-Match header
+    # with the concept's ETag does the same.
+    expected_version: Optional[int] = None
+
 
 class ChangeStatusRequest(BaseModel):
     new_status: str
 
 
+class BatchStatusItem(BaseModel):
+    concept_id: str
+    new_status: str
+    expected_status: Optional[str] = None
+
+
+class BatchStatusRequest(BaseModel):
+    items: List[BatchStatusItem] = Field(
+        ..., min_length=1, max_length=config.BATCH_STATUS_MAX_ITEMS
+    )
+    # "atomic": all items or none; "best_effort": every valid item.
+    mode: str = Field("atomic", pattern="^(atomic|best_effort)$")
+
+
+class BatchGetRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=config.BATCH_GET_MAX_IDS)
+
+
+# Response models document the concept/version payloads (OpenAPI). The
+# routes that return them encode their bodies with `json_response`, so
+# FastAPI neither validates nor re-encodes through these models.
+
+class ConceptOut(BaseModel):
+    id: str
+    current_version: int
+    status: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class VersionOut(BaseModel):
+    id: str
+    concept_id: str
+    version_number: int
+
+    name: str
+    core_definition: str
+    expanded_explanation: str
+    learning_objective: str
+
+    examples: List[str]
+    misconceptions: List[str]
+    scope_boundaries: Optional[str]
+    prerequisites: List[str]
+
+    created_by: str
+    created_at: datetime
+    change_note: Optional[str]
+
+
+class VersionSummaryOut(BaseModel):
+    id: str
+    concept_id: str
+    version_number: int
+    name: str
+    created_by: str
+    created_at: datetime
+    change_note: Optional[str]
+
+
+# With ?fields=, a version is an object of just those fields (plus its
+# id and version_number).
+SparseVersionOut = Dict[str, Any]
+
+
+class ConceptResponse(BaseModel):
+    concept: ConceptOut
+    version: Union[VersionOut, SparseVersionOut]
+    warnings: List[str]
+    # Only on create / update.
+    similar_concepts: Optional[List[Dict[str, Any]]] = None
+    prerequisite_cycle: Optional[List[str]] = None
+    # Only with ?profile=true (create / update).
+    validation_profile: Optional[Dict[str, Any]] = None
+
+
+class ConceptListItem(BaseModel):
+    concept: ConceptOut
+    version: VersionOut
+
+
+class ConceptListResponse(BaseModel):
+    items: List[ConceptListItem]
+    next_cursor: Optional[str]
+    warnings: List[str]
+
+
+class BatchGetItem(BaseModel):
+    concept: ConceptOut
+    version: VersionOut
+    warnings: List[str]
+
+
+class BatchGetResponse(BaseModel):
+    items: List[BatchGetItem]
+    missing: List[str]
+
+
+class ConceptStatusResponse(BaseModel):
+    concept: ConceptOut
+    warnings: List[str]
+
+
+class VersionListResponse(BaseModel):
+    # VersionSummaryOut with view=summary
+    versions: List[Union[VersionOut, VersionSummaryOut, SparseVersionOut]]
+    next_cursor: Optional[str]
+    warnings: List[str]
+
+
+class VersionResponse(BaseModel):
+    version: Union[VersionOut, SparseVersionOut]
+    warnings: List[str]
+
+
+# -----------------------------
+# NDJSON streaming
+# -----------------------------
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that keep reading the request body
+    while they stream the response.
+
+    The stock StreamingResponse may listen for client disconnects by
+    reading `receive`, which would swallow request body chunks. Here the
+    body iterator owns `receive` and sees the disconnect itself.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Yields (line_number, line) from a streamed NDJSON body, skipping
+    blank lines. Only one partial line is ever buffered; a line longer
+    than BULK_IMPORT_MAX_LINE_BYTES yields (line_number, None) and ends
+    the stream.
+    """
+    buffer = b""
+    line_number = 0
+
+    async for chunk in request.stream():
+        buffer += chunk
+
+        while True:
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                break
+
+            line, buffer = buffer[:newline], buffer[newline + 1:]
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+
+        if len(buffer) > config.BULK_IMPORT_MAX_LINE_BYTES:
+            yield line_number + 1, None
+            return
+
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def _parse_bulk_record(line: bytes) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Returns (data, None) for a valid CreateConceptRequest line,
+    (None, error) otherwise.
+    """
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+
+    if not isinstance(record, dict):
+        return None, "Each line must be a JSON object"
+
+    try:
+        return CreateConceptRequest(**record).dict(), None
+    except ValidationError as e:
+        return None, "; ".join(
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+            for err in e.errors()
+        )
+
+
+# -----------------------------
+# Response helpers
+# -----------------------------
+
+FIELDS_QUERY = Query(
+    None,
+    description=(
+        "Comma-separated version fields to return (e.g. name,core_definition); "
+        "the version's id and version_number are always included."
+    ),
+)
+
+
+def _fieldset(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parses a `fields` query parameter; unknown field names are a 400.
+    """
+    if fields is None:
+        return None
+
+    try:
+        return version_fieldset([name.strip() for name in fields.split(",") if name.strip()])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _write_response(body: dict, result) -> dict:
+    # Create / update: near duplicates and any prerequisite cycle found
+    # by the write, and timings if asked for.
+    body["similar_concepts"] = result.similar
+    body["prerequisite_cycle"] = result.cycle
+    if result.profile is not None:
+        body["validation_profile"] = profile_to_dict(result.profile)
+    return body
+
+
 # -----------------------------
 # Routes
 # -----------------------------
 
-@router.post("/")
+@router.post("/", response_model=ConceptResponse)
 def create_concept(
     payload: CreateConceptRequest,
+    profile: bool = False,
     app_service: ConceptApplicationService = Depends(get_concept_app_service),
 ):
     """
     Create a new concept (version 1).
+    With ?profile=true the response also carries per-rule validation timings.
     """
     try:
         result = app_service.create_concept(
             data=payload.dict(),
             created_by="system",  # later: auth user
+            profile=profile,
         )
 
         concept, version = result.value
 
-        return {
+        return json_response(_write_response({
             "concept": concept,
             "version": version,
             "warnings": result.warnings,
-        }
+        }, result))
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("", response_model=ConceptListResponse)
+def list_concepts(
+    status: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
+    created_by: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(
+        config.CONCEPT_LIST_DEFAULT_LIMIT,
+        ge=1,
+        le=config.CONCEPT_LIST_MAX_LIMIT,
+    ),
+    app_service: ConceptApplicationService = Depends(get_concept_app_service),
+):
+    """
+    List concepts with their current version, newest first.
+    Pass `next_cursor` back as `cursor` to get the next page.
+    """
+    try:
+        result = app_service.list_concepts(
+            status=status,
+            updated_since=updated_since,
+            created_by=created_by,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    page, next_cursor = result.value
+
+    return json_response({
+        "items": [
+            {"concept": concept, "version": version}
+            for concept, version in page
+        ],
+        "next_cursor": next_cursor,
+        "warnings": result.warnings,
+    })
+
+
+@router.post("/bulk")
+async def bulk_create_concepts(
+    request: Request,
+    app_service: ConceptApplicationService = Depends(get_concept_app_service),
+):
+    """
+    Bulk import. The body is NDJSON, one CreateConceptRequest per line.
 
+    Records are validated and inserted in chunks (one transaction per
+    chunk) and a result line is streamed back for every input line:
+    {"line": n, "id": "uuid" | null, "warnings": [...], "errors": [...]}
+    """
+
+    def import_chunk(chunk):
+        valid = [(line, data) for line, data, error in chunk if error is None]
+        results = {}
+
+        if valid:
+            try:
+                created = app_service.bulk_create_concepts(
+                    records=[data for _, data in valid],
+                    created_by="system",  # later: auth user
+                ).value
+
+                for (line, _), result in zip(valid, created):
+                    concept, _ = result.value
+                    results[line] = (concept.id, result.warnings, [])
+
+            except ValueError as e:
+                for line, _ in valid:
+                    results[line] = (None, [], [str(e)])
+
+        out = []
+        for line, _, error in chunk:
+            concept_id, warnings, errors = results.get(line, (None, [], [error]))
+            out.append(ndjson_line({
+                "line": line,
+                "id": concept_id,
+                "warnings": warnings,
+                "errors": errors,
+            }))
+
+        return b"".join(out)
+
+    async def results() -> AsyncIterator[bytes]:
+        chunk = []
+
+        async for line_number, line in _ndjson_lines(request):
+            if line is None:
+                # The response has started, so report in-band and stop.
+                chunk.append((line_number, None, "Line is too long"))
+                break
+
+            chunk.append((line_number, *_parse_bulk_record(line)))
+
+            if len(chunk) >= config.BULK_IMPORT_CHUNK_SIZE:
+                yield await run_in_threadpool(import_chunk, chunk)
+                chunk = []
+
+        if chunk:
+            yield await run_in_threadpool(import_chunk, chunk)
+
+    return DuplexStreamingResponse(results(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get("/search")
+def search_concepts(
+    q: str,
+    limit: int = Query(config.SEARCH_DEFAULT_LIMIT, ge=1, le=config.SEARCH_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    app_service: ConceptApplicationService = Depends(get_concept_app_service),
+):
+    """
+    Full-text search over concept name, definition and explanation.
+    """
+    try:
+        result = app_service.search_concepts(q, limit=limit, offset=offset)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    return json_response({
+        "hits": result.value,
+        "warnings": result.warnings,
+    })
+
+
+@router.post("/batch-get", response_model=BatchGetResponse)
+def batch_get_concepts(
+    payload: BatchGetRequest,
+    app_service: ConceptApplicationService = Depends(get_concept_app_service),
+):
+    """
+    Many concepts (with their current version and its warnings) in one
+    round trip, in request order. Ids that match no concept are listed
+    in `missing`.
+    """
+    items, missing = app_service.get_concepts_many(payload.ids).value
+
+    return json_response({
+        "items": [
+            {"concept": concept, "version": version, "warnings": warnings}
+            for concept, version, warnings in items
+        ],
+        "missing": missing,
+    })
+
 
-@router.get("/{concept_id}")
+@router.post("/status:batch")
+def change_status_batch(
+    payload: BatchStatusRequest,
+    app_service: ConceptApplicationService = Depends(get_concept_app_service),
+):
+    """
+    Lifecycle transitions for many concepts in one transaction, with a
+    result per item. In "atomic" mode (the default) nothing is saved
+    unless every item is valid; in "best_effort" mode the valid items
+    are saved. Writes are conditional on the status each item was
+    checked against: an atomic batch that loses a race answers 409.
+    """
+    try:
+        outcomes = app_service.change_status_many(
+            [
+                (item.concept_id, item.new_status, item.expected_status)
+                for item in payload.items
+            ],
+            atomic=payload.mode == "atomic",
+        ).value
+    except StatusConflict as e:
+        return JSONResponse(status_code=409, content={"detail": str(e)})
+
+    return {
+        "applied": sum(outcome.applied for outcome in outcomes),
+        "results": outcomes,
+    }
+
+
+@router.get("/export")
+def export_concepts(
+    status: Optional[str] = None,
+    latest_only: bool = False,
+    app_service: ConceptApplicationService = Depends(get_concept_app_service),
+):
+    """
+    Stream the concept store as NDJSON, one {"concept", "version"} record
+    per line, optionally filtered by status and/or latest versions only.
+    """
+    try:
+        pairs = app_service.export_concepts(
+            status=status,
+            latest_only=latest_only,
+        ).value
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def lines():
+        for concept, version in pairs:
+            yield ndjson_line({
+                "concept": concept_to_dict(concept),
+                "version": version_to_dict(version),
+            })
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get("/prerequisite-order")
+def prerequisite_order(
+    app_service: ConceptApplicationService = Depends(get_concept_app_service),
+):
+    """
+    Every concept id, prerequisites before the concepts that need them.
+    Concepts on or behind a prerequisite cycle are listed in `cyclic`.
+    """
+    result = app_service.prerequisite_order()
+
+    return {
+        "order": result.value.order,
+        "cyclic": result.value.cyclic,
+        "warnings": result.warnings,
+    }
+
+
+@router.get("/{concept_id}", response_model=ConceptResponse)
 def get_concept(
     concept_id: str,
+    request: Request,
+    fields: Optional[str] = FIELDS_QUERY,
     app_service: ConceptApplicationService = Depends(get_concept_app_service),
 ):
     """
     Get concept + latest version.
+    `fields` limits the version to the listed fields; only those are read.
+    Honours If-None-Match: a match is answered (304) from the concept
+    row alone, without loading the version.
     """
+    fieldset = _fieldset(fields)
+
     try:
-        result = app_service.get_concept(concept_id)
+        concept = app_service.get_concept_metadata(concept_id).value
+        etag = concept_etag(concept, app_service.ruleset_version)
+
+        unchanged = not_modified(request, etag, REVALIDATE)
+        if unchanged is not None:
+            return unchanged
+
+        result = app_service.get_concept(concept_id, fields=fieldset)
         concept, version = result.value
 
-        return {
+        response = json_response({
             "concept": concept,
             "version": version,
             "warnings": result.warnings,
-        }
+        })
+        set_validators(response, concept_etag(concept, app_service.ruleset_version), REVALIDATE)
+        return response
 
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
-@router.put("/{concept_id}")
+@router.put("/{concept_id}", response_model=ConceptResponse)
 def update_concept(
     concept_id: str,
     payload: UpdateConceptRequest,
+    request: Request,
+    profile: bool = False,
     app_service: ConceptApplicationService = Depends(get_concept_app_service),
 ):
     """
     Update concept content (creates a new version).
+    With ?profile=true the response also carries per-rule validation timings.
+
+    Conflicting edits are rejected rather than serialized: pass the
+    version the edit is based on as `expected_version` (409 if the
+    concept has moved on) or the concept's ETag as If-Match (412).
+    The response carries the updated concept's ETag.
     """
+    expected_version = payload.expected_version
+    if_match = request.headers.get("if-match")
+
     try:
-        data = payload.dict(exclude={"change_note"}, exclude_none=True)
+        if if_match is not None:
+            current = app_service.get_concept_metadata(concept_id).value
+            if not if_match_satisfied(if_match, concept_etag(current, app_service.ruleset_version)):
+                return JSONResponse(
+                    status_code=412,
+                    content={
+                        "detail": "If-Match does not match the concept's ETag",
+                        "current_version": current.current_version,
+                    },
+                )
+            if expected_version is None:
+                expected_version = current.current_version
+
+        data = payload.dict(exclude={"change_note", "expected_version"}, exclude_none=True)
 
         result = app_service.update_concept(
             concept_id=concept_id,
             data=data,
             created_by="system",
             change_note=payload.change_note,
+            profile=profile,
+            expected_version=expected_version,
         )
 
         concept, version = result.value
 
-        return {
+        response = json_response(_write_response({
             "concept": concept,
             "version": version,
             "warnings": result.warnings,
-        }
+        }, result))
+        response.headers["ETag"] = concept_etag(concept, app_service.ruleset_version)
+        return response
+
+    except VersionConflict as e:
+        return JSONResponse(
+            status_code=409,
+            content={"detail": str(e), "current_version": e.current_version},
+        )
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/{concept_id}/status")
+@router.post("/{concept_id}/status", response_model=ConceptStatusResponse)
 def change_status(
     concept_id: str,
     payload: ChangeStatusRequest,
@@ -136,6 +662,7 @@ def change_status(
 ):
     """
     Change concept lifecycle status.
+    409 if another request changed the status meanwhile.
     """
     try:
         result = app_service.change_status(
@@ -143,51 +670,203 @@ def change_status(
             new_status=payload.new_status,
         )
 
-        return {
+        return json_response({
             "concept": result.value,
             "warnings": result.warnings,
-        }
+        })
+
+    except StatusConflict as e:
+        return JSONResponse(
+            status_code=409,
+            content={"detail": str(e), "current_status": e.current_status},
+        )
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{concept_id}/versions")
-def list_versions(
+@router.get("/{concept_id}/similar")
+def find_similar(
     concept_id: str,
+    limit: int = Query(config.SIMILAR_DEFAULT_LIMIT, ge=1, le=config.SIMILAR_MAX_LIMIT),
+    min_similarity: float = Query(0.5, ge=0.0, le=1.0),
     app_service: ConceptApplicationService = Depends(get_concept_app_service),
 ):
     """
-    List all versions for a concept.
+    Concepts whose current core definition resembles this concept's,
+    most similar first. `similarity` estimates the overlap (0..1).
     """
     try:
-        result = app_service.list_versions(concept_id)
+        result = app_service.find_similar(
+            concept_id,
+            limit=limit,
+            min_similarity=min_similarity,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return json_response({
+        "similar": result.value,
+        "warnings": result.warnings,
+    })
+
+
+@router.get("/{concept_id}/prerequisites")
+def get_prerequisites(
+    concept_id: str,
+    depth: int = Query(config.GRAPH_DEFAULT_DEPTH, ge=1, le=config.GRAPH_MAX_DEPTH),
+    limit: int = Query(config.GRAPH_DEFAULT_LIMIT, ge=1, le=config.GRAPH_MAX_LIMIT),
+    app_service: ConceptApplicationService = Depends(get_concept_app_service),
+):
+    """
+    Transitive prerequisites: what a learner needs before this concept,
+    up to `depth` steps back, nearest first.
+    """
+    try:
+        result = app_service.get_prerequisites(concept_id, depth=depth, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return {
+        "prerequisites": result.value.links,
+        "unresolved": result.value.unresolved,
+        "truncated": result.value.truncated,
+        "warnings": result.warnings,
+    }
 
-        return {
-            "versions": result.value,
-            "warnings": result.warnings,
-        }
 
+@router.get("/{concept_id}/dependents")
+def get_dependents(
+    concept_id: str,
+    depth: int = Query(config.GRAPH_DEFAULT_DEPTH, ge=1, le=config.GRAPH_MAX_DEPTH),
+    limit: int = Query(config.GRAPH_DEFAULT_LIMIT, ge=1, le=config.GRAPH_MAX_LIMIT),
+    app_service: ConceptApplicationService = Depends(get_concept_app_service),
+):
+    """
+    Transitive dependents: concepts that build on this one, up to
+    `depth` steps away, nearest first.
+    """
+    try:
+        result = app_service.get_dependents(concept_id, depth=depth, limit=limit)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
+    return {
+        "dependents": result.value.links,
+        "truncated": result.value.truncated,
+        "warnings": result.warnings,
+    }
+
 
-@router.get("/{concept_id}/versions/{version_number}")
+@router.get("/{concept_id}/versions", response_model=VersionListResponse)
+def list_versions(
+    concept_id: str,
+    request: Request,
+    view: str = Query("full", pattern="^(full|summary)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=config.VERSION_LIST_MAX_LIMIT),
+    stream: bool = False,
+    fields: Optional[str] = FIELDS_QUERY,
+    app_service: ConceptApplicationService = Depends(get_concept_app_service),
+):
+    """
+    List versions for a concept, by version number (`order`).
+    `view=summary` returns only each version's metadata (number, name,
+    author, date, change note), for history views; `fields` returns the
+    listed fields of each version.
+    With a `limit`, pass `next_cursor` back as `cursor` for the next page.
+    `stream=true` sends the versions as NDJSON, one per line, decoded as
+    they are sent.
+    Honours If-None-Match, like GET /concepts/{concept_id}.
+    """
+    try:
+        concept = app_service.get_concept_metadata(concept_id).value
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    etag = concept_etag(concept, app_service.ruleset_version)
+
+    unchanged = not_modified(request, etag, REVALIDATE)
+    if unchanged is not None:
+        return unchanged
+
+    fieldset = _fieldset(fields)
+
+    if stream and view == "summary":
+        raise HTTPException(status_code=400, detail="view=summary cannot be streamed")
+    if fieldset is not None and (stream or view == "summary"):
+        raise HTTPException(
+            status_code=400,
+            detail="fields cannot be combined with view=summary or stream",
+        )
+
+    try:
+        if stream:
+            versions = app_service.stream_versions(
+                concept_id,
+                cursor=cursor,
+                limit=limit,
+                descending=order == "desc",
+            ).value
+        else:
+            result = app_service.list_versions_page(
+                concept_id,
+                cursor=cursor,
+                limit=limit,
+                descending=order == "desc",
+                summary=view == "summary",
+                fields=fieldset,
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if stream:
+        lines = (ndjson_line(version_to_dict(version)) for version in versions)
+        streamed = StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE)
+        set_validators(streamed, etag, REVALIDATE)
+        return streamed
+
+    page, next_cursor = result.value
+
+    response = json_response({
+        "versions": page,
+        "next_cursor": next_cursor,
+        "warnings": result.warnings,
+    })
+    set_validators(response, etag, REVALIDATE)
+    return response
+
+
+@router.get("/{concept_id}/versions/{version_number}", response_model=VersionResponse)
 def get_version(
     concept_id: str,
     version_number: int,
+    request: Request,
+    fields: Optional[str] = FIELDS_QUERY,
     app_service: ConceptApplicationService = Depends(get_concept_app_service),
 ):
     """
-    Get a specific concept version.
+    Get a specific concept version (only the listed `fields`, if given).
+    Versions are immutable, so the ETag depends only on the URL and the
+    rule set their warnings come from, and a matching If-None-Match is
+    answered (304) without touching the store.
     """
-    try:
-        result = app_service.get_version(concept_id, version_number)
+    fieldset = _fieldset(fields)
+    etag = version_etag(concept_id, version_number, app_service.ruleset_version)
 
-        return {
-            "version": result.value,
-            "warnings": result.warnings,
-        }
+    unchanged = not_modified(request, etag, REVALIDATE)
+    if unchanged is not None:
+        return unchanged
 
+    try:
+        result = app_service.get_version(concept_id, version_number, fields=fieldset)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+
+    response = json_response({
+        "version": result.value,
+        "warnings": result.warnings,
+    })
+    set_validators(response, etag, REVALIDATE)
+    return response
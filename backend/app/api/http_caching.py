@@ -0,0 +1,152 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.domain.concept.models import Concept
+
+
+# Concept representations change with every write, and their warnings
+# whenever the rules do (even a version's, whose content never changes):
+# clients may keep them but must revalidate (cheaply, with
+# If-None-Match) before reuse.
+REVALIDATE = "no-cache"
+
+
+# Appended (inside the quotes) to the ETag of a gzip-encoded response:
+# the compressed bytes are a different representation from the identity
+# ones, so they must not share a strong ETag.
+GZIP_ETAG_SUFFIX = "-gzip"
+
+
+def _etag(*parts) -> str:
+    digest = hashlib.sha1(":".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def concept_etag(concept: Concept, ruleset_version: str) -> str:
+    """
+    Strong ETag for representations built from a concept's current state
+    and validated under `ruleset_version`. Every write bumps updated_at,
+    so this changes whenever they may.
+    """
+    return _etag(
+        concept.id,
+        concept.current_version,
+        concept.status,
+        concept.updated_at.isoformat(),
+        ruleset_version,
+    )
+
+
+def version_etag(concept_id: str, version_number: int, ruleset_version: str) -> str:
+    """
+    Strong ETag for one version validated under `ruleset_version`: the
+    content is fixed, only its warnings can change.
+    """
+    return _etag(concept_id, "v", version_number, ruleset_version)
+
+
+def _unencoded(candidate: str) -> str:
+    # A tag we sent on a gzip response names the same resource state.
+    suffix = GZIP_ETAG_SUFFIX + '"'
+    if candidate.endswith(suffix):
+        return candidate[:-len(suffix)] + '"'
+    return candidate
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match uses weak comparison (RFC 9110 13.1.2): a W/ prefix on
+    the client's tags is ignored, as is the gzip suffix.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if _unencoded(candidate) == etag:
+            return True
+
+    return False
+
+
+def if_match_satisfied(if_match: Optional[str], etag: str) -> bool:
+    """
+    If-Match uses strong comparison (RFC 9110 13.1.1): weak tags never
+    match; the gzip suffix is ignored. No If-Match header means no
+    precondition.
+    """
+    if if_match is None:
+        return True
+
+    if if_match.strip() == "*":
+        return True
+
+    return any(
+        _unencoded(candidate.strip()) == etag for candidate in if_match.split(",")
+    )
+
+
+def not_modified(request: Request, etag: str, cache_control: str) -> Optional[Response]:
+    """
+    Returns a 304 response when the request's If-None-Match matches `etag`,
+    None when the full representation must be sent.
+    """
+    if not etag_matches(request.headers.get("if-none-match"), etag):
+        return None
+
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def set_validators(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+class EncodedETagMiddleware:
+    """
+    Goes outside GZipMiddleware. Responses carrying an ETag get
+    `Vary: Accept-Encoding` (GZipMiddleware only adds it to bodies it
+    considered compressing), and gzip-encoded ones get GZIP_ETAG_SUFFIX
+    on their ETag. A 304 echoes the suffixed tag when that is what the
+    client sent.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match", "")
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                etag = headers.get("etag")
+
+                if etag is not None:
+                    if "accept-encoding" not in headers.get("vary", "").lower():
+                        headers.add_vary_header("Accept-Encoding")
+
+                    encoded = etag[:-1] + GZIP_ETAG_SUFFIX + '"'
+                    gzipped = headers.get("content-encoding") == "gzip"
+                    if gzipped or (message["status"] == 304 and encoded in if_none_match):
+                        headers["ETag"] = encoded
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,244 @@
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Response
+
+from app.core import config
+from app.domain.concept.models import (
+    Concept,
+    ConceptVersion,
+    SearchHit,
+    SimilarConcept,
+    VersionSummary,
+)
+from app.persistence.cache import LRUCache
+from app.validation.engine import ValidationProfile
+
+
+def concept_to_dict(concept: Concept) -> Dict[str, Any]:
+    return {
+        "id": concept.id,
+        "current_version": concept.current_version,
+        "status": concept.status,
+        "created_at": concept.created_at.isoformat(),
+        "updated_at": concept.updated_at.isoformat(),
+    }
+
+
+def version_to_dict(version: ConceptVersion) -> Dict[str, Any]:
+    return {
+        "id": version.id,
+        "concept_id": version.concept_id,
+        "version_number": version.version_number,
+        "name": version.name,
+        "core_definition": version.core_definition,
+        "expanded_explanation": version.expanded_explanation,
+        "learning_objective": version.learning_objective,
+        "examples": list(version.examples),
+        "misconceptions": list(version.misconceptions),
+        "scope_boundaries": version.scope_boundaries,
+        "prerequisites": list(version.prerequisites),
+        "created_by": version.created_by,
+        "created_at": version.created_at.isoformat(),
+        "change_note": version.change_note,
+    }
+
+
+def profile_to_dict(profile: ValidationProfile) -> Dict[str, Any]:
+    return {
+        "normalize_seconds": profile.normalize_seconds,
+        "rules": [
+            {"rule_id": t.rule_id, "seconds": t.seconds, "fired": t.fired}
+            for t in profile.rules
+        ],
+    }
+
+
+def ndjson_line(obj: Any) -> bytes:
+    """
+    Encodes one NDJSON record (compact JSON + newline).
+    """
+    return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+
+# -----------------------------
+# JSON bytes
+# -----------------------------
+
+# Response bodies built from domain objects are encoded here directly,
+# instead of FastAPI's jsonable_encoder (which walks every dataclass via
+# asdict and re-checks the type of every value). The output is the same
+# bytes JSONResponse would send: compact separators, non-ASCII kept.
+
+JSON_MEDIA_TYPE = "application/json"
+
+_encode_str = json.encoder.encode_basestring
+_encode_other = json.JSONEncoder(
+    ensure_ascii=False,
+    allow_nan=False,
+    separators=(",", ":"),
+).encode
+
+
+def _encode_optional_str(value: Optional[str]) -> str:
+    return "null" if value is None else _encode_str(value)
+
+
+def _encode_strings(values) -> str:
+    return "[" + ",".join(map(_encode_str, values)) + "]"
+
+
+def _encode_datetime(value: datetime) -> str:
+    return '"' + value.isoformat() + '"'
+
+
+Plan = Tuple[Tuple[str, str, Callable[[Any], str]], ...]
+
+
+def _plan(*fields: Tuple[str, Callable[[Any], str]]) -> Plan:
+    """
+    (attribute, encoder) pairs, in output order, with each key's JSON
+    (and the separator before it) rendered once, up front.
+    """
+    return tuple(
+        (name, ("{" if i == 0 else ",") + _encode_str(name) + ":", encode)
+        for i, (name, encode) in enumerate(fields)
+    )
+
+
+def _encode_with(plan: Plan, obj) -> str:
+    return "".join([
+        prefix + encode(getattr(obj, name))
+        for name, prefix, encode in plan
+    ]) + "}"
+
+
+_CONCEPT_PLAN = _plan(
+    ("id", _encode_str),
+    ("current_version", int.__repr__),
+    ("status", _encode_str),
+    ("created_at", _encode_datetime),
+    ("updated_at", _encode_datetime),
+)
+
+_VERSION_PLAN = _plan(
+    ("id", _encode_str),
+    ("concept_id", _encode_str),
+    ("version_number", int.__repr__),
+    ("name", _encode_str),
+    ("core_definition", _encode_str),
+    ("expanded_explanation", _encode_str),
+    ("learning_objective", _encode_str),
+    ("examples", _encode_strings),
+    ("misconceptions", _encode_strings),
+    ("scope_boundaries", _encode_optional_str),
+    ("prerequisites", _encode_strings),
+    ("created_by", _encode_str),
+    ("created_at", _encode_datetime),
+    ("change_note", _encode_optional_str),
+)
+
+_SUMMARY_PLAN = _plan(
+    ("id", _encode_str),
+    ("concept_id", _encode_str),
+    ("version_number", int.__repr__),
+    ("name", _encode_str),
+    ("created_by", _encode_str),
+    ("created_at", _encode_datetime),
+    ("change_note", _encode_optional_str),
+)
+
+_SIMILAR_PLAN = _plan(
+    ("concept_id", _encode_str),
+    ("version_number", int.__repr__),
+    ("name", _encode_str),
+    ("similarity", float.__repr__),
+)
+
+_SEARCH_HIT_PLAN = _plan(
+    ("concept_id", _encode_str),
+    ("version_number", int.__repr__),
+    ("name", _encode_str),
+    ("score", float.__repr__),
+    ("snippet", _encode_str),
+)
+
+# version id -> (version, its JSON). The version is kept to check a hit
+# against: ids are unique, but this must never serve another object's
+# JSON (tests build versions by hand).
+_version_json = LRUCache(config.RESPONSE_VERSION_JSON_CACHE_ENTRIES)
+
+
+def _encode_concept(concept: Concept) -> str:
+    return _encode_with(_CONCEPT_PLAN, concept)
+
+
+def _encode_version(version: ConceptVersion) -> str:
+    cached = _version_json.get(version.id)
+    if cached is not None and (cached[0] is version or cached[0] == version):
+        return cached[1]
+
+    encoded = _encode_with(_VERSION_PLAN, version)
+    _version_json.put(version.id, (version, encoded))
+    return encoded
+
+
+def _encode_summary(summary: VersionSummary) -> str:
+    return _encode_with(_SUMMARY_PLAN, summary)
+
+
+def _encode_similar(similar: SimilarConcept) -> str:
+    return _encode_with(_SIMILAR_PLAN, similar)
+
+
+def _encode_search_hit(hit: SearchHit) -> str:
+    return _encode_with(_SEARCH_HIT_PLAN, hit)
+
+
+_ENCODERS: Dict[type, Callable[[Any], str]] = {
+    str: _encode_str,
+    int: int.__repr__,
+    bool: lambda value: "true" if value else "false",
+    type(None): lambda value: "null",
+    datetime: _encode_datetime,
+    Concept: _encode_concept,
+    ConceptVersion: _encode_version,
+    VersionSummary: _encode_summary,
+    SimilarConcept: _encode_similar,
+    SearchHit: _encode_search_hit,
+}
+
+
+def _encode(value: Any) -> str:
+    encode = _ENCODERS.get(type(value))
+    if encode is not None:
+        return encode(value)
+
+    if isinstance(value, dict):
+        return "{" + ",".join([
+            _encode_str(key) + ":" + _encode(item)
+            for key, item in value.items()
+        ]) + "}"
+
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(map(_encode, value)) + "]"
+
+    return _encode_other(value)
+
+
+def json_bytes(body: Any) -> bytes:
+    """
+    Encodes a response body of dicts, lists, concepts, versions, version
+    summaries, similar concepts, search hits and JSON scalars (anything else goes through json.dumps).
+    """
+    return _encode(body).encode()
+
+
+def json_response(body: Any, status_code: int = 200) -> Response:
+    """
+    A ready-made response for `body` (see `json_bytes`). FastAPI passes
+    a returned Response through untouched, so routes set their headers
+    on it rather than on an injected `response` parameter.
+    """
+    return Response(json_bytes(body), status_code=status_code, media_type=JSON_MEDIA_TYPE)
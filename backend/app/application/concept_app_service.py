@@ -1,47 +1,284 @@
+import base64
+import binascii
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.application.prerequisite_index import PrerequisiteIndex
+from app.core import config
+from app.domain.common.errors import StatusConflict, VersionConflict
 from app.domain.common.result import DomainResult
+from app.domain.concept.models import VERSION_FIELDS, check_version_fields
+from app.domain.concept.rules import ALLOWED_STATUS_TRANSITIONS
+
+
+def _encode_cursor(updated_at: datetime, concept_id: str) -> str:
+    raw = json.dumps([updated_at.isoformat(), concept_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, concept_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(updated_at), str(concept_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def _encode_version_cursor(version_number: int) -> str:
+    raw = json.dumps([version_number]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_version_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        (version_number,) = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if type(version_number) is not int:
+        raise ValueError("Invalid cursor")
+    return version_number
+
+
+def version_fieldset(names: Sequence[str]) -> Tuple[str, ...]:
+    """
+    A sparse fieldset for version reads: `names` checked against
+    VERSION_FIELDS, in their order. A version's id and number are always
+    included; its warnings and the next page's cursor are found by them.
+    """
+    if names:
+        check_version_fields(names)
+
+    wanted = {"id", "version_number", *names}
+    return tuple(name for name in VERSION_FIELDS if name in wanted)
+
+
+@dataclass(frozen=True)
+class StatusChangeOutcome:
+    """
+    What happened to one item of a batch status change.
+
+    - status: the concept's status afterwards (None if not found)
+    - applied: the change was saved
+    - error: why the item was rejected (None if it was valid; in an
+      all-or-nothing batch a valid item is not applied when another
+      item was rejected)
+    """
+    concept_id: str
+    status: Optional[str]
+    applied: bool
+    error: Optional[str]
+
 
 class ConceptApplicationService:
 
-    def __init__(self, domain_service, repository):
+    def __init__(self, domain_service, repository, prerequisites=None):
         self.domain = domain_service
         self.repo = repository
+        self.prerequisites = prerequisites or PrerequisiteIndex(repository)
 
+    @property
+    def ruleset_version(self) -> str:
+        """
+        Version of the rules warnings are computed with; read
+        representations carrying warnings depend on it.
+        """
+        return self.domain.ruleset_version
 
     # -----------------------------
     # CREATE
     # -----------------------------
-    def create_concept(self, data: dict, created_by: str):
+    def create_concept(self, data: dict, created_by: str, profile: bool = False):
         result = self.domain.create_concept(
             data=data,
-            created_by=created_by
+            created_by=created_by,
+            profile=profile
         )
 
         concept, version = result.value
 
-        self.repo.save_concept(concept)
-        self.repo.save_version(version)
+        # One transaction: a concept never exists without its first version.
+        with self.repo.unit_of_work() as uow:
+            uow.save_concept(concept)
+            uow.save_version(version)
+            uow.save_warnings([self.domain.warnings_record(version, result.warnings)])
 
-        return result
+        return self._with_catalogue_warnings(result)
 
     # -----------------------------
-    # GET LATEST
+    # BULK CREATE
     # -----------------------------
+    def bulk_create_concepts(self, records: List[dict], created_by: str):
+        """
+        Creates one concept per record and saves the whole chunk in a
+        single transaction. Returns the per-record domain results in
+        input order.
+
+        Imports skip the near-duplicate and prerequisite cycle checks
+        (see GET /{id}/similar and GET /prerequisite-order).
+        """
+        results = self.domain.create_concepts(records=records, created_by=created_by)
+
+        with self.repo.unit_of_work() as uow:
+            uow.save_many([result.value for result in results])
+            uow.save_warnings([
+                self.domain.warnings_record(result.value[1], result.warnings)
+                for result in results
+            ])
+
+        for result in results:
+            self.prerequisites.record(result.value[1])
 
-    def get_concept(self, concept_id: str):
+        return DomainResult(
+            value=results,
+            warnings=[]
+        )
 
+    # -----------------------------
+    # GET LATEST
+    # -----------------------------
+
+    def get_concept(self, concept_id: str, fields: Optional[Sequence[str]] = None):
+        """
+        The concept and its latest version; with `fields`, only those
+        fields of the version (a dict, see `version_fieldset`).
+        """
         concept = self.repo.get_concept(concept_id)
 
         if concept is None:
             raise ValueError("Concept not found")
 
+        if fields is not None:
+            version = self.repo.get_version_fields(
+                concept_id, concept.current_version, version_fieldset(fields)
+            )
+            return DomainResult(
+                value = (concept, version),
+                warnings = self._stored_warnings_of_fields(concept_id, version) if version else []
+            )
+
         version = self.repo.get_latest_version(concept_id)
 
         return DomainResult(
             value = (concept, version),
-            warnings = []
+            warnings = self._stored_warnings(version) if version else []
+        )
+
+    def get_concepts_many(self, concept_ids: List[str]):
+        """
+        Many concepts with their current version and its warnings, in a
+        fixed number of repository calls however many ids are asked for.
+
+        Returns ((concept, version, warnings) triples in request order,
+        ids not found); repeated ids are answered once.
+        """
+        concept_ids = list(dict.fromkeys(concept_ids))
+
+        concepts = self.repo.get_concepts_many(concept_ids)
+        versions = self.repo.get_latest_versions_many(list(concepts))
+        warnings = self._stored_warnings_many(list(versions.values()))
+
+        items = []
+        missing = []
+
+        for concept_id in concept_ids:
+            concept = concepts.get(concept_id)
+            if concept is None:
+                missing.append(concept_id)
+                continue
+
+            version = versions.get(concept_id)
+            items.append((
+                concept,
+                version,
+                warnings[version.id] if version is not None else [],
+            ))
+
+        return DomainResult(
+            value=(items, missing),
+            warnings=[]
+        )
+
+    def get_concept_metadata(self, concept_id: str):
+        """
+        The concept row only (id, current_version, status, timestamps),
+        without loading any version content. Enough to answer
+        conditional requests.
+        """
+        concept = self.repo.get_concept(concept_id)
+
+        if concept is None:
+            raise ValueError("Concept not found")
+
+        return DomainResult(
+            value=concept,
+            warnings=[]
+        )
+
+
+
+    # -----------------------------
+    # LIST
+    # -----------------------------
+    def list_concepts(
+        self,
+        status: Optional[str] = None,
+        updated_since: Optional[datetime] = None,
+        created_by: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ):
+        """
+        One page of concepts with their current version, newest first.
+
+        Returns ((concept, version) pairs, next_cursor); next_cursor is
+        None on the last page.
+        """
+        if status is not None and status not in ALLOWED_STATUS_TRANSITIONS:
+            raise ValueError(f"Unknown status: {status}")
+
+        after = _decode_cursor(cursor) if cursor else None
+
+        # One extra row tells us whether another page exists.
+        rows = self.repo.list_concepts(
+            status=status,
+            updated_since=updated_since,
+            created_by=created_by,
+            after=after,
+            limit=limit + 1,
         )
 
+        page = rows[:limit]
+        next_cursor = None
+
+        if len(rows) > limit:
+            last, _ = page[-1]
+            next_cursor = _encode_cursor(last.updated_at, last.id)
 
+        return DomainResult(
+            value=(page, next_cursor),
+            warnings=[]
+        )
+
+    # -----------------------------
+    # SEARCH
+    # -----------------------------
+    def search_concepts(self, query: str, limit: int = 20, offset: int = 0):
+        if not query or not query.strip():
+            raise ValueError("Search query is required")
+
+        hits = self.repo.search(query, limit=limit, offset=offset)
+
+        return DomainResult(
+            value=hits,
+            warnings=[]
+        )
 
     # -----------------------------
     # UPDATE
@@ -52,8 +289,18 @@ class ConceptApplicationService:
         data: dict,
         created_by: str,
         change_note: str,
+        profile: bool = False,
+        expected_version: Optional[int] = None,
     ):
-
+        """
+        Saves a new version. With `expected_version`, raises
+        VersionConflict unless the concept is still at that version.
+
+        Either way the concept pointer moves by compare-and-swap on the
+        version that was read, so of two concurrent updates from the
+        same version one wins and the other gets VersionConflict before
+        its version is written.
+        """
         if not change_note:
             raise ValueError("change_note is required")
 
@@ -63,20 +310,30 @@ class ConceptApplicationService:
         if concept is None or latest is None:
             raise ValueError("Concept not found")
 
+        if expected_version is not None and concept.current_version != expected_version:
+            raise VersionConflict(concept.current_version, expected_version)
+
+        # Built and validated before the unit of work, which holds the
+        # writer: only the compare-and-swap and the inserts run under it.
         result = self.domain.update_concept(
             concept,
             latest,
             data,
             created_by,
             change_note,
+            profile=profile,
         )
 
-        concept, version = result.value
+        updated, version = result.value
 
-        self.repo.save_concept(concept)
-        self.repo.save_version(version)
+        # Pointer swap (checked against the version read above), version
+        # insert and warnings commit together.
+        with self.repo.unit_of_work() as uow:
+            uow.save_concept_if_current(updated, expected_version=concept.current_version)
+            uow.save_version(version)
+            uow.save_warnings([self.domain.warnings_record(version, result.warnings)])
 
-        return result
+        return self._with_catalogue_warnings(result)
 
 
 
@@ -84,20 +341,110 @@ class ConceptApplicationService:
     # STATUS
     # -----------------------------
     def change_status(self, concept_id: str, new_status: str):
+        """
+        Moves the concept to `new_status`. Only status and updated_at are
+        written, and only if the status is still the one the transition
+        was checked from (StatusConflict otherwise): a concurrent update
+        keeps its version pointer.
+        """
+        with self.repo.unit_of_work() as uow:
+            concept = uow.get_concept(concept_id)
 
-        concept = self.repo.get_concept(concept_id)
+            if concept is None:
+                raise ValueError("Concept not found")
 
-        if concept is None:
-            raise ValueError("Concept not found")
-
-        result = self.domain.change_status(concept, new_status)
+            result = self.domain.change_status(concept, new_status)
 
-        updated_concept = result.value
+            updated_concept = result.value
 
-        self.repo.save_concept(updated_concept)
+            uow.save_status_if_current(updated_concept, expected_status=concept.status)
 
         return result
 
+    def change_status_many(
+        self,
+        changes: List[Tuple[str, str, Optional[str]]],
+        atomic: bool = True,
+    ):
+        """
+        Applies many (concept_id, new_status, expected_status) changes in
+        one unit of work: one read of every concept, transitions checked
+        in memory, then one status-conditional write per changed concept
+        (status and updated_at only, see `change_status`), one commit.
+        An item is rejected if its concept does not exist, is not in
+        `expected_status` (when given) or cannot move to `new_status`.
+        Items apply in order, so one concept can move several steps in
+        one batch.
+
+        With `atomic`, nothing is saved if any item is rejected, and a
+        concept whose status changed since it was read fails the whole
+        batch (StatusConflict); otherwise the valid items are saved and
+        the rest, conflicts included, reported.
+        Returns a StatusChangeOutcome per item, in input order.
+        """
+        with self.repo.unit_of_work() as uow:
+            concepts = uow.get_concepts_many([concept_id for concept_id, _, _ in changes])
+
+            changed = {}
+            accepted = []
+            errors = []
+
+            for concept_id, new_status, expected_status in changes:
+                concept = changed.get(concept_id) or concepts.get(concept_id)
+                error = None
+
+                if concept is None:
+                    error = "Concept not found"
+                elif expected_status is not None and concept.status != expected_status:
+                    error = f"Status is {concept.status}, expected {expected_status}"
+                else:
+                    try:
+                        concept = self.domain.change_status(concept, new_status).value
+                        changed[concept_id] = concept
+                    except ValueError as e:
+                        error = str(e)
+
+                accepted.append(error is None)
+                errors.append(error)
+
+            if atomic and not all(accepted):
+                changed = {}
+
+            conflicts: Dict[str, StatusConflict] = {}
+
+            for concept_id, concept in list(changed.items()):
+                try:
+                    uow.save_status_if_current(
+                        concept, expected_status=concepts[concept_id].status
+                    )
+                except StatusConflict as e:
+                    if atomic:
+                        raise
+                    del changed[concept_id]
+                    conflicts[concept_id] = e
+
+        outcomes = []
+        for (concept_id, _, _), ok, error in zip(changes, accepted, errors):
+            concept = changed.get(concept_id) or concepts.get(concept_id)
+            status = concept.status if concept is not None else None
+
+            conflict = conflicts.get(concept_id)
+            if conflict is not None:
+                status = conflict.current_status
+                error = error or str(conflict)
+
+            outcomes.append(StatusChangeOutcome(
+                concept_id=concept_id,
+                status=status,
+                applied=ok and concept_id in changed,
+                error=error,
+            ))
+
+        return DomainResult(
+            value=outcomes,
+            warnings=[]
+        )
+
 
 
     # -----------------------------
@@ -117,20 +464,316 @@ class ConceptApplicationService:
             warnings = []
         )
 
+    def list_version_summaries(self, concept_id: str):
+        """
+        The concept's history (version metadata only), oldest first.
+        """
+        concept = self.repo.get_concept(concept_id)
+
+        if concept is None:
+            raise ValueError("Concept not found")
+
+        return DomainResult(
+            value = self.repo.list_version_summaries(concept_id),
+            warnings = []
+        )
+
+    def list_versions_page(
+        self,
+        concept_id: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+        summary: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        """
+        One page of the concept's versions (or version summaries, or
+        only `fields` of each version), by version number, oldest first
+        unless `descending`.
+
+        Returns (versions, next_cursor); next_cursor is None on the last
+        page, and without a `limit` the page is the whole history.
+        """
+        concept = self.repo.get_concept(concept_id)
+
+        if concept is None:
+            raise ValueError("Concept not found")
+
+        after = _decode_version_cursor(cursor) if cursor else None
+
+        if fields is not None:
+            fetch = partial(self.repo.list_version_fields, fields=version_fieldset(fields))
+        elif summary:
+            fetch = self.repo.list_version_summaries
+        else:
+            fetch = self.repo.list_versions
+
+        # One extra row tells us whether another page exists.
+        rows = fetch(
+            concept_id,
+            after=after,
+            limit=limit + 1 if limit is not None else None,
+            descending=descending,
+        )
+
+        page = rows[:limit] if limit is not None else rows
+        next_cursor = None
+
+        if limit is not None and len(rows) > limit:
+            last = page[-1]
+            next_cursor = _encode_version_cursor(
+                last["version_number"] if fields is not None else last.version_number
+            )
+
+        return DomainResult(
+            value=(page, next_cursor),
+            warnings=[]
+        )
+
+    def stream_versions(
+        self,
+        concept_id: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ):
+        """
+        Like `list_versions_page`, but returns a lazy iterator of versions:
+        each is read and decoded only when the caller consumes it.
+        """
+        concept = self.repo.get_concept(concept_id)
+
+        if concept is None:
+            raise ValueError("Concept not found")
+
+        after = _decode_version_cursor(cursor) if cursor else None
+
+        return DomainResult(
+            value=self.repo.iter_versions(
+                concept_id,
+                after=after,
+                limit=limit,
+                descending=descending,
+            ),
+            warnings=[]
+        )
+
 
 
     # -----------------------------
     # GET VERSION
     # -----------------------------
-    def get_version(self, concept_id: str, version_number: int):
-
-        version = self.repo.get_version(concept_id, version_number)
+    def get_version(
+        self,
+        concept_id: str,
+        version_number: int,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        """
+        One version; with `fields`, only those of its fields (a dict,
+        see `version_fieldset`).
+        """
+        if fields is not None:
+            version = self.repo.get_version_fields(
+                concept_id, version_number, version_fieldset(fields)
+            )
+        else:
+            version = self.repo.get_version(concept_id, version_number)
 
         if version is None:
             raise ValueError("Version not found")
 
         return DomainResult(
             value=version,
-            warnings=[]
+            warnings=(
+                self._stored_warnings_of_fields(concept_id, version)
+                if fields is not None
+                else self._stored_warnings(version)
+            )
             )
 
+
+
+    # -----------------------------
+    # SIMILAR
+    # -----------------------------
+    def find_similar(
+        self,
+        concept_id: str,
+        limit: int = 10,
+        min_similarity: float = 0.0,
+    ):
+        """
+        Concepts whose current core definition resembles this concept's,
+        most similar first.
+        """
+        version = self.repo.get_latest_version(concept_id)
+
+        if version is None:
+            raise ValueError("Concept not found")
+
+        return DomainResult(
+            value=self.repo.find_similar(
+                version,
+                limit=limit,
+                min_similarity=min_similarity,
+            ),
+            warnings=[]
+        )
+
+    # -----------------------------
+    # PREREQUISITE GRAPH
+    # -----------------------------
+    def get_prerequisites(self, concept_id: str, depth: int = 1, limit: int = 500):
+        """
+        Concepts needed before this one, up to `depth` edges away,
+        nearest first.
+        """
+        with self._graph_with(concept_id) as graph:
+            traversal = graph.prerequisites(concept_id, max_depth=depth, limit=limit)
+
+        return DomainResult(
+            value=traversal,
+            warnings=[]
+        )
+
+    def get_dependents(self, concept_id: str, depth: int = 1, limit: int = 500):
+        """
+        Concepts that build on this one, up to `depth` edges away,
+        nearest first.
+        """
+        with self._graph_with(concept_id) as graph:
+            traversal = graph.dependents(concept_id, max_depth=depth, limit=limit)
+
+        return DomainResult(
+            value=traversal,
+            warnings=[]
+        )
+
+    def prerequisite_order(self):
+        """
+        Every concept, prerequisites first; concepts caught in cycles are
+        returned apart.
+        """
+        with self.prerequisites.graph() as graph:
+            order = graph.topological_order()
+
+        return DomainResult(
+            value=order,
+            warnings=[]
+        )
+
+    @contextmanager
+    def _graph_with(self, concept_id: str):
+        with self.prerequisites.graph() as graph:
+            if concept_id not in graph:
+                # Possibly written by another process since the last sync.
+                version = self.repo.get_latest_version(concept_id)
+                if version is None:
+                    raise ValueError("Concept not found")
+                self.prerequisites.record(version)
+
+            yield graph
+
+    # -----------------------------
+    # EXPORT
+    # -----------------------------
+    def export_concepts(self, status: Optional[str] = None, latest_only: bool = False):
+        """
+        Returns a lazy iterator of (concept, version) pairs; nothing is
+        read until the caller starts consuming it.
+        """
+        if status is not None and status not in ALLOWED_STATUS_TRANSITIONS:
+            raise ValueError(f"Unknown status: {status}")
+
+        return DomainResult(
+            value=self.repo.iter_export(status=status, latest_only=latest_only),
+            warnings=[]
+        )
+
+    # -----------------------------
+    # CATALOGUE WARNINGS
+    # -----------------------------
+    def _with_catalogue_warnings(self, result):
+        """
+        Checks that depend on the other concepts, run after the save:
+        near-duplicate definitions (`similar`) and prerequisite cycles
+        (`cycle`). Neither is stored or added to the warnings.
+        """
+        _, version = result.value
+
+        similar = self.repo.find_similar(
+            version,
+            limit=config.SIMILARITY_WARNING_LIMIT,
+            min_similarity=config.SIMILARITY_WARNING_THRESHOLD,
+        )
+        result = self.domain.with_similar_concepts(result, similar)
+
+        self.prerequisites.record(version)
+        with self.prerequisites.graph() as graph:
+            cycle = graph.find_cycle(version.concept_id)
+            names = [graph.name(concept_id) for concept_id in cycle or ()]
+
+        return self.domain.with_prerequisite_cycle(result, names)
+
+    # -----------------------------
+    # STORED WARNINGS
+    # -----------------------------
+    def _stored_warnings(self, version) -> List[str]:
+        """
+        Versions are immutable, so their warnings are computed once and
+        read back from storage. After a rule set change they are
+        recomputed here for the response but not stored: reads never
+        take the writer, and the revalidation job rewrites stale rows.
+        """
+        record = self.repo.get_warnings([version.id]).get(version.id)
+
+        if record is None or record.ruleset_version != self.domain.ruleset_version:
+            [record] = self._recompute([version])
+
+        return record.warnings
+
+    def _stored_warnings_of_fields(self, concept_id: str, version: dict) -> List[str]:
+        """
+        `_stored_warnings` for a sparse version (see `version_fieldset`):
+        the full version is only read if its warnings are recomputed.
+        """
+        version_id = version["id"]
+        record = self.repo.get_warnings([version_id]).get(version_id)
+
+        if record is None or record.ruleset_version != self.domain.ruleset_version:
+            full = self.repo.get_version(concept_id, version["version_number"])
+            [record] = self._recompute([full])
+
+        return record.warnings
+
+    def _stored_warnings_many(self, versions) -> Dict[str, List[str]]:
+        """
+        `_stored_warnings` for many versions: one read, and one
+        recomputation for all the stale ones. By version id.
+        """
+        ruleset_version = self.domain.ruleset_version
+        records = self.repo.get_warnings([version.id for version in versions])
+
+        stale = [
+            version for version in versions
+            if version.id not in records
+            or records[version.id].ruleset_version != ruleset_version
+        ]
+        if stale:
+            records.update((record.version_id, record) for record in self._recompute(stale))
+
+        return {version.id: records[version.id].warnings for version in versions}
+
+    def _recompute(self, versions):
+        # Reuses warnings already stored for identical content under the
+        # current rules; nothing is written.
+        ruleset_version = self.domain.ruleset_version
+
+        return self.domain.revalidate(
+            versions,
+            lookup=lambda hashes: self.repo.get_warnings_by_content(
+                hashes, ruleset_version
+            ),
+        )
@@ -0,0 +1,83 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional
+
+from app.core import config
+from app.domain.concept.graph import PrerequisiteGraph
+from app.domain.concept.models import ConceptVersion, PrerequisiteNode
+
+
+class PrerequisiteIndex:
+    """
+    The repository's prerequisite graph, held in memory.
+
+    Loaded from the repository's edge table on first use. Writes made
+    through this process are applied as they happen (`record`); writes
+    made by other processes sharing the database are picked up by
+    re-reading the concepts updated since the last sync, at most every
+    `refresh_seconds`. Each re-read reaches `refresh_seconds` further back
+    than the newest change already seen, so a transaction that commits
+    a little after its timestamp is not missed.
+    """
+
+    def __init__(
+        self,
+        repository,
+        refresh_seconds: float = config.GRAPH_REFRESH_SECONDS,
+    ) -> None:
+        self.repo = repository
+        self.refresh_seconds = refresh_seconds
+
+        self._graph: Optional[PrerequisiteGraph] = None
+        self._watermark: Optional[datetime] = None
+        self._synced = 0.0
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def graph(self) -> Iterator[PrerequisiteGraph]:
+        """
+        The up-to-date graph, locked for the duration of the block.
+        """
+        with self._lock:
+            self._sync()
+            yield self._graph
+
+    def record(self, version: ConceptVersion) -> None:
+        """
+        Applies a just-saved current version (no-op until loaded: the
+        load will read it).
+        """
+        with self._lock:
+            if self._graph is not None:
+                self._graph.update(version.concept_id, version.name, version.prerequisites)
+
+    def load(self) -> int:
+        """
+        Loads the graph now rather than on first use. Returns its size.
+        """
+        with self.graph() as graph:
+            return len(graph)
+
+    def _sync(self) -> None:
+        now = time.monotonic()
+
+        if self._graph is None:
+            self._graph = PrerequisiteGraph()
+            self._apply(self.repo.list_prerequisite_nodes())
+        elif now - self._synced >= self.refresh_seconds:
+            since = None
+            if self._watermark is not None:
+                since = self._watermark - timedelta(seconds=self.refresh_seconds)
+            self._apply(self.repo.list_prerequisite_nodes(updated_since=since))
+        else:
+            return
+
+        self._synced = now
+
+    def _apply(self, nodes: Iterable[PrerequisiteNode]) -> None:
+        for node in nodes:
+            self._graph.update(node.concept_id, node.name, node.prerequisites)
+            if self._watermark is None or node.updated_at > self._watermark:
+                self._watermark = node.updated_at
@@ -0,0 +1,332 @@
+import logging
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Deque, List, Optional, Tuple
+from uuid import uuid4
+
+from app.core import config
+from app.domain.concept.models import ConceptVersion, VersionWarnings
+from app.persistence.checkpoints import Checkpoint, CheckpointStore
+from app.validation.engine import version_content
+from app.validation.worker import init_worker, validate_chunk, validate_contents
+
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "revalidate-warnings"
+
+
+@dataclass(frozen=True)
+class RevalidationProgress:
+    """
+    Point-in-time snapshot of a RevalidationJob.
+
+    - state: idle | running | stopping | stopped | done | failed
+    - processed: versions revalidated under this rule set, including any
+      done before the run resumed from a checkpoint (`resumed_from`)
+    - versions_per_second: throughput of the current/last run only
+    """
+    state: str
+    ruleset_version: str
+    workers: int
+    processed: int
+    resumed_from: int
+    chunks: int
+    position: Optional[str]
+    elapsed_seconds: float
+    versions_per_second: float
+    error: Optional[str]
+
+
+class RevalidationJob:
+    """
+    Recomputes stored version warnings that are stale for the current
+    rule set (after a rule change, that is every version).
+
+    Stale versions are streamed from the repository in chunks (keyset on
+    version id) and fanned out to a ProcessPoolExecutor, so CPU-bound
+    rules scale with the number of cores. Workers receive only the
+    fields rules can see, as plain tuples, and validate each distinct
+    content once. Results are written back in submission order, one
+    transaction per chunk, each followed by a checkpoint; a run that is
+    stopped or crashes resumes after the last saved chunk.
+
+    With `workers` <= 1, or when everything fits in one chunk, chunks are
+    validated in-process and no worker processes are started.
+
+    A run holds the job's lease in the checkpoint store, renewed after
+    every chunk; while another process (another API worker, or
+    revalidate.py) holds it, starting a run raises RuntimeError.
+    """
+
+    def __init__(
+        self,
+        app_service,
+        checkpoints: CheckpointStore,
+        workers: int = config.VALIDATION_REVALIDATE_WORKERS,
+        chunk_size: int = config.VALIDATION_REVALIDATE_BATCH_SIZE,
+        lease_seconds: float = config.VALIDATION_REVALIDATE_LEASE_SECONDS,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self.app_service = app_service
+        self.checkpoints = checkpoints
+        self.workers = workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.lease_seconds = lease_seconds
+        self._owner = uuid4().hex
+
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+        self._state = "idle"
+        self._processed = 0
+        self._resumed_from = 0
+        self._chunks = 0
+        self._position: Optional[str] = None
+        self._started = 0.0
+        self._finished: Optional[float] = None
+        self._error: Optional[str] = None
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+
+    def start(self, restart: bool = False) -> None:
+        """
+        Runs the job in a background thread. Raises RuntimeError if it is
+        already running, here or in another process.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                raise RuntimeError("Revalidation is already running")
+
+            # Taken here so the caller hears about a run elsewhere; the
+            # thread's `run` renews it.
+            self._acquire_lease()
+
+            self._stopping.clear()
+            self._state = "running"
+            self._thread = threading.Thread(
+                target=self._run_logged,
+                args=(restart,),
+                name="revalidation-job",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops reading new chunks, saves those already in flight, then
+        waits for the background thread.
+        """
+        with self._lock:
+            thread = self._thread
+
+        if thread is None:
+            return
+
+        self._stopping.set()
+        thread.join(timeout)
+
+    def run(
+        self,
+        restart: bool = False,
+        on_progress: Optional[Callable[[RevalidationProgress], None]] = None,
+    ) -> RevalidationProgress:
+        """
+        Runs the job in the calling thread until nothing is stale (or
+        `stop` is called). `restart` ignores any saved checkpoint. Raises
+        RuntimeError if another process holds the job's lease.
+        """
+        self._acquire_lease()
+        try:
+            return self._run(restart, on_progress)
+        finally:
+            self.checkpoints.release_lease(JOB_NAME, self._owner)
+
+    def _run(
+        self,
+        restart: bool,
+        on_progress: Optional[Callable[[RevalidationProgress], None]],
+    ) -> RevalidationProgress:
+        domain = self.app_service.domain
+        repo = self.app_service.repo
+        ruleset_version = domain.ruleset_version
+
+        checkpoint = self.checkpoints.load(JOB_NAME)
+        if restart or checkpoint is None or checkpoint.run_key != ruleset_version:
+            after, processed = None, 0
+        else:
+            after, processed = checkpoint.position, checkpoint.processed
+
+        with self._lock:
+            self._state = "running"
+            self._processed = self._resumed_from = processed
+            self._chunks = 0
+            self._position = after
+            self._started = time.perf_counter()
+            self._finished = None
+            self._error = None
+
+        executor: Optional[ProcessPoolExecutor] = None
+        in_flight: Deque[Tuple[List[ConceptVersion], Future]] = deque()
+        exhausted = False
+
+        try:
+            while True:
+                while (
+                    not exhausted
+                    and not self._stopping.is_set()
+                    and len(in_flight) < max(2 * self.workers, 2)
+                ):
+                    versions = repo.list_stale_versions(
+                        ruleset_version,
+                        after=after,
+                        limit=self.chunk_size,
+                    )
+                    if not versions:
+                        exhausted = True
+                        break
+
+                    after = versions[-1].id
+                    contents = [tuple(version_content(v)) for v in versions]
+
+                    if executor is None and self.workers > 1 and (
+                        in_flight or len(versions) == self.chunk_size
+                    ):
+                        executor = self._executor(domain.engine)
+
+                    in_flight.append((versions, self._submit(executor, contents)))
+
+                if not in_flight:
+                    break
+
+                versions, future = in_flight.popleft()
+                now = datetime.utcnow()
+
+                repo.save_warnings([
+                    VersionWarnings(
+                        version_id=version.id,
+                        content_hash=digest,
+                        ruleset_version=ruleset_version,
+                        warnings=warnings,
+                        validated_at=now,
+                    )
+                    for version, (digest, warnings) in zip(versions, future.result())
+                ])
+
+                processed += len(versions)
+                self.checkpoints.save(Checkpoint(
+                    job=JOB_NAME,
+                    run_key=ruleset_version,
+                    position=versions[-1].id,
+                    processed=processed,
+                    updated_at=now,
+                ))
+                self._acquire_lease()
+
+                with self._lock:
+                    self._processed = processed
+                    self._chunks += 1
+                    self._position = versions[-1].id
+
+                if on_progress is not None:
+                    on_progress(self.progress())
+
+        except BaseException as e:
+            with self._lock:
+                self._state = "failed"
+                self._error = str(e) or type(e).__name__
+                self._finished = time.perf_counter()
+            raise
+
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        with self._lock:
+            self._state = "stopped" if self._stopping.is_set() else "done"
+            self._finished = time.perf_counter()
+
+        if not self._stopping.is_set():
+            self.checkpoints.clear(JOB_NAME)
+
+        return self.progress()
+
+    # -------------------------
+    # Monitoring
+    # -------------------------
+
+    def progress(self) -> RevalidationProgress:
+        with self._lock:
+            if self._state == "idle":
+                elapsed = 0.0
+            else:
+                end = self._finished if self._finished is not None else time.perf_counter()
+                elapsed = end - self._started
+
+            done_this_run = self._processed - self._resumed_from
+
+            state = self._state
+            if state == "running" and self._stopping.is_set():
+                state = "stopping"
+
+            return RevalidationProgress(
+                state=state,
+                ruleset_version=self.app_service.domain.ruleset_version,
+                workers=self.workers,
+                processed=self._processed,
+                resumed_from=self._resumed_from,
+                chunks=self._chunks,
+                position=self._position,
+                elapsed_seconds=elapsed,
+                versions_per_second=done_this_run / elapsed if elapsed > 0 else 0.0,
+                error=self._error,
+            )
+
+    # -------------------------
+    # Internals
+    # -------------------------
+
+    def _acquire_lease(self) -> None:
+        if not self.checkpoints.acquire_lease(JOB_NAME, self._owner, self.lease_seconds):
+            raise RuntimeError("Revalidation is already running in another process")
+
+    def _executor(self, engine) -> ProcessPoolExecutor:
+        # spawn, not fork: this process has live threads and SQLite
+        # connections that a forked child must not inherit.
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(engine,),
+        )
+
+    def _submit(self, executor: Optional[ProcessPoolExecutor], contents) -> Future:
+        if executor is not None:
+            return executor.submit(validate_chunk, contents)
+
+        future: Future = Future()
+        future.set_result(validate_contents(self.app_service.domain.engine, contents))
+        return future
+
+    def _run_logged(self, restart: bool) -> None:
+        try:
+            progress = self.run(restart=restart)
+            logger.info(
+                "Revalidation %s: %d versions at %.0f/s",
+                progress.state,
+                progress.processed,
+                progress.versions_per_second,
+            )
+        except Exception:
+            # Reads still recompute stale warnings lazily; just report.
+            logger.exception("Revalidation failed")
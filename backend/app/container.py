@@ -1,26 +1,273 @@
+import logging
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Tuple
+
+from fastapi import Request
+
+from app.core import config
 from app.domain.concept.service import ConceptService
 from app.application.concept_app_service import ConceptApplicationService
+from app.application.revalidation import RevalidationJob
+from app.persistence.checkpoints import InMemoryCheckpointStore, SQLiteCheckpointStore
+from app.persistence.db import ConnectionPool
+from app.persistence.migrations import apply_migrations
+from app.persistence.writer import GroupCommitWriter
+from app.validation.metrics import RuleMetrics
 
+from app.persistence.repositories.cached.cached_concept_repository import (
+    CachedConceptRepository,
+)
+from app.persistence.repositories.in_memory.in_memory_concept_repository import (
+    InMemoryConceptRepository,
+)
+from app.persistence.repositories.in_memory.snapshot import MAGIC as SNAPSHOT_MAGIC
 from app.persistence.repositories.sqlite.sqlite_concept_repository import (
     SQLiteConceptRepository,
 )
-# For dev/testing you can swap this:
-# from app.persistence.repositories.in_memory.in_memory_concept_repository import InMemoryConceptRepository
 
 
-def get_concept_app_service() -> ConceptApplicationService:
+logger = logging.getLogger(__name__)
+
+
+# Services built from other services: (name, what it is built from,
+# how), in dependency order. Overriding any of the inputs rebuilds the
+# service from the override (see `Container.override`).
+_DERIVED: Tuple[Tuple[str, Tuple[str, ...], Callable[["Container"], Any]], ...] = (
+    (
+        "concept_app_service",
+        ("concept_service", "concept_repository"),
+        lambda c: ConceptApplicationService(
+            c.resolve("concept_service"), c.resolve("concept_repository")
+        ),
+    ),
+    (
+        "revalidation_job",
+        ("concept_app_service", "checkpoints"),
+        lambda c: RevalidationJob(c.resolve("concept_app_service"), c.resolve("checkpoints")),
+    ),
+)
+
+
+class Container:
     """
-    Builds and returns a fully wired ConceptApplicationService.
+    Application-lifetime wiring.
 
-    This is the single source of truth for backend wiring.
+    Everything here is built once in `startup()` (called from the FastAPI
+    lifespan hook) and shared by every request, so resolving a dependency
+    is a dictionary lookup. This is the single source of truth for
+    backend wiring.
     """
 
-    # Persistence
-    repo = SQLiteConceptRepository(db_path="data/app.db")
-    # repo = InMemoryConceptRepository()
+    def __init__(
+        self,
+        db_path: str = config.DB_PATH,
+        pool_size: int = config.DB_POOL_SIZE,
+        group_commit: bool = config.DB_GROUP_COMMIT,
+        auto_migrate: bool = config.DB_AUTO_MIGRATE,
+        cache: bool = config.CACHE_ENABLED,
+        revalidate_on_startup: bool = config.VALIDATION_REVALIDATE_ON_STARTUP,
+        backend: str = config.REPOSITORY_BACKEND,
+        memory_seed_path: Optional[str] = config.MEMORY_SEED_PATH,
+    ) -> None:
+        if backend not in ("sqlite", "memory"):
+            raise ValueError(f"Unknown repository backend: {backend!r}")
+
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.group_commit = group_commit
+        self.auto_migrate = auto_migrate
+        self.cache = cache
+        self.revalidate_on_startup = revalidate_on_startup
+        self.backend = backend
+        self.memory_seed_path = memory_seed_path
+
+        self._services: Dict[str, Any] = {}
+        self._overrides: Dict[str, Any] = {}
+        # Overrides built by `override` rather than passed to it.
+        self._rebuilt: Set[str] = set()
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+
+    def startup(self) -> None:
+        # Persistence
+        if self.backend == "memory":
+            pool = writer = None
+            repo = self._seeded_memory_repository()
+            checkpoints = InMemoryCheckpointStore()
+        else:
+            if self.auto_migrate:
+                apply_migrations(self.db_path)
+
+            pool = ConnectionPool(
+                self.db_path,
+                size=self.pool_size,
+                on_connect=SQLiteConceptRepository.prepare_statements,
+            )
+            writer = GroupCommitWriter(pool) if self.group_commit else None
+            repo = SQLiteConceptRepository(pool=pool, writer=writer)
+            checkpoints = SQLiteCheckpointStore(pool)
+
+            if self.cache:
+                repo = CachedConceptRepository(repo)
+
+        # Domain (stateless apart from validation metrics)
+        validation_metrics = RuleMetrics()
+        domain = ConceptService(metrics=validation_metrics)
+
+        # Application
+        app_service = ConceptApplicationService(domain, repo)
+        revalidation_job = RevalidationJob(app_service, checkpoints)
+
+        self._services = {
+            "pool": pool,
+            "writer": writer,
+            "concept_repository": repo,
+            "checkpoints": checkpoints,
+            "validation_metrics": validation_metrics,
+            "concept_service": domain,
+            "concept_app_service": app_service,
+            "revalidation_job": revalidation_job,
+        }
+
+        self.warm_up()
+
+    def _seeded_memory_repository(self) -> InMemoryConceptRepository:
+        seed = self.memory_seed_path
+        if not seed:
+            return InMemoryConceptRepository()
+
+        with open(seed, "rb") as f:
+            is_snapshot = f.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+
+        if is_snapshot:
+            return InMemoryConceptRepository.from_snapshot(seed)
+        return InMemoryConceptRepository.from_sqlite(seed)
+
+    def warm_up(self) -> None:
+        """
+        Opens every pooled connection (preparing the hot statements on
+        each) and primes the read cache so the first requests after boot
+        don't pay for it, then starts the group-commit writer, adds
+        concepts saved before the similarity index existed to it, loads
+        the prerequisite graph, and (if `revalidate_on_startup`) starts
+        the revalidation of stored warnings left stale by a rule change,
+        unless another process is already running it. The SQLite-only
+        steps are skipped for the in-memory backend.
+        """
+        pool = self._services["pool"]
+        if pool is not None:
+            pool.warm()
 
-    # Domain (stateless)
-    domain = ConceptService()
+        repo = self._services["concept_repository"]
+        if isinstance(repo, CachedConceptRepository):
+            repo.prime()
 
-    # Application
-    return ConceptApplicationService(domain, repo)
+        writer = self._services["writer"]
+        if writer is not None:
+            writer.start()
+
+        if isinstance(repo, (SQLiteConceptRepository, CachedConceptRepository)):
+            repo.backfill_similarity_index()
+        self._services["concept_app_service"].prerequisites.load()
+
+        if self.revalidate_on_startup:
+            try:
+                self._services["revalidation_job"].start()
+            except RuntimeError as e:
+                logger.info("Revalidation not started at boot: %s", e)
+
+    def shutdown(self) -> None:
+        # Before the writer: the revalidation job writes through it.
+        revalidation_job = self._services.get("revalidation_job")
+        if revalidation_job is not None:
+            revalidation_job.stop()
+
+        writer = self._services.get("writer")
+        if writer is not None:
+            writer.stop()
+
+        pool = self._services.get("pool")
+        if pool is not None:
+            pool.close()
+
+        self._services = {}
+
+    # -----------------------------
+    # Resolution
+    # -----------------------------
+
+    def resolve(self, name: str) -> Any:
+        if self._overrides:
+            override = self._overrides.get(name)
+            if override is not None:
+                return override
+
+        try:
+            return self._services[name]
+        except KeyError:
+            raise RuntimeError(
+                f"'{name}' is not available; was the container started?"
+            )
+
+    @contextmanager
+    def override(self, name: str, value: Any) -> Iterator[Any]:
+        """
+        Temporarily replaces a service, e.g. an in-memory repository
+        or a fake application service for one test. Services built from
+        it (the application service and revalidation job, from the
+        repository or domain service) are rebuilt from the override for
+        the duration, unless they are overridden themselves. The pool
+        and writer are leaves: overriding them does not rebuild the
+        repository.
+        """
+        previous, previous_rebuilt = dict(self._overrides), set(self._rebuilt)
+
+        self._overrides[name] = value
+        self._rebuilt.discard(name)
+
+        changed = {name}
+        for derived, inputs, build in _DERIVED:
+            explicit = derived in self._overrides and derived not in self._rebuilt
+            if explicit or changed.isdisjoint(inputs):
+                continue
+
+            self._overrides[derived] = build(self)
+            self._rebuilt.add(derived)
+            changed.add(derived)
+
+        try:
+            yield value
+        finally:
+            self._overrides, self._rebuilt = previous, previous_rebuilt
+
+    # -----------------------------
+    # Monitoring
+    # -----------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self.resolve("pool")
+        writer = self.resolve("writer")
+        repo = self.resolve("concept_repository")
+
+        return {
+            "pool": asdict(pool.stats()) if pool is not None else None,
+            "writer": asdict(writer.stats()) if writer is not None else None,
+            "cache": (
+                repo.stats() if isinstance(repo, CachedConceptRepository) else None
+            ),
+            "revalidation": asdict(self.resolve("revalidation_job").progress()),
+        }
+
+
+def get_container(request: Request) -> Container:
+    return request.app.state.container
+
+
+def get_concept_app_service(request: Request) -> ConceptApplicationService:
+    """
+    FastAPI dependency: returns the app-scoped ConceptApplicationService.
+    """
+    return request.app.state.container.resolve("concept_app_service")
@@ -0,0 +1,162 @@
+import os
+
+
+# -----------------------------
+# Database
+# -----------------------------
+
+DB_PATH = os.environ.get("VALIDATOR_DB_PATH", "data/app.db")
+
+# Apply pending migrations/*.sql when the application starts.
+DB_AUTO_MIGRATE = os.environ.get("VALIDATOR_DB_AUTO_MIGRATE", "1") == "1"
+
+# Maximum number of long-lived connections kept by the pool.
+DB_POOL_SIZE = int(os.environ.get("VALIDATOR_DB_POOL_SIZE", "8"))
+
+# How long a request waits for a free connection before giving up.
+DB_POOL_TIMEOUT_SECONDS = float(os.environ.get("VALIDATOR_DB_POOL_TIMEOUT", "30"))
+
+# Connection pragmas (applied once, when a pooled connection is opened).
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("VALIDATOR_DB_BUSY_TIMEOUT_MS", "5000"))
+DB_CACHE_SIZE_KIB = int(os.environ.get("VALIDATOR_DB_CACHE_SIZE_KIB", "16384"))
+DB_MMAP_SIZE_BYTES = int(os.environ.get("VALIDATOR_DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Group commit: writes from all request threads are funnelled through one
+# writer that commits everything queued within the window in one transaction.
+DB_GROUP_COMMIT = os.environ.get("VALIDATOR_DB_GROUP_COMMIT", "1") == "1"
+DB_GROUP_COMMIT_WINDOW_MS = float(os.environ.get("VALIDATOR_DB_GROUP_COMMIT_WINDOW_MS", "2"))
+DB_GROUP_COMMIT_MAX_BATCH = int(os.environ.get("VALIDATOR_DB_GROUP_COMMIT_MAX_BATCH", "64"))
+
+
+# Preview instances: "memory" keeps the whole store in process (nothing
+# is written to disk), seeded from MEMORY_SEED_PATH if set: a snapshot
+# file (snapshot.py) or an SQLite database file.
+REPOSITORY_BACKEND = os.environ.get("VALIDATOR_REPOSITORY", "sqlite")
+MEMORY_SEED_PATH = os.environ.get("VALIDATOR_MEMORY_SEED")
+
+# -----------------------------
+# Listing
+# -----------------------------
+
+CONCEPT_LIST_DEFAULT_LIMIT = 50
+CONCEPT_LIST_MAX_LIMIT = 200
+
+# Most ids accepted by one POST /concepts/batch-get.
+BATCH_GET_MAX_IDS = int(os.environ.get("VALIDATOR_BATCH_GET_MAX_IDS", "500"))
+
+# Most items accepted by one POST /concepts/status:batch.
+BATCH_STATUS_MAX_ITEMS = int(os.environ.get("VALIDATOR_BATCH_STATUS_MAX_ITEMS", "500"))
+
+# Version history pages (GET /concepts/{id}/versions?limit=...); without
+# a limit the whole history is returned.
+VERSION_LIST_MAX_LIMIT = 1000
+
+
+# -----------------------------
+# Bulk import
+# -----------------------------
+
+# Records validated and inserted per transaction.
+BULK_IMPORT_CHUNK_SIZE = int(os.environ.get("VALIDATOR_BULK_IMPORT_CHUNK_SIZE", "500"))
+
+# Longest accepted NDJSON line; protects memory from a missing newline.
+BULK_IMPORT_MAX_LINE_BYTES = int(os.environ.get("VALIDATOR_BULK_IMPORT_MAX_LINE_BYTES", str(1024 * 1024)))
+
+
+# -----------------------------
+# Search
+# -----------------------------
+
+# Index every version instead of only each concept's current one.
+SEARCH_INDEX_HISTORY = os.environ.get("VALIDATOR_SEARCH_INDEX_HISTORY", "0") == "1"
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+
+# -----------------------------
+# Read cache
+# -----------------------------
+
+CACHE_ENABLED = os.environ.get("VALIDATOR_CACHE_ENABLED", "1") == "1"
+
+# Concepts and latest versions change, so they also expire: this bounds
+# staleness when several worker processes share one database.
+CACHE_MAX_ENTRIES = int(os.environ.get("VALIDATOR_CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL_SECONDS = float(os.environ.get("VALIDATOR_CACHE_TTL_SECONDS", "30"))
+
+# Versions are immutable and only ever evicted for space.
+CACHE_VERSION_MAX_ENTRIES = int(os.environ.get("VALIDATOR_CACHE_VERSION_MAX_ENTRIES", "50000"))
+
+# Most recently updated concepts loaded into the cache at startup.
+CACHE_PRIME_COUNT = int(os.environ.get("VALIDATOR_CACHE_PRIME_COUNT", "1000"))
+
+
+# -----------------------------
+# Validation
+# -----------------------------
+
+# Fraction of validations run through the instrumented (per-rule timed)
+# path and aggregated for GET /admin/validation. 0 disables sampling;
+# requests can still ask for a profile explicitly.
+VALIDATION_PROFILE_SAMPLE_RATE = float(os.environ.get("VALIDATOR_VALIDATION_PROFILE_SAMPLE_RATE", "0.01"))
+
+# Stored warnings computed under an older rule set are recomputed by the
+# revalidation job (revalidate.py, POST /admin/revalidation, or at boot
+# if REVALIDATE_ON_STARTUP is set), this many versions per chunk and
+# transaction, across this many worker processes (0: one per CPU). Off
+# at boot by default: every API process would start its own pool. The
+# job holds a lease row while it runs, renewed every chunk, so it never
+# runs in two processes at once.
+VALIDATION_REVALIDATE_ON_STARTUP = os.environ.get("VALIDATOR_VALIDATION_REVALIDATE_ON_STARTUP", "0") == "1"
+VALIDATION_REVALIDATE_BATCH_SIZE = int(os.environ.get("VALIDATOR_VALIDATION_REVALIDATE_BATCH_SIZE", "500"))
+VALIDATION_REVALIDATE_WORKERS = int(os.environ.get("VALIDATOR_VALIDATION_REVALIDATE_WORKERS", "0"))
+VALIDATION_REVALIDATE_LEASE_SECONDS = float(os.environ.get("VALIDATOR_VALIDATION_REVALIDATE_LEASE_SECONDS", "300"))
+
+
+# -----------------------------
+# Similarity
+# -----------------------------
+
+# Writes warn when a concept's core definition overlaps another concept's
+# current one by at least this much (estimated Jaccard similarity of
+# word bigrams, 0..1).
+SIMILARITY_WARNING_THRESHOLD = float(os.environ.get("VALIDATOR_SIMILARITY_WARNING_THRESHOLD", "0.6"))
+SIMILARITY_WARNING_LIMIT = 3
+
+# Most band-sharing candidates scored per lookup; bounds the cost of a
+# lookup when many concepts share boilerplate definitions.
+SIMILARITY_MAX_CANDIDATES = int(os.environ.get("VALIDATOR_SIMILARITY_MAX_CANDIDATES", "200"))
+
+SIMILAR_DEFAULT_LIMIT = 10
+SIMILAR_MAX_LIMIT = 50
+
+
+# -----------------------------
+# Prerequisite graph
+# -----------------------------
+
+# The graph is kept in memory. Writes by this process update it at once;
+# writes by other processes sharing the database show up within this long.
+GRAPH_REFRESH_SECONDS = float(os.environ.get("VALIDATOR_GRAPH_REFRESH_SECONDS", "5"))
+
+GRAPH_DEFAULT_DEPTH = 3
+GRAPH_MAX_DEPTH = 50
+GRAPH_DEFAULT_LIMIT = 500
+GRAPH_MAX_LIMIT = 10000
+
+
+# -----------------------------
+# Responses
+# -----------------------------
+
+# Concept versions never change, so their encoded JSON is kept (per
+# version id, most recently used) and reused by every response that
+# includes them.
+RESPONSE_VERSION_JSON_CACHE_ENTRIES = int(os.environ.get("VALIDATOR_RESPONSE_VERSION_JSON_CACHE_ENTRIES", "20000"))
+
+# Responses at least this large are gzip-compressed for clients that
+# accept it. Level 6 (zlib's default) costs a fraction of level 9's CPU
+# for nearly the same size on JSON.
+GZIP_MINIMUM_SIZE = int(os.environ.get("VALIDATOR_GZIP_MINIMUM_SIZE", "1024"))
+GZIP_COMPRESS_LEVEL = int(os.environ.get("VALIDATOR_GZIP_COMPRESS_LEVEL", "6"))
@@ -0,0 +1,24 @@
+class VersionConflict(ValueError):
+    """
+    A write expected the concept at one version, but it has moved on
+    (another writer got there first). Carries the version it is at now.
+    """
+
+    def __init__(self, current_version: int, expected_version: int) -> None:
+        super().__init__(
+            f"Concept is at version {current_version}, expected {expected_version}"
+        )
+        self.current_version = current_version
+        self.expected_version = expected_version
+
+
+class StatusConflict(ValueError):
+    """
+    A status change expected the concept in one status, but another
+    writer changed it first. Carries the status it is in now.
+    """
+
+    def __init__(self, current_status: str, expected_status: str) -> None:
+        super().__init__(f"Status is {current_status}, expected {expected_status}")
+        self.current_status = current_status
+        self.expected_status = expected_status
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Generic, List, TypeVar
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
 
 T = TypeVar("T")
 
@@ -11,6 +11,14 @@ class DomainResult(Generic[T]):
 
     - value: the primary domain result
     - warnings: non-blocking validation warnings
+    - profile: validation timings, when the caller asked for them
+    - similar: near-duplicate concepts found by a write (SimilarConcept),
+      reported apart from the warnings
+    - cycle: names of the concepts on a prerequisite cycle through the
+      written concept (empty if none), also apart from the warnings
     """
     value: T
     warnings: List[str]
+    profile: Optional[Any] = None
+    similar: Tuple[Any, ...] = ()
+    cycle: Tuple[str, ...] = ()
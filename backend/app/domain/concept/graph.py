@@ -0,0 +1,259 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def name_key(name: str) -> str:
+    """
+    How prerequisites are matched to concepts: by name, ignoring case
+    and whitespace differences.
+    """
+    return " ".join(name.casefold().split())
+
+
+@dataclass(frozen=True)
+class PrerequisiteLink:
+    """
+    A concept reached from another one through prerequisite edges,
+    `depth` edges away.
+    """
+    concept_id: str
+    name: str
+    depth: int
+
+
+@dataclass(frozen=True)
+class Traversal:
+    """
+    Result of walking the graph from one concept.
+
+    - links: concepts reached, nearest first
+    - unresolved: prerequisite names (normalized) met on the way that
+      match no concept
+    - truncated: the walk stopped at its result limit
+    """
+    links: List[PrerequisiteLink]
+    unresolved: List[str]
+    truncated: bool
+
+
+@dataclass(frozen=True)
+class TopologicalOrder:
+    """
+    Every concept, prerequisites before the concepts that need them.
+    Concepts on (or behind) a prerequisite cycle cannot be ordered and
+    are listed in `cyclic` instead.
+    """
+    order: List[str]
+    cyclic: List[str]
+
+
+class PrerequisiteGraph:
+    """
+    Adjacency index of the prerequisite graph.
+
+    Nodes are concepts (their current version); a concept's edges are
+    the names in its `prerequisites`, resolved to concepts by `name_key`
+    at query time, so an edge to a concept created later resolves as
+    soon as that concept exists. Updating one concept touches only its
+    own entries.
+
+    Not thread-safe: callers serialize access.
+    """
+
+    def __init__(self) -> None:
+        self._names: Dict[str, str] = {}
+        self._keys: Dict[str, str] = {}
+        self._by_key: Dict[str, Set[str]] = {}
+        self._requires: Dict[str, Tuple[str, ...]] = {}
+        self._required_by: Dict[str, Set[str]] = {}
+
+        self._order: Optional[TopologicalOrder] = None
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, concept_id: str) -> bool:
+        return concept_id in self._names
+
+    def name(self, concept_id: str) -> str:
+        return self._names[concept_id]
+
+    # -------------------------
+    # Updates
+    # -------------------------
+
+    def update(self, concept_id: str, name: str, prerequisites: Iterable[str]) -> None:
+        """
+        Sets a concept's name and prerequisite names (its current version).
+        """
+        keys = tuple(dict.fromkeys(
+            key for key in map(name_key, prerequisites) if key
+        ))
+
+        if self._names.get(concept_id) == name and self._requires[concept_id] == keys:
+            return  # unchanged: keep the cached order
+
+        self.remove(concept_id)
+
+        key = name_key(name)
+        self._names[concept_id] = name
+        self._keys[concept_id] = key
+        self._by_key.setdefault(key, set()).add(concept_id)
+        self._requires[concept_id] = keys
+        for key in keys:
+            self._required_by.setdefault(key, set()).add(concept_id)
+
+        self._order = None
+
+    def remove(self, concept_id: str) -> None:
+        if self._names.pop(concept_id, None) is None:
+            return
+
+        _discard(self._by_key, self._keys.pop(concept_id), concept_id)
+        for key in self._requires.pop(concept_id):
+            _discard(self._required_by, key, concept_id)
+
+        self._order = None
+
+    # -------------------------
+    # Edges
+    # -------------------------
+
+    def prerequisites_of(self, concept_id: str) -> List[str]:
+        """
+        Concepts `concept_id` directly requires, in listed order.
+        """
+        found: List[str] = []
+        for key in self._requires.get(concept_id, ()):
+            found.extend(sorted(self._by_key.get(key, ())))
+        return found
+
+    def dependents_of(self, concept_id: str) -> List[str]:
+        """
+        Concepts that directly list `concept_id` as a prerequisite.
+        """
+        key = self._keys.get(concept_id)
+        if key is None:
+            return []
+        return sorted(self._required_by.get(key, ()))
+
+    # -------------------------
+    # Queries
+    # -------------------------
+
+    def prerequisites(self, concept_id: str, max_depth: int, limit: int) -> Traversal:
+        """
+        Everything a learner needs before `concept_id`, up to `max_depth`
+        edges away.
+        """
+        return self._walk(concept_id, self.prerequisites_of, max_depth, limit, True)
+
+    def dependents(self, concept_id: str, max_depth: int, limit: int) -> Traversal:
+        """
+        Everything that (transitively) builds on `concept_id`.
+        """
+        return self._walk(concept_id, self.dependents_of, max_depth, limit, False)
+
+    def find_cycle(self, concept_id: str) -> Optional[List[str]]:
+        """
+        A shortest prerequisite path from `concept_id` back to itself, as
+        concept ids starting and ending with it; None if there is none.
+        """
+        parents: Dict[str, str] = {}
+        queue = deque([concept_id])
+
+        while queue:
+            current = queue.popleft()
+            for nxt in self.prerequisites_of(current):
+                if nxt == concept_id:
+                    path = [current]
+                    while path[-1] != concept_id:
+                        path.append(parents[path[-1]])
+                    return path[::-1] + [concept_id]
+                if nxt not in parents:
+                    parents[nxt] = current
+                    queue.append(nxt)
+
+        return None
+
+    def topological_order(self) -> TopologicalOrder:
+        """
+        Cached until the next update.
+        """
+        if self._order is None:
+            self._order = self._sort()
+        return self._order
+
+    # -------------------------
+    # Internals
+    # -------------------------
+
+    def _walk(
+        self,
+        start: str,
+        neighbours,
+        max_depth: int,
+        limit: int,
+        report_unresolved: bool,
+    ) -> Traversal:
+        seen = {start}
+        links: List[PrerequisiteLink] = []
+        unresolved: Set[str] = set()
+        frontier = [start]
+        depth = 0
+
+        while frontier and depth < max_depth:
+            depth += 1
+            following = []
+
+            for current in frontier:
+                if report_unresolved:
+                    unresolved.update(
+                        key for key in self._requires.get(current, ())
+                        if key not in self._by_key
+                    )
+
+                for nxt in neighbours(current):
+                    if nxt in seen:
+                        continue
+                    if len(links) >= limit:
+                        return Traversal(links, sorted(unresolved), True)
+
+                    seen.add(nxt)
+                    links.append(PrerequisiteLink(nxt, self._names[nxt], depth))
+                    following.append(nxt)
+
+            frontier = following
+
+        return Traversal(links, sorted(unresolved), False)
+
+    def _sort(self) -> TopologicalOrder:
+        # Kahn's algorithm over resolved edges, prerequisites first.
+        by_key = self._by_key
+        pending = {
+            concept_id: sum(len(by_key.get(key, ())) for key in keys)
+            for concept_id, keys in self._requires.items()
+        }
+        ready = deque(sorted(c for c, count in pending.items() if count == 0))
+        order: List[str] = []
+
+        while ready:
+            current = ready.popleft()
+            order.append(current)
+            for dependent in self.dependents_of(current):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+
+        placed = set(order)
+        cyclic = sorted(c for c in self._names if c not in placed)
+        return TopologicalOrder(order, cyclic)
+
+
+def _discard(index: Dict[str, Set[str]], key: str, concept_id: str) -> None:
+    members = index.get(key)
+    if members is not None:
+        members.discard(concept_id)
+        if not members:
+            del index[key]
@@ -1,10 +1,17 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 
 @dataclass(frozen=True)
 class ConceptVersion:
+    """
+    One immutable revision of a concept's content.
+
+    The list fields are stored as tuples, whatever sequence they are
+    given as, so a version can be shared freely (cached, returned by
+    repositories) without defensive copies.
+    """
     id: str
     concept_id: str
     version_number: int
@@ -14,11 +21,54 @@ class ConceptVersion:
     expanded_explanation: str
     learning_objective: str
 
-    examples: List[str]
-    misconceptions: List[str]
+    examples: Tuple[str, ...]
+    misconceptions: Tuple[str, ...]
     scope_boundaries: Optional[str]
-    prerequisites: List[str]
+    prerequisites: Tuple[str, ...]
+
+    created_by: str
+    created_at: datetime
+    change_note: Optional[str]
+
+    def __post_init__(self) -> None:
+        for field in ("examples", "misconceptions", "prerequisites"):
+            value = getattr(self, field)
+            if type(value) is not tuple:
+                object.__setattr__(self, field, tuple(value))
+
+
+# ConceptVersion's field names, in declaration order: what a sparse
+# fieldset (see `project_version`) may select.
+VERSION_FIELDS: Tuple[str, ...] = tuple(field.name for field in fields(ConceptVersion))
+
+
+def check_version_fields(names: Sequence[str]) -> None:
+    """
+    Raises ValueError unless `names` is a non-empty list of
+    VERSION_FIELDS.
+    """
+    unknown = [name for name in names if name not in VERSION_FIELDS]
+    if unknown or not names:
+        raise ValueError(f"Unknown version fields: {', '.join(unknown) or '(none given)'}")
 
+
+def project_version(version: ConceptVersion, names: Sequence[str]) -> Dict[str, Any]:
+    """
+    Some of a version's fields, by name, in `names` order.
+    """
+    return {name: getattr(version, name) for name in names}
+
+
+@dataclass(frozen=True)
+class VersionSummary:
+    """
+    A concept version's metadata, without its content: enough to list a
+    concept's history.
+    """
+    id: str
+    concept_id: str
+    version_number: int
+    name: str
     created_by: str
     created_at: datetime
     change_note: Optional[str]
@@ -31,3 +81,56 @@ class Concept:
     status: str  # DRAFT | REVIEW | APPROVED | PUBLISHED
     created_at: datetime
     updated_at: datetime
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """
+    One full-text search match: which concept version matched, how well
+    (higher score is better) and a highlighted excerpt.
+    """
+    concept_id: str
+    version_number: int
+    name: str
+    score: float
+    snippet: str
+
+
+@dataclass(frozen=True)
+class VersionWarnings:
+    """
+    Stored validation result of one (immutable) concept version.
+
+    Still valid while `ruleset_version` matches the running rule engine;
+    `content_hash` lets versions with identical content share a result.
+    """
+    version_id: str
+    content_hash: str
+    ruleset_version: str
+    warnings: List[str]
+    validated_at: datetime
+
+
+@dataclass(frozen=True)
+class SimilarConcept:
+    """
+    A concept whose current core definition resembles another one:
+    `similarity` estimates the Jaccard similarity (0..1) of their word
+    bigrams.
+    """
+    concept_id: str
+    version_number: int
+    name: str
+    similarity: float
+
+
+@dataclass(frozen=True)
+class PrerequisiteNode:
+    """
+    A concept in the prerequisite graph: its current name and the
+    prerequisite names its current version lists.
+    """
+    concept_id: str
+    name: str
+    prerequisites: Tuple[str, ...]
+    updated_at: datetime
@@ -1,9 +1,13 @@
+from dataclasses import replace
 from datetime import datetime
+from typing import Callable, Collection, Dict, List, Optional, Tuple
 from uuid import uuid4
-from .models import Concept, ConceptVersion
+from .models import Concept, ConceptVersion, SimilarConcept, VersionWarnings
 from .rules import can_transition
 from app.domain.common.result import DomainResult
-from app.validation.concept_validation import validate_concept_version
+from app.validation.concept_rules import concept_rule_engine
+from app.validation.engine import RuleEngine, ValidationProfile, content_hash
+from app.validation.metrics import RuleMetrics
 
 class ConceptService:
     """
@@ -11,15 +15,53 @@ class ConceptService:
     versioning, and lifecycle transitions.
     """
 
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        engine: RuleEngine = concept_rule_engine,
+        metrics: Optional[RuleMetrics] = None,
+    ):
+        self.engine = engine
+        self.metrics = metrics
 
 
     def create_concept(
     self,
     data: dict,
-    created_by: str
+    created_by: str,
+    profile: bool = False
 ) -> DomainResult[tuple[Concept, ConceptVersion]]:
+        concept, version = self._new_concept(data, created_by)
+
+        warnings, validation_profile = self._validate(version, profile)
+
+        return DomainResult(
+            value=(concept, version),
+            warnings=warnings,
+            profile=validation_profile
+        )
+
+    def create_concepts(
+    self,
+    records: List[dict],
+    created_by: str
+) -> List[DomainResult[tuple[Concept, ConceptVersion]]]:
+        """
+        Batch form of create_concept. Results are in input order.
+        """
+        pairs = [self._new_concept(data, created_by) for data in records]
+
+        warnings = [self.engine.validate(version) for _, version in pairs]
+
+        return [
+            DomainResult(value=pair, warnings=pair_warnings)
+            for pair, pair_warnings in zip(pairs, warnings)
+        ]
+
+    def _new_concept(
+    self,
+    data: dict,
+    created_by: str
+) -> tuple[Concept, ConceptVersion]:
         now = datetime.utcnow()
         concept_id = str(uuid4())
 
@@ -48,12 +90,7 @@ class ConceptService:
             updated_at=now
         )
 
-        warnings = validate_concept_version(version)
-
-        return DomainResult(
-            value=(concept, version),
-            warnings=warnings
-        )
+        return concept, version
 
     def update_concept(
     self,
@@ -61,7 +98,8 @@ class ConceptService:
     latest_version: ConceptVersion,
     data: dict,
     created_by: str,
-    change_note: str
+    change_note: str,
+    profile: bool = False
 ) -> DomainResult[tuple[Concept, ConceptVersion]]:
         now = datetime.utcnow()
         next_version_number = latest_version.version_number + 1
@@ -100,11 +138,116 @@ class ConceptService:
             updated_at=now
         )
 
-        warnings = validate_concept_version(new_version)
+        warnings, validation_profile = self._validate(new_version, profile)
 
         return DomainResult(
             value=(updated_concept, new_version),
-            warnings=warnings
+            warnings=warnings,
+            profile=validation_profile
+        )
+
+    @property
+    def ruleset_version(self) -> str:
+        return self.engine.version
+
+    def warnings_record(
+    self,
+    version: ConceptVersion,
+    warnings: List[str]
+) -> VersionWarnings:
+        """
+        Storable form of warnings just computed for `version`.
+        """
+        return VersionWarnings(
+            version_id=version.id,
+            content_hash=content_hash(version),
+            ruleset_version=self.engine.version,
+            warnings=warnings,
+            validated_at=datetime.utcnow()
+        )
+
+    def revalidate(
+    self,
+    versions: List[ConceptVersion],
+    lookup: Optional[Callable[[Collection[str]], Dict[str, List[str]]]] = None
+) -> List[VersionWarnings]:
+        """
+        Fresh warning records for existing versions, in input order.
+
+        Each distinct content is validated once. `lookup` may supply
+        warnings already known for some content hashes under the current
+        rule set; those are reused instead of recomputed.
+        """
+        hashes = [content_hash(version) for version in versions]
+        known = dict(lookup(set(hashes))) if lookup is not None else {}
+
+        pending: Dict[str, ConceptVersion] = {}
+        for version, digest in zip(versions, hashes):
+            if digest not in known:
+                pending.setdefault(digest, version)
+
+        for digest, version in pending.items():
+            known[digest] = self.engine.validate(version)
+
+        now = datetime.utcnow()
+
+        return [
+            VersionWarnings(
+                version_id=version.id,
+                content_hash=digest,
+                ruleset_version=self.engine.version,
+                warnings=list(known[digest]),
+                validated_at=now
+            )
+            for version, digest in zip(versions, hashes)
+        ]
+
+    def with_similar_concepts(
+    self,
+    result: DomainResult,
+    similar: List[SimilarConcept]
+) -> DomainResult:
+        """
+        `result` with the near-duplicate concepts found for its version.
+        They depend on the rest of the catalogue, not just the version's
+        content, so they are reported apart from the (stored) warnings.
+        """
+        return replace(result, similar=tuple(similar))
+
+    def with_prerequisite_cycle(
+    self,
+    result: DomainResult,
+    cycle: List[str]
+) -> DomainResult:
+        """
+        `result` with the prerequisite cycle through its concept; `cycle`
+        names the concepts on the path (empty if none). Like similar
+        concepts, it depends on the catalogue and is kept out of the
+        warnings.
+        """
+        return replace(result, cycle=tuple(cycle))
+
+    def _validate(
+    self,
+    version: ConceptVersion,
+    profile: bool
+) -> Tuple[List[str], Optional[ValidationProfile]]:
+        """
+        Runs the rule engine. Requested profiles, and a sample of the
+        rest, go through the instrumented path and into `metrics`.
+        """
+        sampled = self.metrics is not None and self.metrics.should_sample()
+
+        if not (profile or sampled):
+            return self.engine.validate(version), None
+
+        validation_profile = self.engine.profile(version)
+        if self.metrics is not None:
+            self.metrics.record(validation_profile)
+
+        return (
+            validation_profile.warnings,
+            validation_profile if profile else None,
         )
 
     def change_status(
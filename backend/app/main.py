@@ -1,6 +1,38 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from app.api.admin import router as admin_router
+from app.api.http_caching import EncodedETagMiddleware
 from app.api.concepts import router as concepts_router
+from app.container import Container
+from app.core import config
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container = Container()
+    container.startup()
+    app.state.container = container
+
+    try:
+        yield
+    finally:
+        container.shutdown()
+
+
+app = FastAPI(title="Validator Platform API", lifespan=lifespan)
 
-app = FastAPI(title="Validator Platform API")
+# Streamed (NDJSON) responses are compressed chunk by chunk, each flushed
+# as it is sent, so streaming still delivers records as they are ready.
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=config.GZIP_MINIMUM_SIZE,
+    compresslevel=config.GZIP_COMPRESS_LEVEL,
+)
+# Added last, so it runs outside GZipMiddleware and sees the final
+# Content-Encoding.
+app.add_middleware(EncodedETagMiddleware)
 
 app.include_router(concepts_router)
+app.include_router(admin_router)
@@ -0,0 +1,160 @@
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Protocol, Tuple
+
+from app.persistence.db import ConnectionPool
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """
+    Where a job got to: everything up to and including `position` is
+    done. `run_key` identifies what the job was doing (e.g. the rule set
+    version); a checkpoint from a different run must not be resumed.
+    """
+    job: str
+    run_key: str
+    position: Optional[str]
+    processed: int
+    updated_at: datetime
+
+
+class CheckpointStore(Protocol):
+    def load(self, job: str) -> Optional[Checkpoint]:
+        ...
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        ...
+
+    def clear(self, job: str) -> None:
+        ...
+
+    def acquire_lease(self, job: str, owner: str, seconds: float) -> bool:
+        """
+        Takes (or renews) the lease on `job` for `seconds`. False if
+        another owner holds an unexpired lease.
+        """
+        ...
+
+    def release_lease(self, job: str, owner: str) -> None:
+        ...
+
+
+_UPSERT_CHECKPOINT = """
+    INSERT INTO job_checkpoints (job, run_key, position, processed, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(job) DO UPDATE SET
+        run_key = excluded.run_key,
+        position = excluded.position,
+        processed = excluded.processed,
+        updated_at = excluded.updated_at
+"""
+
+_ACQUIRE_LEASE = """
+    INSERT INTO job_leases (job, owner, expires_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT(job) DO UPDATE SET
+        owner = excluded.owner,
+        expires_at = excluded.expires_at
+    WHERE job_leases.owner = excluded.owner OR job_leases.expires_at < ?
+"""
+
+
+class SQLiteCheckpointStore:
+    """
+    Checkpoints in the `job_checkpoints` table, so a job resumes where it
+    stopped whether it ran in the API process or from the command line,
+    and leases in `job_leases`, so it only runs in one of them at a time.
+    """
+
+    def __init__(self, pool: ConnectionPool) -> None:
+        self.pool = pool
+
+    def load(self, job: str) -> Optional[Checkpoint]:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM job_checkpoints WHERE job = ?", (job,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return Checkpoint(
+            job=row["job"],
+            run_key=row["run_key"],
+            position=row["position"],
+            processed=row["processed"],
+            updated_at=datetime.fromisoformat(row["updated_at"]),
+        )
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        with self.pool.transaction() as conn:
+            conn.execute(
+                _UPSERT_CHECKPOINT,
+                (
+                    checkpoint.job,
+                    checkpoint.run_key,
+                    checkpoint.position,
+                    checkpoint.processed,
+                    checkpoint.updated_at.isoformat(),
+                ),
+            )
+
+    def clear(self, job: str) -> None:
+        with self.pool.transaction() as conn:
+            conn.execute("DELETE FROM job_checkpoints WHERE job = ?", (job,))
+
+    def acquire_lease(self, job: str, owner: str, seconds: float) -> bool:
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=seconds)
+
+        with self.pool.transaction() as conn:
+            cursor = conn.execute(
+                _ACQUIRE_LEASE,
+                (job, owner, expires_at.isoformat(), now.isoformat()),
+            )
+            return cursor.rowcount == 1
+
+    def release_lease(self, job: str, owner: str) -> None:
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "DELETE FROM job_leases WHERE job = ? AND owner = ?", (job, owner)
+            )
+
+
+class InMemoryCheckpointStore:
+
+    def __init__(self) -> None:
+        self._checkpoints: Dict[str, Checkpoint] = {}
+        # job -> (owner, expires_at)
+        self._leases: Dict[str, Tuple[str, datetime]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, job: str) -> Optional[Checkpoint]:
+        with self._lock:
+            return self._checkpoints.get(job)
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        with self._lock:
+            self._checkpoints[checkpoint.job] = checkpoint
+
+    def clear(self, job: str) -> None:
+        with self._lock:
+            self._checkpoints.pop(job, None)
+
+    def acquire_lease(self, job: str, owner: str, seconds: float) -> bool:
+        now = datetime.utcnow()
+
+        with self._lock:
+            held = self._leases.get(job)
+            if held is not None and held[0] != owner and held[1] >= now:
+                return False
+
+            self._leases[job] = (owner, now + timedelta(seconds=seconds))
+            return True
+
+    def release_lease(self, job: str, owner: str) -> None:
+        with self._lock:
+            if self._leases.get(job, (None,))[0] == owner:
+                del self._leases[job]
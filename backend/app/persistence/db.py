@@ -1,6 +1,289 @@
+import os
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from app.core import config
+
 
 def get_connection(db_path: str):
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     return conn
+
+
+def open_read_only(db_path: str) -> sqlite3.Connection:
+    """
+    Opens a plain read-only connection. Unlike `open_connection` it sets
+    no pragmas, so the file (and its journal mode) is left exactly as it
+    was, and it works on read-only files and directories.
+    """
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def open_connection(
+    db_path: str,
+    busy_timeout_ms: int = config.DB_BUSY_TIMEOUT_MS,
+    cache_size_kib: int = config.DB_CACHE_SIZE_KIB,
+    mmap_size_bytes: int = config.DB_MMAP_SIZE_BYTES,
+) -> sqlite3.Connection:
+    """
+    Opens a long-lived connection tuned for a pooled, multi-threaded server.
+
+    The connection runs in autocommit mode: single statements commit on
+    their own, multi-statement work must go through `ConnectionPool.transaction`.
+    """
+    conn = sqlite3.connect(
+        db_path,
+        check_same_thread=False,
+        isolation_level=None,
+    )
+    conn.row_factory = sqlite3.Row
+
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+    conn.execute(f"PRAGMA cache_size = {-int(cache_size_kib)}")
+    conn.execute(f"PRAGMA mmap_size = {int(mmap_size_bytes)}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA foreign_keys = ON")
+
+    return conn
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """
+    Point-in-time snapshot of a ConnectionPool, for monitoring.
+
+    - checkouts: connections handed out since the pool was created
+    - waits: checkouts that had to block because every connection was busy
+    - wait_seconds: total time spent blocked in those waits
+    - timeouts: checkouts that gave up after `timeout` seconds
+    """
+    size: int
+    open: int
+    idle: int
+    in_use: int
+    checkouts: int
+    waits: int
+    wait_seconds: float
+    timeouts: int
+
+
+class ConnectionPool:
+    """
+    Bounded pool of long-lived SQLite connections.
+
+    Connections are opened lazily (or eagerly via `warm`) up to `size`
+    and reused for the lifetime of the pool. Callers borrow a connection
+    with `connection()` or `transaction()` and must not keep it after
+    the block exits.
+
+    `on_connect` runs once for every new connection, e.g. to prepare the
+    statements the repositories use so the first request doesn't compile them.
+
+    With `read_only`, connections come from `open_read_only`: for reading
+    a database this process must not change, e.g. a seed file.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        size: int = config.DB_POOL_SIZE,
+        timeout: float = config.DB_POOL_TIMEOUT_SECONDS,
+        busy_timeout_ms: int = config.DB_BUSY_TIMEOUT_MS,
+        cache_size_kib: int = config.DB_CACHE_SIZE_KIB,
+        mmap_size_bytes: int = config.DB_MMAP_SIZE_BYTES,
+        on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+        read_only: bool = False,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        directory = os.path.dirname(db_path)
+        if directory and not read_only:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.read_only = read_only
+
+        self._busy_timeout_ms = busy_timeout_ms
+        self._cache_size_kib = cache_size_kib
+        self._mmap_size_bytes = mmap_size_bytes
+        self._on_connect = on_connect
+
+        # LIFO keeps the most recently used (hottest) connection in play.
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._all = []
+        self._closed = False
+
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._timeouts = 0
+
+    # -------------------------
+    # Borrowing
+    # -------------------------
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrows a connection for the duration of the block.
+
+        Any transaction left open by the caller is rolled back before
+        the connection goes back to the pool.
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self, immediate: bool = True) -> Iterator[sqlite3.Connection]:
+        """
+        Borrows a connection and runs the block in a single transaction.
+
+        Commits once on success, rolls back on error. `immediate` takes the
+        write lock up front so reads inside the block see a stable snapshot.
+        """
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+
+    def warm(self) -> None:
+        """
+        Opens every connection up front so the first requests don't pay for it.
+        """
+        with self._lock:
+            self._ensure_open()
+            missing = self.size - len(self._all)
+            opened = [self._open() for _ in range(missing)]
+            self._all.extend(opened)
+
+        for conn in opened:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            connections, self._all = self._all, []
+
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+        for conn in connections:
+            conn.close()
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            open_count = len(self._all)
+            idle = self._idle.qsize()
+
+            return PoolStats(
+                size=self.size,
+                open=open_count,
+                idle=idle,
+                in_use=open_count - idle,
+                checkouts=self._checkouts,
+                waits=self._waits,
+                wait_seconds=self._wait_seconds,
+                timeouts=self._timeouts,
+            )
+
+    # -------------------------
+    # Internals
+    # -------------------------
+
+    def _open(self) -> sqlite3.Connection:
+        if self.read_only:
+            conn = open_read_only(self.db_path)
+        else:
+            conn = open_connection(
+                self.db_path,
+                busy_timeout_ms=self._busy_timeout_ms,
+                cache_size_kib=self._cache_size_kib,
+                mmap_size_bytes=self._mmap_size_bytes,
+            )
+
+        if self._on_connect is not None:
+            self._on_connect(conn)
+
+        return conn
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+    def _acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            self._ensure_open()
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+
+        if conn is None:
+            with self._lock:
+                self._ensure_open()
+                can_open = len(self._all) < self.size
+                if can_open:
+                    conn = self._open()
+                    self._all.append(conn)
+
+        if conn is None:
+            started = time.perf_counter()
+            try:
+                conn = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                with self._lock:
+                    self._timeouts += 1
+                raise TimeoutError(
+                    f"No database connection available after {self.timeout}s"
+                )
+
+            with self._lock:
+                self._waits += 1
+                self._wait_seconds += time.perf_counter() - started
+
+        with self._lock:
+            self._checkouts += 1
+
+        return conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            closed = self._closed
+
+        if closed:
+            conn.close()
+            return
+
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+
+        self._idle.put(conn)
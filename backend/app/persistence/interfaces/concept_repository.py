@@ -1,5 +1,25 @@
-from typing import Protocol, Optional, List
-from app.domain.concept.models import Concept, ConceptVersion
+from datetime import datetime
+from typing import (
+    Any,
+    Collection,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+from app.domain.concept.models import (
+    Concept,
+    ConceptVersion,
+    PrerequisiteNode,
+    SearchHit,
+    SimilarConcept,
+    VersionSummary,
+    VersionWarnings,
+)
 
 
 class ConceptRepository(Protocol):
@@ -10,18 +30,71 @@ class ConceptRepository(Protocol):
     Implementations MUST respect immutability of ConceptVersion.
     """
 
+    def unit_of_work(self) -> ContextManager["ConceptRepository"]:
+        """
+        Yields a repository whose reads and writes all run in one
+        transaction. Commits once when the block exits; on error nothing
+        written inside the block is kept.
+        """
+        ...
+
     def save_concept(self, concept: Concept) -> None:
         ...
 
     def save_version(self, version: ConceptVersion) -> None:
         ...
 
+    def save_concept_if_current(self, concept: Concept, expected_version: int) -> None:
+        """
+        Compare-and-swap: saves `concept`'s current_version and
+        updated_at (never status) only if the stored concept is still at
+        `expected_version`, checked and written in one step. Raises
+        VersionConflict (with the stored version) otherwise.
+        """
+        ...
+
+    def save_status_if_current(self, concept: Concept, expected_status: str) -> None:
+        """
+        Saves `concept`'s status and updated_at (never current_version)
+        only if the stored concept is still in `expected_status`, checked
+        and written in one step. Raises StatusConflict (with the stored
+        status) otherwise, ValueError if there is no such concept.
+        """
+        ...
+
+    def save_many(
+        self,
+        items: Sequence[Tuple[Concept, ConceptVersion]]
+    ) -> None:
+        """
+        Saves new concepts together with their versions in one
+        transaction (bulk import). All or nothing.
+        """
+        ...
+
     def get_concept(self, concept_id: str) -> Optional[Concept]:
         ...
 
     def get_latest_version(self, concept_id: str) -> Optional[ConceptVersion]:
         ...
 
+    def get_concepts_many(self, concept_ids: Collection[str]) -> Dict[str, Concept]:
+        """
+        The concepts found among `concept_ids`, by id, read in one query
+        (or a few, for very long lists). Missing ids are left out.
+        """
+        ...
+
+    def get_latest_versions_many(
+        self,
+        concept_ids: Collection[str]
+    ) -> Dict[str, ConceptVersion]:
+        """
+        `get_latest_version` for many concepts at once, by concept id.
+        Concepts without versions (or missing) are left out.
+        """
+        ...
+
     def get_version(
         self,
         concept_id: str,
@@ -29,5 +102,181 @@ class ConceptRepository(Protocol):
     ) -> Optional[ConceptVersion]:
         ...
 
-    def list_versions(self, concept_id: str) -> List[ConceptVersion]:
+    def list_versions(
+        self,
+        concept_id: str,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[ConceptVersion]:
+        """
+        A concept's versions by version_number, ascending (or descending).
+        `after` and `limit` select one page: the versions past `after`
+        in that order, at most `limit` of them. All of them by default.
+        """
+        ...
+
+    def list_version_summaries(
+        self,
+        concept_id: str,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[VersionSummary]:
+        """
+        Like `list_versions`, but only each version's metadata: content
+        columns are neither read nor decoded.
+        """
+        ...
+
+    def get_version_fields(
+        self,
+        concept_id: str,
+        version_number: int,
+        fields: Sequence[str],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Like `get_version`, but only `fields` (names from VERSION_FIELDS)
+        of the version, as a dict in `fields` order: other columns are
+        neither read nor decoded. Raises ValueError for unknown fields.
+        """
+        ...
+
+    def list_version_fields(
+        self,
+        concept_id: str,
+        fields: Sequence[str],
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        `list_versions` with `get_version_fields`' projection.
+        """
+        ...
+
+    def iter_versions(
+        self,
+        concept_id: str,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> Iterator[ConceptVersion]:
+        """
+        Like `list_versions`, but lazily: versions are read and decoded
+        as the caller consumes them, so memory stays bounded however
+        long the history is.
+        """
+        ...
+
+    def list_concepts(
+        self,
+        status: Optional[str] = None,
+        updated_since: Optional[datetime] = None,
+        created_by: Optional[str] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: int = 50,
+    ) -> List[Tuple[Concept, ConceptVersion]]:
+        """
+        Concepts joined to their current version, newest `updated_at`
+        first (ties broken by id, descending). `after` is the
+        (updated_at, id) of the last row of the previous page.
+        `created_by` matches the concept's creator (the author of
+        version 1), whoever edited it since.
+        """
+        ...
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[SearchHit]:
+        """
+        Full-text search over name, core_definition and
+        expanded_explanation, best match first (BM25). Every word of
+        `query` must match.
+        """
+        ...
+
+    def find_similar(
+        self,
+        version: ConceptVersion,
+        limit: int = 10,
+        min_similarity: float = 0.0,
+    ) -> List[SimilarConcept]:
+        """
+        Other concepts whose current core definition resembles
+        `version`'s, most similar first. Candidates come from a MinHash/LSH
+        index kept up to date by every save, so a lookup costs in the
+        number of near matches, not the size of the catalogue. The
+        version's own concept is never included.
+        """
+        ...
+
+    def list_prerequisite_nodes(
+        self,
+        updated_since: Optional[datetime] = None,
+    ) -> List[PrerequisiteNode]:
+        """
+        Every concept's name and prerequisite names (from its current
+        version), read from an edge table kept up to date by every save.
+        `updated_since` narrows it to concepts updated at or after then.
+        """
+        ...
+
+    def iter_export(
+        self,
+        status: Optional[str] = None,
+        latest_only: bool = False,
+    ) -> Iterator[Tuple[Concept, ConceptVersion]]:
+        """
+        Streams (concept, version) pairs ordered by concept id and
+        version number, without materializing the result set. Pairs are
+        read in chunks, so a long export holds no connection (or lock)
+        while the caller consumes it; a concept changed mid-export shows
+        its state as of the chunk it was read in.
+        """
+        ...
+
+    # -------------------------
+    # Stored validation results
+    # -------------------------
+
+    def save_warnings(self, records: Sequence[VersionWarnings]) -> None:
+        """
+        Inserts or replaces the stored warnings of each record's version.
+        """
+        ...
+
+    def get_warnings(
+        self,
+        version_ids: Collection[str]
+    ) -> Dict[str, VersionWarnings]:
+        """
+        Stored warnings by version id; versions without any are absent.
+        """
+        ...
+
+    def get_warnings_by_content(
+        self,
+        content_hashes: Collection[str],
+        ruleset_version: str,
+    ) -> Dict[str, List[str]]:
+        """
+        Warnings already computed under `ruleset_version` for any version
+        with one of these content hashes, by hash.
+        """
+        ...
+
+    def list_stale_versions(
+        self,
+        ruleset_version: str,
+        after: Optional[str] = None,
+        limit: int = 500,
+    ) -> List[ConceptVersion]:
+        """
+        Versions with no warnings stored under `ruleset_version`,
+        ordered by version id, starting after version id `after`.
+        """
         ...
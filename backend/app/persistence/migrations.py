@@ -0,0 +1,72 @@
+import os
+import sqlite3
+from pathlib import Path
+from typing import List
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+
+def apply_migrations(db_path: str, migrations_dir: Path = MIGRATIONS_DIR) -> List[str]:
+    """
+    Applies every `NNN_*.sql` file in `migrations_dir` that has not been
+    applied yet, in order, and records it in `schema_migrations`.
+
+    Returns the names of the migrations applied by this call.
+    """
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                name TEXT PRIMARY KEY,
+                applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+        applied = {
+            row[0] for row in conn.execute("SELECT name FROM schema_migrations")
+        }
+
+        # Databases created before migrations were tracked already have
+        # the initial schema.
+        if not applied and _table_exists(conn, "concepts"):
+            conn.execute(
+                "INSERT INTO schema_migrations (name) VALUES (?)",
+                ("001_init.sql",),
+            )
+            applied.add("001_init.sql")
+
+        conn.commit()
+
+        newly_applied = []
+
+        for path in sorted(migrations_dir.glob("[0-9][0-9][0-9]_*.sql")):
+            if path.name in applied:
+                continue
+
+            conn.executescript(
+                "BEGIN;\n"
+                + path.read_text()
+                + f"\nINSERT INTO schema_migrations (name) VALUES ('{path.name}');"
+                + "\nCOMMIT;"
+            )
+            newly_applied.append(path.name)
+
+        return newly_applied
+
+    finally:
+        conn.close()
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (name,),
+    ).fetchone()
+    return row is not None
@@ -0,0 +1,104 @@
+import hashlib
+import re
+import sys
+from array import array
+from functools import lru_cache
+from typing import FrozenSet, Iterator, List, Sequence, Tuple
+
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# 64 hash functions in 16 bands of 4 rows: two texts share a band bucket
+# (and become candidates) with probability 1 - (1 - s^4)^16, i.e. ~64% at
+# Jaccard similarity s = 0.5 and >99% at s = 0.8.
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS = NUM_PERMUTATIONS // BANDS
+
+# Each blake2b digest yields 16 little-endian uint32 hash values, so
+# NUM_PERMUTATIONS hash functions cost NUM_PERMUTATIONS / 16 digests
+# per shingle (differently personalised, hence independent).
+_VALUES_PER_DIGEST = 16
+_DIGESTS = [
+    hashlib.blake2b(digest_size=64, person=b"minhash%d" % i)
+    for i in range(NUM_PERMUTATIONS // _VALUES_PER_DIGEST)
+]
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def _hash64(data: bytes) -> int:
+    # Not hash(): it is salted per process, and buckets are persisted.
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _uint32s(data: bytes) -> array:
+    values = array("I")
+    values.frombytes(data)
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """
+    Word bigrams of the lower-cased text (single words for one-word text).
+    """
+    words = _TOKEN.findall(text.lower())
+    if len(words) < 2:
+        return frozenset(words)
+
+    return frozenset(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+
+@lru_cache(maxsize=4096)
+def signature(text: str) -> Tuple[int, ...]:
+    """
+    MinHash signature of `text`: for each of NUM_PERMUTATIONS hash
+    functions, the smallest hash of any shingle. The fraction of equal
+    positions in two signatures estimates the Jaccard similarity of the
+    texts' shingle sets. Empty text has no signature (empty tuple).
+    """
+    rows = []
+    for shingle in shingles(text):
+        data = shingle.encode()
+        digests = []
+        for base in _DIGESTS:
+            digest = base.copy()
+            digest.update(data)
+            digests.append(digest.digest())
+        rows.append(_uint32s(b"".join(digests)))
+
+    # Column-wise minimum: position i is the min-hash of hash function i.
+    return tuple(map(min, zip(*rows)))
+
+
+def band_keys(sig: Sequence[int]) -> Iterator[Tuple[int, int]]:
+    """
+    (band, bucket) pairs of a signature; texts sharing any pair are
+    similarity candidates. An empty signature has none.
+    """
+    if not sig:
+        return
+
+    for band in range(BANDS):
+        rows = to_bytes(sig[band * ROWS:(band + 1) * ROWS])
+        yield band, _hash64(rows) >> 1  # fits a signed 64-bit SQLite INTEGER
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    if not a or len(a) != len(b):
+        return 0.0
+
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def to_bytes(sig: Sequence[int]) -> bytes:
+    values = array("I", sig)
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values.tobytes()
+
+
+def from_bytes(data: bytes) -> List[int]:
+    return _uint32s(data).tolist()
@@ -0,0 +1,313 @@
+from contextlib import contextmanager
+from copy import copy
+from dataclasses import asdict
+from typing import Any, Collection, Dict, Iterator, Optional, Sequence, Set, Tuple
+
+from app.core import config
+from app.domain.concept.models import (
+    Concept,
+    ConceptVersion,
+    VersionWarnings,
+    check_version_fields,
+    project_version,
+)
+from app.persistence.cache import LRUCache
+from app.persistence.interfaces.concept_repository import ConceptRepository
+
+
+# Not a ConceptRepository subclass on purpose: the protocol's stub
+# methods would shadow the delegation in __getattr__.
+class CachedConceptRepository:
+    """
+    Read-through caching decorator around any ConceptRepository.
+
+    Caches `get_concept`, `get_latest_version` and `get_version` (and
+    the batch forms `get_concepts_many` / `get_latest_versions_many`;
+    `get_version_fields` projects cached versions):
+    - concepts and latest versions live in a size- and TTL-bounded LRU
+      and are invalidated by every write that touches their concept
+    - versions are immutable, so they are never invalidated, only
+      evicted when the version LRU is full
+    - stored warnings (`get_warnings`) are cached per version id and
+      invalidated by `save_warnings`
+
+    Cache misses (None) are not cached. Returned objects are shared with
+    the cache and must be treated as read-only. Everything else is
+    delegated to the wrapped repository unchanged.
+    """
+
+    def __init__(
+        self,
+        inner: ConceptRepository,
+        max_entries: int = config.CACHE_MAX_ENTRIES,
+        ttl_seconds: Optional[float] = config.CACHE_TTL_SECONDS,
+        version_max_entries: int = config.CACHE_VERSION_MAX_ENTRIES,
+    ) -> None:
+        self.inner = inner
+        self._current = LRUCache(max_entries, ttl_seconds)
+        self._versions = LRUCache(version_max_entries)
+        self._warnings = LRUCache(version_max_entries)
+
+    def __getattr__(self, name: str) -> Any:
+        # Uncached reads (listing, search, export, ...) go straight through.
+        return getattr(self.inner, name)
+
+    # -------------------------
+    # Writes (invalidate)
+    # -------------------------
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator["_CachedUnitOfWork"]:
+        touched: Set[str] = set()
+        touched_warnings: Set[str] = set()
+
+        try:
+            with self.inner.unit_of_work() as inner_uow:
+                yield _CachedUnitOfWork(inner_uow, touched, touched_warnings)
+        finally:
+            # Only after the commit (or rollback): until then readers must
+            # see the old state. After a lost compare-and-swap this drops
+            # the stale concept the caller read, so a retry reads fresh.
+            self._invalidate(touched)
+            if touched_warnings:
+                self._warnings.invalidate(*touched_warnings)
+
+    def save_concept(self, concept: Concept) -> None:
+        self.inner.save_concept(concept)
+        self._invalidate({concept.id})
+
+    def save_concept_if_current(self, concept: Concept, expected_version: int) -> None:
+        try:
+            self.inner.save_concept_if_current(concept, expected_version)
+        finally:
+            self._invalidate({concept.id})
+
+    def save_status_if_current(self, concept: Concept, expected_status: str) -> None:
+        self.inner.save_status_if_current(concept, expected_status)
+        self._invalidate({concept.id})
+
+    def save_version(self, version: ConceptVersion) -> None:
+        self.inner.save_version(version)
+        self._invalidate({version.concept_id})
+
+    def save_many(self, items: Sequence[Tuple[Concept, ConceptVersion]]) -> None:
+        self.inner.save_many(items)
+        self._invalidate({concept.id for concept, _ in items})
+
+    def save_warnings(self, records: Sequence[VersionWarnings]) -> None:
+        self.inner.save_warnings(records)
+        self._warnings.invalidate(*(record.version_id for record in records))
+
+    def _invalidate(self, concept_ids: Set[str]) -> None:
+        if not concept_ids:
+            return
+
+        keys = []
+        for concept_id in concept_ids:
+            keys.append(("concept", concept_id))
+            keys.append(("latest", concept_id))
+
+        self._current.invalidate(*keys)
+
+    # -------------------------
+    # Cached reads
+    # -------------------------
+
+    def get_concept(self, concept_id: str) -> Optional[Concept]:
+        key = ("concept", concept_id)
+
+        concept = self._current.get(key)
+        if concept is None:
+            generation = self._current.generation
+            concept = self.inner.get_concept(concept_id)
+            if concept is None:
+                return None
+            self._current.put_if_current(key, concept, generation)
+
+        # Concept is a mutable dataclass: hand out a copy.
+        return copy(concept)
+
+    def get_latest_version(self, concept_id: str) -> Optional[ConceptVersion]:
+        key = ("latest", concept_id)
+
+        version = self._current.get(key)
+        if version is not None:
+            return version
+
+        generation = self._current.generation
+        version = self.inner.get_latest_version(concept_id)
+        if version is None:
+            return None
+
+        self._current.put_if_current(key, version, generation)
+        self._versions.put((concept_id, version.version_number), version)
+        return version
+
+    def get_concepts_many(self, concept_ids: Collection[str]) -> Dict[str, Concept]:
+        found = self._current_many("concept", concept_ids, self.inner.get_concepts_many)
+        return {concept_id: copy(concept) for concept_id, concept in found.items()}
+
+    def get_latest_versions_many(
+        self,
+        concept_ids: Collection[str]
+    ) -> Dict[str, ConceptVersion]:
+        found = self._current_many("latest", concept_ids, self.inner.get_latest_versions_many)
+        for version in found.values():
+            self._versions.put((version.concept_id, version.version_number), version)
+        return found
+
+    def _current_many(self, kind: str, concept_ids: Collection[str], load) -> Dict[str, Any]:
+        # Cache hits, plus every miss loaded with one call to the inner
+        # repository.
+        found: Dict[str, Any] = {}
+        missing = []
+
+        for concept_id in concept_ids:
+            value = self._current.get((kind, concept_id))
+            if value is None:
+                missing.append(concept_id)
+            else:
+                found[concept_id] = value
+
+        if missing:
+            generation = self._current.generation
+            loaded = load(missing)
+            for concept_id, value in loaded.items():
+                self._current.put_if_current((kind, concept_id), value, generation)
+            found.update(loaded)
+
+        return found
+
+    def get_version(
+        self,
+        concept_id: str,
+        version_number: int
+    ) -> Optional[ConceptVersion]:
+        key = (concept_id, version_number)
+
+        version = self._versions.get(key)
+        if version is not None:
+            return version
+
+        version = self.inner.get_version(concept_id, version_number)
+        if version is not None:
+            self._versions.put(key, version)
+
+        return version
+
+    def get_version_fields(
+        self,
+        concept_id: str,
+        version_number: int,
+        fields: Sequence[str],
+    ) -> Optional[Dict[str, Any]]:
+        # A cached version is projected in memory; a miss reads only the
+        # requested columns and caches nothing (it is not a full version).
+        check_version_fields(fields)
+
+        version = self._versions.get((concept_id, version_number))
+        if version is None:
+            return self.inner.get_version_fields(concept_id, version_number, fields)
+
+        return project_version(version, fields)
+
+    def get_warnings(
+        self,
+        version_ids: Collection[str]
+    ) -> Dict[str, VersionWarnings]:
+        found: Dict[str, VersionWarnings] = {}
+        missing = []
+
+        for version_id in version_ids:
+            record = self._warnings.get(version_id)
+            if record is None:
+                missing.append(version_id)
+            else:
+                found[version_id] = record
+
+        if missing:
+            generation = self._warnings.generation
+            loaded = self.inner.get_warnings(missing)
+            for version_id, record in loaded.items():
+                self._warnings.put_if_current(version_id, record, generation)
+            found.update(loaded)
+
+        return found
+
+    # -------------------------
+    # Warm-up & monitoring
+    # -------------------------
+
+    def prime(self, count: int = config.CACHE_PRIME_COUNT) -> int:
+        """
+        Loads the `count` most recently updated concepts (with their
+        current version) in one query. Returns how many were cached.
+        """
+        if count <= 0:
+            return 0
+
+        generation = self._current.generation
+        pairs = self.inner.list_concepts(limit=count)
+
+        for concept, version in pairs:
+            self._current.put_if_current(("concept", concept.id), concept, generation)
+            self._current.put_if_current(("latest", concept.id), version, generation)
+            self._versions.put((concept.id, version.version_number), version)
+
+        return len(pairs)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "current": asdict(self._current.stats()),
+            "versions": asdict(self._versions.stats()),
+            "warnings": asdict(self._warnings.stats()),
+        }
+
+
+class _CachedUnitOfWork:
+    """
+    Unit-of-work view that records which concepts it wrote, so the
+    cache can drop them once the transaction has committed. Reads inside
+    a unit of work bypass the cache.
+    """
+
+    def __init__(
+        self,
+        inner: ConceptRepository,
+        touched: Set[str],
+        touched_warnings: Set[str],
+    ) -> None:
+        self.inner = inner
+        self._touched = touched
+        self._touched_warnings = touched_warnings
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator["_CachedUnitOfWork"]:
+        yield self
+
+    def save_concept(self, concept: Concept) -> None:
+        self.inner.save_concept(concept)
+        self._touched.add(concept.id)
+
+    def save_concept_if_current(self, concept: Concept, expected_version: int) -> None:
+        self._touched.add(concept.id)
+        self.inner.save_concept_if_current(concept, expected_version)
+
+    def save_status_if_current(self, concept: Concept, expected_status: str) -> None:
+        self.inner.save_status_if_current(concept, expected_status)
+        self._touched.add(concept.id)
+
+    def save_version(self, version: ConceptVersion) -> None:
+        self.inner.save_version(version)
+        self._touched.add(version.concept_id)
+
+    def save_many(self, items: Sequence[Tuple[Concept, ConceptVersion]]) -> None:
+        self.inner.save_many(items)
+        self._touched.update(concept.id for concept, _ in items)
+
+    def save_warnings(self, records: Sequence[VersionWarnings]) -> None:
+        self.inner.save_warnings(records)
+        self._touched_warnings.update(record.version_id for record in records)
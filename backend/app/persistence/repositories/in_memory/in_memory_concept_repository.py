@@ -1,8 +1,48 @@
-from typing import Dict, Optional, List
-from copy import deepcopy
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, Optional, List, Sequence, Tuple
+from copy import copy
+from dataclasses import replace
+import threading
 
-from app.domain.concept.models import Concept, ConceptVersion
+from app.core import config
+from app.domain.common.errors import StatusConflict, VersionConflict
+from app.domain.concept.models import (
+    Concept,
+    ConceptVersion,
+    PrerequisiteNode,
+    SearchHit,
+    SimilarConcept,
+    VersionSummary,
+    VersionWarnings,
+    check_version_fields,
+    project_version,
+)
+from app.persistence import minhash
+from app.persistence.db import ConnectionPool
 from app.persistence.interfaces.concept_repository import ConceptRepository
+from app.persistence.repositories.in_memory.inverted_index import InvertedIndex
+from app.persistence.repositories.in_memory.similarity_index import SimilarityIndex
+from app.persistence.repositories.in_memory.snapshot import read_snapshot, write_snapshot
+from app.persistence.repositories.sqlite.sqlite_concept_repository import (
+    SQLiteConceptRepository,
+)
+
+
+# Same field weights as the bm25() ranking of the SQLite FTS5 index.
+_SEARCH_WEIGHTS = {
+    "name": 10.0,
+    "core_definition": 5.0,
+    "expanded_explanation": 1.0,
+}
+
+
+def _search_fields(version: ConceptVersion) -> Dict[str, str]:
+    return {
+        "name": version.name,
+        "core_definition": version.core_definition,
+        "expanded_explanation": version.expanded_explanation,
+    }
 
 
 class InMemoryConceptRepository(ConceptRepository):
@@ -14,21 +54,116 @@ class InMemoryConceptRepository(ConceptRepository):
     - Immutable version storage
     - Deterministic retrieval
     - Versions cannot exist without a Concept
+
+    ConceptVersions are immutable values, so they are stored and handed
+    out as they are, never copied. Concepts are mutable and copied (one
+    shallow copy: every field is immutable) on the way in and out, as are
+    stored warning lists, so callers can never change stored state.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, index_history: bool = config.SEARCH_INDEX_HISTORY) -> None:
         self._concepts: Dict[str, Concept] = {}
         self._versions: Dict[str, Dict[int, ConceptVersion]] = {}
+        # Highest-numbered version of each concept that has one.
+        self._latest: Dict[str, ConceptVersion] = {}
+
+        # Keyed by (concept_id, version_number), like the FTS5 index.
+        self._search = InvertedIndex(_SEARCH_WEIGHTS)
+        self.index_history = index_history
+
+        # Keyed by concept_id: only current versions, like SQLite.
+        self._similarity = SimilarityIndex()
+
+        # False after a `restore` until the indexes above are first needed
+        # (by a search, similarity lookup or write) and rebuilt, reusing
+        # the MinHash signatures in `_restored_signatures` (from a
+        # snapshot) rather than recomputing them.
+        self._indexed = True
+        self._restored_signatures: Dict[str, Tuple[int, ...]] = {}
+
+        self._warnings: Dict[str, VersionWarnings] = {}
+
+        # Held for the whole of a unit of work, like SQLite's write lock.
+        self._lock = threading.RLock()
+        # Undo actions for the open unit of work (None when there is none).
+        self._undo: Optional[List[Callable[[], None]]] = None
+
+    # -------------------------
+    # Unit of Work
+    # -------------------------
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator["InMemoryConceptRepository"]:
+        with self._lock:
+            if self._undo is not None:
+                # Nested blocks join the outer unit of work.
+                yield self
+                return
+
+            self._undo = []
+            try:
+                yield self
+            except BaseException:
+                for undo in reversed(self._undo):
+                    undo()
+                raise
+            finally:
+                self._undo = None
+
+    def _record_undo(self, undo: Callable[[], None]) -> None:
+        if self._undo is not None:
+            self._undo.append(undo)
 
     # -------------------------
     # Concept Methods
     # -------------------------
 
     def save_concept(self, concept: Concept) -> None:
-        self._concepts[concept.id] = deepcopy(concept)
+        with self._lock:
+            previous = self._concepts.get(concept.id)
+            is_new = concept.id not in self._versions
+
+            self._concepts[concept.id] = copy(concept)
+
+            if is_new:
+                self._versions[concept.id] = {}
+
+            def undo() -> None:
+                if previous is None:
+                    self._concepts.pop(concept.id, None)
+                else:
+                    self._concepts[concept.id] = previous
+
+                if is_new:
+                    self._versions.pop(concept.id, None)
+
+            self._record_undo(undo)
+
+    def save_concept_if_current(self, concept: Concept, expected_version: int) -> None:
+        with self._lock:
+            stored = self._concepts.get(concept.id)
+
+            if stored is None:
+                raise ValueError("Concept does not exist")
+            if stored.current_version != expected_version:
+                raise VersionConflict(stored.current_version, expected_version)
 
-        if concept.id not in self._versions:
-            self._versions[concept.id] = {}
+            self.save_concept(replace(
+                stored,
+                current_version=concept.current_version,
+                updated_at=concept.updated_at,
+            ))
+
+    def save_status_if_current(self, concept: Concept, expected_status: str) -> None:
+        with self._lock:
+            stored = self._concepts.get(concept.id)
+
+            if stored is None:
+                raise ValueError("Concept does not exist")
+            if stored.status != expected_status:
+                raise StatusConflict(stored.status, expected_status)
+
+            self.save_concept(replace(stored, status=concept.status, updated_at=concept.updated_at))
 
     def get_concept(self, concept_id: str) -> Optional[Concept]:
         concept = self._concepts.get(concept_id)
@@ -36,7 +171,7 @@ class InMemoryConceptRepository(ConceptRepository):
         if concept is None:
             return None
 
-        return deepcopy(concept)
+        return copy(concept)
 
     # -------------------------
     # Version Methods
@@ -45,27 +180,126 @@ class InMemoryConceptRepository(ConceptRepository):
     def save_version(self, version: ConceptVersion) -> None:
         concept_id = version.concept_id
 
-        if concept_id not in self._versions:
-            raise ValueError("Concept does not exist")
+        with self._lock:
+            if concept_id not in self._versions:
+                raise ValueError("Concept does not exist")
 
-        versions = self._versions[concept_id]
+            versions = self._versions[concept_id]
 
-        if version.version_number in versions:
-            raise ValueError("Version already exists")
+            if version.version_number in versions:
+                raise ValueError("Version already exists")
 
-        versions[version.version_number] = deepcopy(version)
+            # Indexes rebuilt after a restore must not miss this write.
+            self._ensure_indexes()
 
-    def get_latest_version(self, concept_id: str) -> Optional[ConceptVersion]:
-        versions = self._versions.get(concept_id)
+            versions[version.version_number] = version
 
-        if versions is None:
-            return None
+            previous_latest = self._latest.get(concept_id)
+            if previous_latest is None or version.version_number > previous_latest.version_number:
+                self._latest[concept_id] = version
 
-        if len(versions) == 0:
-            return None
+            undo_index = self._index_version(version)
+
+            def undo() -> None:
+                versions.pop(version.version_number, None)
+                if previous_latest is None:
+                    self._latest.pop(concept_id, None)
+                else:
+                    self._latest[concept_id] = previous_latest
+
+                undo_index()
+
+            self._record_undo(undo)
+
+    def _index_version(self, version: ConceptVersion) -> Callable[[], None]:
+        """
+        Adds a just-saved version to the search and similarity indexes.
+        Returns the action that takes it out again.
+        """
+        concept_id = version.concept_id
+        key = (concept_id, version.version_number)
+        previous_key = (concept_id, version.version_number - 1)
+        unindexed = None
+
+        if not self.index_history and previous_key in self._search:
+            unindexed = self._versions[concept_id].get(version.version_number - 1)
+            self._search.remove(previous_key)
+
+        self._search.add(key, _search_fields(version))
+
+        previous_signature = self._similarity.signature(concept_id)
+        self._similarity.add(concept_id, minhash.signature(version.core_definition))
+
+        def undo() -> None:
+            self._search.remove(key)
+            if unindexed is not None:
+                self._search.add(previous_key, _search_fields(unindexed))
+
+            self._similarity.remove(concept_id)
+            if previous_signature is not None:
+                self._similarity.add(concept_id, previous_signature)
+
+        return undo
+
+    def _ensure_indexes(self) -> None:
+        """
+        After a `restore`, builds the search and similarity indexes on
+        first use, so restoring itself stays a plain bulk load.
+        """
+        if self._indexed:
+            return
+
+        with self._lock:
+            if self._indexed:
+                return
+
+            signatures, self._restored_signatures = self._restored_signatures, {}
 
-        latest_number = max(versions.keys())
-        return deepcopy(versions[latest_number])
+            search = InvertedIndex(_SEARCH_WEIGHTS)
+            similarity = SimilarityIndex()
+
+            for concept_id, latest in self._latest.items():
+                indexed = (
+                    self._versions[concept_id].values()
+                    if self.index_history else [latest]
+                )
+                for version in indexed:
+                    search.add((concept_id, version.version_number), _search_fields(version))
+
+                signature = signatures.get(concept_id)
+                if signature is None:
+                    signature = minhash.signature(latest.core_definition)
+                similarity.add(concept_id, signature)
+
+            self._search = search
+            self._similarity = similarity
+            self._indexed = True
+
+    def save_many(self, items: Sequence[Tuple[Concept, ConceptVersion]]) -> None:
+        with self.unit_of_work() as uow:
+            for concept, version in items:
+                uow.save_concept(concept)
+                uow.save_version(version)
+
+    def get_latest_version(self, concept_id: str) -> Optional[ConceptVersion]:
+        return self._latest.get(concept_id)
+
+    def get_concepts_many(self, concept_ids: Collection[str]) -> Dict[str, Concept]:
+        return {
+            concept_id: copy(self._concepts[concept_id])
+            for concept_id in concept_ids
+            if concept_id in self._concepts
+        }
+
+    def get_latest_versions_many(
+        self,
+        concept_ids: Collection[str]
+    ) -> Dict[str, ConceptVersion]:
+        return {
+            concept_id: self._latest[concept_id]
+            for concept_id in concept_ids
+            if concept_id in self._latest
+        }
 
     def get_version(self, concept_id: str, version_number: int) -> Optional[ConceptVersion]:
         versions = self._versions.get(concept_id)
@@ -73,17 +307,397 @@ class InMemoryConceptRepository(ConceptRepository):
         if versions is None:
             return None
 
-        version = versions.get(version_number)
-        if version is None:
-            return None
-
-        return deepcopy(version)
+        return versions.get(version_number)
 
 
-    def list_versions(self, concept_id: str) -> List[ConceptVersion]:
+    def list_versions(
+        self,
+        concept_id: str,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[ConceptVersion]:
         versions = self._versions.get(concept_id)
 
         if not versions:
             return []
 
-        return [deepcopy(v) for v in versions.values()]
+        ordered = sorted(versions.values(), key=lambda v: v.version_number, reverse=descending)
+
+        if after is not None:
+            ordered = [
+                v for v in ordered
+                if (v.version_number < after if descending else v.version_number > after)
+            ]
+
+        return ordered if limit is None else ordered[:limit]
+
+    def list_version_summaries(
+        self,
+        concept_id: str,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[VersionSummary]:
+        return [
+            VersionSummary(
+                id=v.id,
+                concept_id=v.concept_id,
+                version_number=v.version_number,
+                name=v.name,
+                created_by=v.created_by,
+                created_at=v.created_at,
+                change_note=v.change_note,
+            )
+            for v in self.list_versions(concept_id, after, limit, descending)
+        ]
+
+    def get_version_fields(
+        self,
+        concept_id: str,
+        version_number: int,
+        fields: Sequence[str],
+    ) -> Optional[Dict[str, Any]]:
+        check_version_fields(fields)
+        version = self.get_version(concept_id, version_number)
+        return project_version(version, fields) if version is not None else None
+
+    def list_version_fields(
+        self,
+        concept_id: str,
+        fields: Sequence[str],
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        check_version_fields(fields)
+        return [
+            project_version(version, fields)
+            for version in self.list_versions(concept_id, after, limit, descending)
+        ]
+
+    def iter_versions(
+        self,
+        concept_id: str,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> Iterator[ConceptVersion]:
+        return iter(self.list_versions(concept_id, after, limit, descending))
+
+    def list_concepts(
+        self,
+        status: Optional[str] = None,
+        updated_since: Optional[datetime] = None,
+        created_by: Optional[str] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: int = 50,
+    ) -> List[Tuple[Concept, ConceptVersion]]:
+        ordered = sorted(
+            self._concepts.values(),
+            key=lambda c: (c.updated_at, c.id),
+            reverse=True,
+        )
+
+        page = []
+
+        for concept in ordered:
+            if status is not None and concept.status != status:
+                continue
+            if updated_since is not None and concept.updated_at < updated_since:
+                continue
+            if after is not None and (concept.updated_at, concept.id) >= after:
+                continue
+
+            versions = self._versions.get(concept.id, {})
+            if created_by is not None:
+                first = versions.get(1)
+                if first is None or first.created_by != created_by:
+                    continue
+
+            version = versions.get(concept.current_version)
+            if version is None:
+                continue
+
+            page.append((copy(concept), version))
+            if len(page) >= limit:
+                break
+
+        return page
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[SearchHit]:
+        self._ensure_indexes()
+        ranked = self._search.search(query)[offset:offset + limit]
+
+        return [
+            SearchHit(
+                concept_id=concept_id,
+                version_number=version_number,
+                name=self._versions[concept_id][version_number].name,
+                score=score,
+                snippet=self._search.snippet((concept_id, version_number), query),
+            )
+            for (concept_id, version_number), score in ranked
+        ]
+
+    def find_similar(
+        self,
+        version: ConceptVersion,
+        limit: int = 10,
+        min_similarity: float = 0.0,
+    ) -> List[SimilarConcept]:
+        signature = minhash.signature(version.core_definition)
+        if not signature:
+            return []
+
+        self._ensure_indexes()
+
+        with self._lock:
+            scored = self._similarity.query(
+                signature,
+                exclude=version.concept_id,
+                max_candidates=config.SIMILARITY_MAX_CANDIDATES,
+            )
+
+            matches = []
+            for concept_id, score in scored:
+                if score < min_similarity or len(matches) >= limit:
+                    break
+
+                current = self._latest[concept_id]
+                matches.append(SimilarConcept(
+                    concept_id=concept_id,
+                    version_number=current.version_number,
+                    name=current.name,
+                    similarity=score,
+                ))
+
+        return matches
+
+    def list_prerequisite_nodes(
+        self,
+        updated_since: Optional[datetime] = None,
+    ) -> List[PrerequisiteNode]:
+        nodes = []
+
+        with self._lock:
+            for concept in self._concepts.values():
+                if updated_since is not None and concept.updated_at < updated_since:
+                    continue
+
+                version = self._versions.get(concept.id, {}).get(concept.current_version)
+                if version is None:
+                    continue
+
+                nodes.append(PrerequisiteNode(
+                    concept_id=concept.id,
+                    name=version.name,
+                    prerequisites=tuple(version.prerequisites),
+                    updated_at=concept.updated_at,
+                ))
+
+        return nodes
+
+    def iter_export(
+        self,
+        status: Optional[str] = None,
+        latest_only: bool = False,
+    ) -> Iterator[Tuple[Concept, ConceptVersion]]:
+        for concept_id in sorted(self._concepts):
+            concept = self._concepts[concept_id]
+
+            if status is not None and concept.status != status:
+                continue
+
+            versions = self._versions.get(concept_id, {})
+            numbers = (
+                [concept.current_version] if latest_only else sorted(versions)
+            )
+
+            for number in numbers:
+                version = versions.get(number)
+                if version is not None:
+                    yield copy(concept), version
+
+    # -------------------------
+    # Stored validation results
+    # -------------------------
+
+    def save_warnings(self, records: Sequence[VersionWarnings]) -> None:
+        with self._lock:
+            for record in records:
+                previous = self._warnings.get(record.version_id)
+                self._warnings[record.version_id] = replace(
+                    record, warnings=list(record.warnings)
+                )
+
+                def undo(version_id=record.version_id, previous=previous) -> None:
+                    if previous is None:
+                        self._warnings.pop(version_id, None)
+                    else:
+                        self._warnings[version_id] = previous
+
+                self._record_undo(undo)
+
+    def get_warnings(
+        self,
+        version_ids: Collection[str]
+    ) -> Dict[str, VersionWarnings]:
+        return {
+            version_id: replace(
+                self._warnings[version_id],
+                warnings=list(self._warnings[version_id].warnings),
+            )
+            for version_id in version_ids
+            if version_id in self._warnings
+        }
+
+    def get_warnings_by_content(
+        self,
+        content_hashes: Collection[str],
+        ruleset_version: str,
+    ) -> Dict[str, List[str]]:
+        wanted = set(content_hashes)
+
+        return {
+            record.content_hash: list(record.warnings)
+            for record in self._warnings.values()
+            if record.content_hash in wanted
+            and record.ruleset_version == ruleset_version
+        }
+
+    def list_stale_versions(
+        self,
+        ruleset_version: str,
+        after: Optional[str] = None,
+        limit: int = 500,
+    ) -> List[ConceptVersion]:
+        stale = []
+
+        for versions in self._versions.values():
+            for version in versions.values():
+                if after is not None and version.id <= after:
+                    continue
+
+                record = self._warnings.get(version.id)
+                if record is None or record.ruleset_version != ruleset_version:
+                    stale.append(version)
+
+        stale.sort(key=lambda v: v.id)
+        return stale[:limit]
+
+    # -------------------------
+    # Snapshot & restore
+    # -------------------------
+
+    def restore(
+        self,
+        concepts: Iterable[Concept],
+        versions: Iterable[ConceptVersion],
+        warnings: Iterable[VersionWarnings] = (),
+        signatures: Optional[Dict[str, Tuple[int, ...]]] = None,
+    ) -> None:
+        """
+        Replaces everything stored with these records in one bulk load:
+        no per-record checks beyond every version having its concept,
+        and the search and similarity indexes are rebuilt on first use.
+        `signatures` (concept_id -> MinHash signature of its current core
+        definition, as saved by `snapshot`) spares recomputing those. The
+        repository takes ownership of the objects passed in.
+        """
+        with self._lock:
+            if self._undo is not None:
+                raise RuntimeError("Cannot restore inside a unit of work")
+
+            self._concepts = {concept.id: concept for concept in concepts}
+            self._versions = {concept_id: {} for concept_id in self._concepts}
+            self._latest = {}
+
+            for version in versions:
+                by_number = self._versions.get(version.concept_id)
+                if by_number is None:
+                    raise ValueError("Concept does not exist")
+
+                by_number[version.version_number] = version
+
+                latest = self._latest.get(version.concept_id)
+                if latest is None or version.version_number > latest.version_number:
+                    self._latest[version.concept_id] = version
+
+            self._warnings = {record.version_id: record for record in warnings}
+
+            self._search = InvertedIndex(_SEARCH_WEIGHTS)
+            self._similarity = SimilarityIndex()
+            self._indexed = False
+            self._restored_signatures = dict(signatures or {})
+
+    def snapshot(self, path: str) -> int:
+        """
+        Writes every concept, version and stored warning to a snapshot
+        file, with the MinHash signature of each current version. Writes
+        wait until it is done. Returns the number of versions written.
+        """
+        self._ensure_indexes()
+
+        with self._lock:
+            versions = [
+                version
+                for by_number in self._versions.values()
+                for version in by_number.values()
+            ]
+            write_snapshot(
+                path,
+                list(self._concepts.values()),
+                versions,
+                list(self._warnings.values()),
+                signatures={
+                    concept_id: self._similarity.signature(concept_id)
+                    for concept_id in self._latest
+                },
+            )
+
+        return len(versions)
+
+    @classmethod
+    def from_snapshot(cls, path: str, **kwargs) -> "InMemoryConceptRepository":
+        """
+        A repository holding exactly what `snapshot` wrote to `path`.
+        """
+        snapshot = read_snapshot(path)
+
+        repo = cls(**kwargs)
+        repo.restore(
+            snapshot.concepts,
+            snapshot.versions,
+            snapshot.warnings,
+            signatures=snapshot.signatures,
+        )
+        return repo
+
+    @classmethod
+    def from_sqlite(cls, db_path: str, **kwargs) -> "InMemoryConceptRepository":
+        """
+        A repository holding every concept and version of an SQLite
+        database, which is opened read-only and left untouched. Stored
+        warnings are not copied: reads recompute them for each response
+        until the revalidation job stores them again.
+        """
+        pool = ConnectionPool(db_path, size=1, read_only=True)
+        try:
+            concepts: Dict[str, Concept] = {}
+            versions: List[ConceptVersion] = []
+
+            for concept, version in SQLiteConceptRepository(pool=pool).iter_export():
+                concepts[concept.id] = concept
+                versions.append(version)
+        finally:
+            pool.close()
+
+        repo = cls(**kwargs)
+        repo.restore(concepts.values(), versions)
+        return repo
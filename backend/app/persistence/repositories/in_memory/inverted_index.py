@@ -0,0 +1,147 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Hashable, List, Tuple
+
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# BM25 parameters (same defaults as SQLite FTS5).
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    Small BM25 full-text index for the in-memory repository.
+
+    Documents have named fields with per-field weights, mirroring the
+    weighted bm25() ranking used by the SQLite FTS5 index, so search
+    behaves the same in tests as in production.
+    """
+
+    def __init__(self, weights: Dict[str, float]) -> None:
+        self.weights = weights
+
+        # field -> token -> {doc_key: term frequency}
+        self._postings: Dict[str, Dict[str, Dict[Hashable, int]]] = {
+            field: {} for field in weights
+        }
+        # field -> {doc_key: token count}
+        self._lengths: Dict[str, Dict[Hashable, int]] = {
+            field: {} for field in weights
+        }
+        self._texts: Dict[Hashable, Dict[str, str]] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._texts
+
+    def add(self, key: Hashable, fields: Dict[str, str]) -> None:
+        if key in self._texts:
+            self.remove(key)
+
+        self._texts[key] = {field: fields.get(field, "") for field in self.weights}
+
+        for field in self.weights:
+            tokens = tokenize(self._texts[key][field])
+            self._lengths[field][key] = len(tokens)
+
+            postings = self._postings[field]
+            for token, count in Counter(tokens).items():
+                postings.setdefault(token, {})[key] = count
+
+    def remove(self, key: Hashable) -> None:
+        texts = self._texts.pop(key, None)
+        if texts is None:
+            return
+
+        for field in self.weights:
+            self._lengths[field].pop(key, None)
+
+            postings = self._postings[field]
+            for token in set(tokenize(texts[field])):
+                docs = postings.get(token)
+                if docs is None:
+                    continue
+                docs.pop(key, None)
+                if not docs:
+                    del postings[token]
+
+    def search(self, query: str) -> List[Tuple[Hashable, float]]:
+        """
+        Documents containing every query term (in any field), best first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        candidates = None
+        for term in set(terms):
+            docs = set()
+            for postings in self._postings.values():
+                docs.update(postings.get(term, ()))
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return []
+
+        total = len(self._texts)
+        scores = {key: 0.0 for key in candidates}
+
+        for field, weight in self.weights.items():
+            if weight == 0:
+                continue
+
+            lengths = self._lengths[field]
+            avg_length = (sum(lengths.values()) / total) if total else 0.0
+
+            for term in terms:
+                docs = self._postings[field].get(term)
+                if not docs:
+                    continue
+
+                idf = math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+
+                for key in candidates:
+                    tf = docs.get(key)
+                    if not tf:
+                        continue
+
+                    norm = 1 - _B + _B * (lengths[key] / avg_length if avg_length else 0)
+                    scores[key] += weight * idf * (tf * (_K1 + 1)) / (tf + _K1 * norm)
+
+        return sorted(scores.items(), key=lambda item: (-item[1], str(item[0])))
+
+    def snippet(self, key: Hashable, query: str, width: int = 16) -> str:
+        """
+        Excerpt of the first field matching the query, with matching
+        words wrapped in <mark></mark>.
+        """
+        terms = set(tokenize(query))
+        texts = self._texts.get(key, {})
+
+        for field in self.weights:
+            words = texts.get(field, "").split()
+            hits = [
+                i for i, word in enumerate(words)
+                if set(tokenize(word)) & terms
+            ]
+            if not hits:
+                continue
+
+            start = max(0, hits[0] - width // 4)
+            window = words[start:start + width]
+            marked = [
+                f"<mark>{word}</mark>" if set(tokenize(word)) & terms else word
+                for word in window
+            ]
+
+            prefix = "…" if start > 0 else ""
+            suffix = "…" if start + width < len(words) else ""
+            return prefix + " ".join(marked) + suffix
+
+        return ""
+
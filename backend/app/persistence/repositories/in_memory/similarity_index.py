@@ -0,0 +1,68 @@
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from app.persistence import minhash
+
+
+class SimilarityIndex:
+    """
+    MinHash/LSH near-duplicate index for the in-memory repository.
+
+    Same signatures and buckets as the SQLite `concept_signatures` /
+    `concept_signature_bands` tables, so similarity lookups behave the
+    same in tests as in production.
+    """
+
+    def __init__(self) -> None:
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+        # (band, bucket) -> keys
+        self._buckets: Dict[Tuple[int, int], Set[Hashable]] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def signature(self, key: Hashable) -> Optional[Tuple[int, ...]]:
+        return self._signatures.get(key)
+
+    def add(self, key: Hashable, signature: Tuple[int, ...]) -> None:
+        if key in self._signatures:
+            self.remove(key)
+
+        self._signatures[key] = signature
+        for band_key in minhash.band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+
+        for band_key in minhash.band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def query(
+        self,
+        signature: Tuple[int, ...],
+        exclude: Optional[Hashable] = None,
+        max_candidates: Optional[int] = None,
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        (key, estimated similarity) for every key sharing a bucket with
+        `signature`, most similar first. Only the `max_candidates` keys
+        sharing the most buckets are scored.
+        """
+        shared: Counter = Counter()
+        for band_key in minhash.band_keys(signature):
+            shared.update(self._buckets.get(band_key, ()))
+        shared.pop(exclude, None)
+
+        scored = [
+            (key, minhash.similarity(signature, self._signatures[key]))
+            for key, _ in shared.most_common(max_candidates)
+        ]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored
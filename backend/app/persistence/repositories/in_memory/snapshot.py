@@ -0,0 +1,133 @@
+import json
+import os
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.domain.concept.models import Concept, ConceptVersion, VersionWarnings
+from app.persistence import minhash
+
+
+# File layout: MAGIC, then one JSON document holding the format version,
+# the field names of each record type, one array per record (datetimes
+# as ISO 8601 strings) and the MinHash signature of each concept's
+# current version. Plain data only: reading a snapshot never runs code,
+# and the in-memory indexes are rebuilt from the records on first use
+# (the signatures, the expensive part, are reused when `minhash` still
+# computes them the same way).
+MAGIC = b"CONCEPT-SNAPSHOT\n"
+FORMAT_VERSION = 2
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+@dataclass
+class Snapshot:
+    concepts: List[Concept]
+    versions: List[ConceptVersion]
+    warnings: List[VersionWarnings]
+    # concept_id -> signature of its current core definition; empty if
+    # the snapshot was written with other MinHash parameters.
+    signatures: Dict[str, Tuple[int, ...]]
+
+
+def _field_names(cls) -> List[str]:
+    return [field.name for field in fields(cls)]
+
+
+def _datetime_positions(cls) -> List[int]:
+    return [i for i, field in enumerate(fields(cls)) if field.type is datetime]
+
+
+def _expected_fields() -> Dict[str, List[str]]:
+    return {
+        "concepts": _field_names(Concept),
+        "versions": _field_names(ConceptVersion),
+        "warnings": _field_names(VersionWarnings),
+    }
+
+
+def _minhash_parameters() -> List[int]:
+    return [minhash.NUM_PERMUTATIONS, minhash.BANDS]
+
+
+def _row(obj) -> List[Any]:
+    return [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in (getattr(obj, name) for name in _field_names(type(obj)))
+    ]
+
+
+def _records(cls, rows: List[List[Any]]) -> list:
+    positions = _datetime_positions(cls)
+    records = []
+    for row in rows:
+        for i in positions:
+            row[i] = datetime.fromisoformat(row[i])
+        records.append(cls(*row))
+    return records
+
+
+def write_snapshot(
+    path: PathLike,
+    concepts: List[Concept],
+    versions: List[ConceptVersion],
+    warnings: List[VersionWarnings],
+    signatures: Optional[Dict[str, Tuple[int, ...]]] = None,
+) -> None:
+    """
+    Writes the records (and optional MinHash `signatures`) to `path`
+    atomically (via a temporary file).
+    """
+    payload = {
+        "format": FORMAT_VERSION,
+        "fields": _expected_fields(),
+        "minhash": _minhash_parameters(),
+        "concepts": [_row(concept) for concept in concepts],
+        "versions": [_row(version) for version in versions],
+        "warnings": [_row(record) for record in warnings],
+        "signatures": {
+            concept_id: list(signature)
+            for concept_id, signature in (signatures or {}).items()
+        },
+    }
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode())
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: PathLike) -> Snapshot:
+    """
+    Reads a file written by `write_snapshot`. Raises ValueError if it is
+    not a snapshot or was written for a different data model.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a concept snapshot")
+
+        try:
+            payload: Dict[str, Any] = json.load(f)
+        except ValueError:
+            raise ValueError(f"{path} is not a concept snapshot") from None
+
+    if payload.get("format") != FORMAT_VERSION or payload.get("fields") != _expected_fields():
+        raise ValueError(f"{path} was written for a different data model")
+
+    signatures = {}
+    if payload.get("minhash") == _minhash_parameters():
+        signatures = {
+            concept_id: tuple(signature)
+            for concept_id, signature in payload["signatures"].items()
+        }
+
+    return Snapshot(
+        concepts=_records(Concept, payload["concepts"]),
+        versions=_records(ConceptVersion, payload["versions"]),
+        warnings=_records(VersionWarnings, payload["warnings"]),
+        signatures=signatures,
+    )
@@ -1,153 +1,1142 @@
+from contextlib import contextmanager
 from datetime import datetime
 import json
-from typing import Optional
-from app.domain.concept.models import Concept, ConceptVersion
+import sqlite3
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+from app.core import config
+from app.domain.common.errors import StatusConflict, VersionConflict
+from app.domain.concept.models import (
+    Concept,
+    ConceptVersion,
+    PrerequisiteNode,
+    SearchHit,
+    SimilarConcept,
+    VersionSummary,
+    VersionWarnings,
+    check_version_fields,
+)
+from app.persistence import minhash
 from app.persistence.interfaces.concept_repository import ConceptRepository
-from app.persistence.db import get_connection
-import os
+from app.persistence.db import ConnectionPool
+from app.persistence.writer import GroupCommitWriter
+
+T = TypeVar("T")
+
+
+_SELECT_CONCEPT = "SELECT * FROM concepts WHERE id = ?"
+
+_SELECT_LATEST_VERSION = """
+    SELECT *
+    FROM concept_versions
+    WHERE concept_id = ?
+    ORDER BY version_number DESC
+    LIMIT 1
+"""
+
+_SELECT_VERSION = """
+    SELECT *
+    FROM concept_versions
+    WHERE concept_id = ? AND version_number = ?
+"""
+
+_VERSION_SUMMARY_COLUMNS = (
+    "id, concept_id, version_number, name, created_by, created_at, change_note"
+)
+
+
+def _select_versions(
+    columns: str,
+    after: Optional[int] = None,
+    limit: Optional[int] = None,
+    descending: bool = False,
+) -> Tuple[str, list]:
+    """
+    One concept's versions in version_number order, those after `after`
+    (in that order) only. Served by the (concept_id, version_number)
+    unique index: no sort, and a page reads only its own rows.
+    """
+    sql = f"SELECT {columns} FROM concept_versions WHERE concept_id = ?"
+    params: list = []
+
+    if after is not None:
+        sql += " AND version_number < ?" if descending else " AND version_number > ?"
+        params.append(after)
+
+    sql += " ORDER BY version_number DESC" if descending else " ORDER BY version_number ASC"
+
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    return sql, params
+
+
+_INDEX_VERSION = """
+    INSERT INTO concept_search (
+        rowid, concept_id, version_number,
+        name, core_definition, expanded_explanation
+    )
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_INDEX_VERSION_BY_ID = """
+    INSERT INTO concept_search (
+        rowid, concept_id, version_number,
+        name, core_definition, expanded_explanation
+    )
+    SELECT rowid, concept_id, version_number,
+           name, core_definition, expanded_explanation
+    FROM concept_versions
+    WHERE id = ?
+"""
+
+_UNINDEX_VERSION = """
+    DELETE FROM concept_search
+    WHERE rowid = (
+        SELECT rowid
+        FROM concept_versions
+        WHERE concept_id = ? AND version_number = ?
+    )
+"""
+
+# bm25 column weights: concept_id, version_number, name,
+# core_definition, expanded_explanation.
+_SEARCH = """
+    SELECT
+        concept_id,
+        version_number,
+        name,
+        -bm25(concept_search, 0.0, 0.0, 10.0, 5.0, 1.0) AS score,
+        snippet(concept_search, -1, '<mark>', '</mark>', '…', 16) AS snippet
+    FROM concept_search
+    WHERE concept_search MATCH ?
+    ORDER BY score DESC
+    LIMIT ? OFFSET ?
+"""
+
+_UPSERT_WARNINGS = """
+    INSERT INTO version_warnings (
+        version_id, content_hash, ruleset_version, warnings, validated_at
+    )
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(version_id) DO UPDATE SET
+        content_hash = excluded.content_hash,
+        ruleset_version = excluded.ruleset_version,
+        warnings = excluded.warnings,
+        validated_at = excluded.validated_at
+"""
+
+_SELECT_STALE_VERSIONS = """
+    SELECT v.*
+    FROM concept_versions v
+    LEFT JOIN version_warnings w ON w.version_id = v.id
+    WHERE v.id > ?
+      AND (w.version_id IS NULL OR w.ruleset_version != ?)
+    ORDER BY v.id
+    LIMIT ?
+"""
+
+_UPSERT_SIGNATURE = """
+    INSERT INTO concept_signatures (concept_id, version_number, signature)
+    VALUES (?, ?, ?)
+    ON CONFLICT(concept_id) DO UPDATE SET
+        version_number = excluded.version_number,
+        signature = excluded.signature
+"""
+
+_UNINDEX_SIGNATURE = "DELETE FROM concept_signature_bands WHERE concept_id = ?"
+
+_INDEX_SIGNATURE_BAND = """
+    INSERT INTO concept_signature_bands (band, bucket, concept_id)
+    VALUES (?, ?, ?)
+"""
+
+# Concepts sharing the most LSH buckets with the probe come first: they
+# are the likeliest near duplicates when the candidate limit cuts in.
+_SIMILAR_CANDIDATES = f"""
+    SELECT s.concept_id, s.version_number, s.signature, v.name
+    FROM (
+        SELECT concept_id
+        FROM concept_signature_bands
+        WHERE ({" OR ".join(["(band = ? AND bucket = ?)"] * minhash.BANDS)})
+          AND concept_id != ?
+        GROUP BY concept_id
+        ORDER BY COUNT(*) DESC
+        LIMIT ?
+    ) AS candidates
+    JOIN concept_signatures s ON s.concept_id = candidates.concept_id
+    JOIN concept_versions v
+        ON v.concept_id = s.concept_id
+        AND v.version_number = s.version_number
+"""
+
+# Current versions missing from (or outdated in) the similarity index.
+_SELECT_UNINDEXED_SIGNATURES = """
+    SELECT v.concept_id, v.version_number, v.core_definition
+    FROM concepts c
+    JOIN concept_versions v
+        ON v.concept_id = c.id
+        AND v.version_number = c.current_version
+    LEFT JOIN concept_signatures s ON s.concept_id = c.id
+    WHERE s.concept_id IS NULL OR s.version_number != c.current_version
+"""
+
+_UNLINK_PREREQUISITES = "DELETE FROM concept_prerequisites WHERE concept_id = ?"
+
+_LINK_PREREQUISITE = """
+    INSERT INTO concept_prerequisites (concept_id, position, prerequisite)
+    VALUES (?, ?, ?)
+"""
+
+_SELECT_GRAPH_NODES = """
+    SELECT c.id, c.updated_at, v.name
+    FROM concepts c
+    JOIN concept_versions v
+        ON v.concept_id = c.id
+        AND v.version_number = c.current_version
+    WHERE c.updated_at >= ?
+"""
+
+_SELECT_GRAPH_EDGES = """
+    SELECT p.concept_id, p.prerequisite
+    FROM concept_prerequisites p
+    JOIN concepts c ON c.id = p.concept_id
+    WHERE c.updated_at >= ?
+    ORDER BY p.concept_id, p.position
+"""
+
+# Concept + version in one row, for queries joining the two tables.
+_JOINED_COLUMNS = """
+    c.current_version, c.status,
+    c.created_at AS concept_created_at,
+    c.updated_at AS concept_updated_at,
+    v.*
+"""
+
+# Most ids bound into one `IN (...)` list; longer lists are split.
+_IN_BATCH_SIZE = 500
+
+# Rows read per query when streaming large result sets. Each chunk is a
+# separate keyset-paginated query on a pooled connection that goes back
+# to the pool before the chunk is yielded, so a slow consumer never holds
+# one.
+_STREAM_CHUNK_SIZE = 500
+
+# Hot read statements, compiled once per pooled connection at startup.
+_PREPARED_READS = (
+    (_SELECT_CONCEPT, ("",)),
+    (_SELECT_LATEST_VERSION, ("",)),
+    (_SELECT_VERSION, ("", 0)),
+    (_select_versions("*")[0], ("",)),
+    (_select_versions(_VERSION_SUMMARY_COLUMNS)[0], ("",)),
+)
+
+
+def _row_to_concept(row) -> Concept:
+    return Concept(
+        id=row["id"],
+        current_version=row["current_version"],
+        status=row["status"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+        updated_at=datetime.fromisoformat(row["updated_at"]),
+    )
+
+
+def _joined_row_to_concept(row) -> Concept:
+    return Concept(
+        id=row["concept_id"],
+        current_version=row["current_version"],
+        status=row["status"],
+        created_at=datetime.fromisoformat(row["concept_created_at"]),
+        updated_at=datetime.fromisoformat(row["concept_updated_at"]),
+    )
+
+
+def _row_to_version(row) -> ConceptVersion:
+    return ConceptVersion(
+        id=row["id"],
+        concept_id=row["concept_id"],
+        version_number=row["version_number"],
+        name=row["name"],
+        core_definition=row["core_definition"],
+        expanded_explanation=row["expanded_explanation"],
+        learning_objective=row["learning_objective"],
+        examples=json.loads(row["examples"]),
+        misconceptions=json.loads(row["misconceptions"]),
+        prerequisites=json.loads(row["prerequisites"]),
+        scope_boundaries=row["scope_boundaries"],
+        created_by=row["created_by"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+        change_note=row["change_note"],
+    )
+
+
+# concept_versions' columns are named after ConceptVersion's fields;
+# these are the ones stored encoded.
+_VERSION_FIELD_DECODERS = {
+    "examples": json.loads,
+    "misconceptions": json.loads,
+    "prerequisites": json.loads,
+    "created_at": datetime.fromisoformat,
+}
+
+
+def _version_columns(fields: Sequence[str]) -> str:
+    # Column names are interpolated into SQL: only known ones get through.
+    check_version_fields(fields)
+    return ", ".join(fields)
+
+
+def _row_to_version_fields(row, fields: Sequence[str]) -> Dict[str, Any]:
+    decoders = _VERSION_FIELD_DECODERS
+    return {
+        name: decoders[name](value) if name in decoders else value
+        for name, value in zip(fields, row)
+    }
+
+
+def _row_to_version_summary(row) -> VersionSummary:
+    return VersionSummary(
+        id=row["id"],
+        concept_id=row["concept_id"],
+        version_number=row["version_number"],
+        name=row["name"],
+        created_by=row["created_by"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+        change_note=row["change_note"],
+    )
+
+
+# Compare-and-swap on current_version: no row changes if another writer
+# moved the concept on since it was read. Only current_version and
+# updated_at are written, so an update racing a status change can never
+# put the old status back.
+_SWAP_CONCEPT = """
+    UPDATE concepts
+    SET current_version = ?, updated_at = ?
+    WHERE id = ? AND current_version = ?
+"""
+
+# Status changes touch only status and updated_at, so one racing an
+# update can never move current_version back.
+_SWAP_STATUS = """
+    UPDATE concepts
+    SET status = ?, updated_at = ?
+    WHERE id = ? AND status = ?
+"""
+
+_UPSERT_CONCEPT = """
+    INSERT INTO concepts (id, current_version, status, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        current_version = excluded.current_version,
+        status = excluded.status,
+        updated_at = excluded.updated_at
+"""
+
+_INSERT_VERSION = """
+    INSERT INTO concept_versions (
+        id, concept_id, version_number,
+        name, core_definition, expanded_explanation,
+        learning_objective, examples, misconceptions,
+        prerequisites, scope_boundaries,
+        created_by, created_at, change_note
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _row_to_warnings(row) -> VersionWarnings:
+    return VersionWarnings(
+        version_id=row["version_id"],
+        content_hash=row["content_hash"],
+        ruleset_version=row["ruleset_version"],
+        warnings=json.loads(row["warnings"]),
+        validated_at=datetime.fromisoformat(row["validated_at"]),
+    )
+
+
+def _warnings_params(record: VersionWarnings) -> tuple:
+    return (
+        record.version_id,
+        record.content_hash,
+        record.ruleset_version,
+        json.dumps(record.warnings),
+        record.validated_at.isoformat(),
+    )
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join("?" * count)
+
+
+def _batches(ids: Collection[str]) -> Iterator[List[str]]:
+    ids = list(dict.fromkeys(ids))
+    for start in range(0, len(ids), _IN_BATCH_SIZE):
+        yield ids[start:start + _IN_BATCH_SIZE]
+
+
+def _concept_params(concept: Concept) -> tuple:
+    return (
+        concept.id,
+        concept.current_version,
+        concept.status,
+        concept.created_at.isoformat(),
+        concept.updated_at.isoformat(),
+    )
+
+
+def _version_params(version: ConceptVersion) -> tuple:
+    return (
+        version.id,
+        version.concept_id,
+        version.version_number,
+        version.name,
+        version.core_definition,
+        version.expanded_explanation,
+        version.learning_objective,
+        json.dumps(version.examples),
+        json.dumps(version.misconceptions),
+        json.dumps(version.prerequisites),
+        version.scope_boundaries,
+        version.created_by,
+        version.created_at.isoformat(),
+        version.change_note,
+    )
+
+
+def _upsert_concept(conn, concept: Concept) -> None:
+    conn.execute(_UPSERT_CONCEPT, _concept_params(concept))
+
+
+def _swap_concept(conn, concept: Concept, expected_version: int) -> None:
+    cursor = conn.execute(
+        _SWAP_CONCEPT,
+        (
+            concept.current_version,
+            concept.updated_at.isoformat(),
+            concept.id,
+            expected_version,
+        ),
+    )
+    if cursor.rowcount:
+        return
+
+    row = conn.execute(_SELECT_CONCEPT, (concept.id,)).fetchone()
+    if row is None:
+        raise ValueError("Concept does not exist")
+    raise VersionConflict(row["current_version"], expected_version)
+
+
+def _swap_status(conn, concept: Concept, expected_status: str) -> None:
+    cursor = conn.execute(
+        _SWAP_STATUS,
+        (concept.status, concept.updated_at.isoformat(), concept.id, expected_status),
+    )
+    if cursor.rowcount:
+        return
+
+    row = conn.execute(_SELECT_CONCEPT, (concept.id,)).fetchone()
+    if row is None:
+        raise ValueError("Concept does not exist")
+    raise StatusConflict(row["status"], expected_status)
+
+
+def _translate_integrity_error(e: sqlite3.IntegrityError) -> ValueError:
+    if "UNIQUE" in str(e):
+        return ValueError("Version already exists")
+    return ValueError("Concept does not exist")
+
+
+def _index_signatures(
+    conn,
+    entries: Sequence[Tuple[str, int, Tuple[int, ...]]],
+    replace: bool,
+) -> None:
+    """
+    Writes (concept_id, version_number, signature) entries to the
+    similarity index; `replace` first drops the concepts' old buckets.
+    """
+    if replace:
+        conn.executemany(_UNINDEX_SIGNATURE, [(entry[0],) for entry in entries])
+
+    conn.executemany(
+        _UPSERT_SIGNATURE,
+        [
+            (concept_id, version_number, minhash.to_bytes(signature))
+            for concept_id, version_number, signature in entries
+        ],
+    )
+    conn.executemany(
+        _INDEX_SIGNATURE_BAND,
+        [
+            (band, bucket, concept_id)
+            for concept_id, _, signature in entries
+            for band, bucket in minhash.band_keys(signature)
+        ],
+    )
+
+
+def _link_prerequisites(
+    conn,
+    versions: Sequence[ConceptVersion],
+    replace: bool,
+) -> None:
+    """
+    Writes the versions' prerequisite names to the edge table; `replace`
+    first drops their concepts' previous edges.
+    """
+    if replace:
+        conn.executemany(
+            _UNLINK_PREREQUISITES,
+            [(version.concept_id,) for version in versions],
+        )
+
+    conn.executemany(
+        _LINK_PREREQUISITE,
+        [
+            (version.concept_id, position, prerequisite)
+            for version in versions
+            for position, prerequisite in enumerate(version.prerequisites)
+        ],
+    )
+
+
+def _save_version(
+    conn,
+    version: ConceptVersion,
+    index_history: bool,
+    signature: Tuple[int, ...],
+) -> None:
+    try:
+        cursor = conn.execute(_INSERT_VERSION, _version_params(version))
+    except sqlite3.IntegrityError as e:
+        raise _translate_integrity_error(e) from e
+
+    if not index_history and version.version_number > 1:
+        conn.execute(
+            _UNINDEX_VERSION,
+            (version.concept_id, version.version_number - 1),
+        )
+
+    conn.execute(
+        _INDEX_VERSION,
+        (
+            cursor.lastrowid,
+            version.concept_id,
+            version.version_number,
+            version.name,
+            version.core_definition,
+            version.expanded_explanation,
+        ),
+    )
+
+    _index_signatures(
+        conn,
+        [(version.concept_id, version.version_number, signature)],
+        replace=version.version_number > 1,
+    )
+    _link_prerequisites(conn, [version], replace=version.version_number > 1)
+
+
+def _save_many(
+    conn,
+    items: Sequence[Tuple[Concept, ConceptVersion]],
+    signatures: Sequence[Tuple[int, ...]],
+) -> None:
+    try:
+        conn.executemany(
+            _UPSERT_CONCEPT,
+            [_concept_params(concept) for concept, _ in items],
+        )
+        conn.executemany(
+            _INSERT_VERSION,
+            [_version_params(version) for _, version in items],
+        )
+    except sqlite3.IntegrityError as e:
+        raise _translate_integrity_error(e) from e
+
+    # Bulk-created concepts only have version 1: nothing to unindex.
+    conn.executemany(
+        _INDEX_VERSION_BY_ID,
+        [(version.id,) for _, version in items],
+    )
+
+    _index_signatures(
+        conn,
+        [
+            (version.concept_id, version.version_number, signature)
+            for (_, version), signature in zip(items, signatures)
+        ],
+        replace=False,
+    )
+    _link_prerequisites(conn, [version for _, version in items], replace=False)
+
+
+def _fts_query(text: str) -> str:
+    """
+    Turns free text into an FTS5 query: every word must match, and
+    FTS5 operators in user input are treated as plain words.
+    """
+    terms = text.split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
 
 class SQLiteConceptRepository(ConceptRepository):
-    def __init__(self, db_path: str):
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.db_path = db_path
+    """
+    SQLite-backed repository.
+
+    Connections are borrowed from a shared ConnectionPool instead of
+    being opened per call. Pass `pool` to share one pool across
+    repositories; passing only `db_path` creates a private pool.
+
+    With a `writer`, every write is handed to the GroupCommitWriter and
+    committed together with other callers' writes; a unit of work runs
+    as one writer operation (`GroupCommitWriter.hold`), its reads
+    included. Other reads still go straight to the pool.
 
+    Every saved version is added to the `concept_search` FTS5 index in
+    the same transaction; unless `index_history` is set, the previous
+    version of the concept is dropped from it. The similarity index
+    (MinHash signatures and LSH buckets) and the prerequisite edges
+    always hold only the current version of each concept.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        pool: Optional[ConnectionPool] = None,
+        writer: Optional[GroupCommitWriter] = None,
+        index_history: bool = config.SEARCH_INDEX_HISTORY,
+    ):
+        if pool is None:
+            if db_path is None:
+                raise ValueError("Either db_path or pool is required")
+            pool = ConnectionPool(db_path)
+
+        self.db_path = pool.db_path
+        self.pool = pool
+        self.writer = writer
+        self.index_history = index_history
+
+    @staticmethod
+    def prepare_statements(conn) -> None:
+        """
+        Compiles the hot read statements into the connection's statement
+        cache. Intended as a ConnectionPool `on_connect` hook.
+        """
+        for sql, params in _PREPARED_READS:
+            conn.execute(sql, params).fetchall()
+
+    def _connection(self):
+        return self.pool.connection()
+
+    def _write(self, op: Callable[..., T]) -> T:
+        if self.writer is not None:
+            return self.writer.execute(op)
+
+        with self._connection() as conn:
+            return op(conn)
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator["SQLiteConceptRepository"]:
+        # Either way the block's reads and writes share one transaction
+        # that holds SQLite's write lock: no other write can interleave.
+        if self.writer is not None:
+            with self.writer.hold() as conn:
+                yield _SQLiteUnitOfWork(self, conn)
+            return
+
+        with self.pool.transaction() as conn:
+            yield _SQLiteUnitOfWork(self, conn)
 
     def save_concept(self, concept: Concept) -> None:
-        with get_connection(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO concepts (id, current_version, status, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(id) DO UPDATE SET
-                    current_version = excluded.current_version,
-                    status = excluded.status,
-                    updated_at = excluded.updated_at
-                """,
-                (
-                    concept.id,
-                    concept.current_version,
-                    concept.status,
-                    concept.created_at.isoformat(),
-                    concept.updated_at.isoformat(),
-                ),
-            )
+        self._write(lambda conn: _upsert_concept(conn, concept))
+
+    def save_concept_if_current(self, concept: Concept, expected_version: int) -> None:
+        self._write(lambda conn: _swap_concept(conn, concept, expected_version))
+
+    def save_status_if_current(self, concept: Concept, expected_status: str) -> None:
+        self._write(lambda conn: _swap_status(conn, concept, expected_status))
 
     def save_version(self, version: ConceptVersion) -> None:
-        with get_connection(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO concept_versions (
-                    id, concept_id, version_number,
-                    name, core_definition, expanded_explanation,
-                    learning_objective, examples, misconceptions,
-                    prerequisites, scope_boundaries,
-                    created_by, created_at, change_note
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    version.id,
-                    version.concept_id,
-                    version.version_number,
-                    version.name,
-                    version.core_definition,
-                    version.expanded_explanation,
-                    version.learning_objective,
-                    json.dumps(version.examples),
-                    json.dumps(version.misconceptions),
-                    json.dumps(version.prerequisites),
-                    version.scope_boundaries,
-                    version.created_by,
-                    version.created_at.isoformat(),
-                    version.change_note,
-                ),
-            )
+        # Hashed here, not in the write: keep CPU work off the writer.
+        signature = minhash.signature(version.core_definition)
+
+        self._write(
+            lambda conn: _save_version(conn, version, self.index_history, signature)
+        )
+
+    def save_many(self, items: Sequence[Tuple[Concept, ConceptVersion]]) -> None:
+        if not items:
+            return
+
+        signatures = [minhash.signature(version.core_definition) for _, version in items]
+
+        # executemany inside one transaction: one commit for the whole batch.
+        with self.unit_of_work() as uow:
+            uow._write(lambda conn: _save_many(conn, items, signatures))
 
     def get_concept(self, concept_id: str) -> Optional[Concept]:
-        with get_connection(self.db_path) as conn:
-            row = conn.execute(
-                "SELECT * FROM concepts WHERE id = ?",
-                (concept_id,),
-            ).fetchone()
+        with self._connection() as conn:
+            row = conn.execute(_SELECT_CONCEPT, (concept_id,)).fetchone()
 
         if not row:
             return None
 
-        return Concept(
-            id=row["id"],
-            current_version=row["current_version"],
-            status=row["status"],
-            created_at=datetime.fromisoformat(row["created_at"]),
-            updated_at=datetime.fromisoformat(row["updated_at"]),
-        )
+        return _row_to_concept(row)
 
     def get_latest_version(self, concept_id: str) -> Optional[ConceptVersion]:
-        with get_connection(self.db_path) as conn:
+        with self._connection() as conn:
+            row = conn.execute(_SELECT_LATEST_VERSION, (concept_id,)).fetchone()
+
+        if not row:
+            return None
+
+        return _row_to_version(row)
+
+    def get_concepts_many(self, concept_ids: Collection[str]) -> Dict[str, Concept]:
+        found: Dict[str, Concept] = {}
+
+        with self._connection() as conn:
+            for batch in _batches(concept_ids):
+                rows = conn.execute(
+                    f"SELECT * FROM concepts WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                ).fetchall()
+                found.update((row["id"], _row_to_concept(row)) for row in rows)
+
+        return found
+
+    def get_latest_versions_many(
+        self,
+        concept_ids: Collection[str]
+    ) -> Dict[str, ConceptVersion]:
+        found: Dict[str, ConceptVersion] = {}
+
+        # The inner query finds each latest version number from the
+        # (concept_id, version_number) index alone; only those rows are read.
+        with self._connection() as conn:
+            for batch in _batches(concept_ids):
+                rows = conn.execute(
+                    f"""
+                    SELECT v.*
+                    FROM (
+                        SELECT concept_id, MAX(version_number) AS version_number
+                        FROM concept_versions
+                        WHERE concept_id IN ({_placeholders(len(batch))})
+                        GROUP BY concept_id
+                    ) latest
+                    JOIN concept_versions v USING (concept_id, version_number)
+                    """,
+                    batch,
+                ).fetchall()
+                found.update((row["concept_id"], _row_to_version(row)) for row in rows)
+
+        return found
+
+    def get_version(
+        self,
+        concept_id: str,
+        version_number: int
+    ) -> Optional[ConceptVersion]:
+        with self._connection() as conn:
             row = conn.execute(
-                """
-                SELECT *
-                FROM concept_versions
-                WHERE concept_id = ?
-                ORDER BY version_number DESC
-                LIMIT 1
-                """,
-                (concept_id,),
+                _SELECT_VERSION,
+                (concept_id, version_number),
             ).fetchone()
 
         if not row:
             return None
 
-        return ConceptVersion(
-            id=row["id"],
-            concept_id=row["concept_id"],
-            version_number=row["version_number"],
-            name=row["name"],
-            core_definition=row["core_definition"],
-            expanded_explanation=row["expanded_explanation"],
-            learning_objective=row["learning_objective"],
-            examples=json.loads(row["examples"]),
-            misconceptions=json.loads(row["misconceptions"]),
-            prerequisites=json.loads(row["prerequisites"]),
-            scope_boundaries=row["scope_boundaries"],
-            created_by=row["created_by"],
-            created_at=datetime.fromisoformat(row["created_at"]),
-            change_note=row["change_note"],
-        )
-    
-    def list_versions(self, concept_id: str):
+        return _row_to_version(row)
 
-        with get_connection(self.db_path) as conn:
-            rows = conn.execute(
+    def list_versions(
+        self,
+        concept_id: str,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[ConceptVersion]:
+        sql, params = _select_versions("*", after, limit, descending)
+
+        with self._connection() as conn:
+            rows = conn.execute(sql, [concept_id, *params]).fetchall()
+
+        return [_row_to_version(row) for row in rows]
+
+    def list_version_summaries(
+        self,
+        concept_id: str,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[VersionSummary]:
+        sql, params = _select_versions(_VERSION_SUMMARY_COLUMNS, after, limit, descending)
+
+        with self._connection() as conn:
+            rows = conn.execute(sql, [concept_id, *params]).fetchall()
+
+        return [_row_to_version_summary(row) for row in rows]
+
+    def get_version_fields(
+        self,
+        concept_id: str,
+        version_number: int,
+        fields: Sequence[str],
+    ) -> Optional[Dict[str, Any]]:
+        sql = f"""
+            SELECT {_version_columns(fields)}
+            FROM concept_versions
+            WHERE concept_id = ? AND version_number = ?
+        """
+
+        with self._connection() as conn:
+            row = conn.execute(sql, (concept_id, version_number)).fetchone()
+
+        if not row:
+            return None
+
+        return _row_to_version_fields(row, fields)
+
+    def list_version_fields(
+        self,
+        concept_id: str,
+        fields: Sequence[str],
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        sql, params = _select_versions(_version_columns(fields), after, limit, descending)
+
+        with self._connection() as conn:
+            rows = conn.execute(sql, [concept_id, *params]).fetchall()
+
+        return [_row_to_version_fields(row, fields) for row in rows]
+
+    def iter_versions(
+        self,
+        concept_id: str,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> Iterator[ConceptVersion]:
+        # Like iter_export: one chunk at a time, keyed on version_number.
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = _STREAM_CHUNK_SIZE if remaining is None else min(remaining, _STREAM_CHUNK_SIZE)
+            versions = self.list_versions(concept_id, after=after, limit=size, descending=descending)
+
+            yield from versions
+
+            if len(versions) < size:
+                break
+
+            after = versions[-1].version_number
+            if remaining is not None:
+                remaining -= len(versions)
+
+    def list_concepts(
+        self,
+        status: Optional[str] = None,
+        updated_since: Optional[datetime] = None,
+        created_by: Optional[str] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: int = 50,
+    ) -> List[Tuple[Concept, ConceptVersion]]:
+        conditions = []
+        params: list = []
+
+        if status is not None:
+            conditions.append("c.status = ?")
+            params.append(status)
+
+        if updated_since is not None:
+            conditions.append("c.updated_at >= ?")
+            params.append(updated_since.isoformat())
+
+        if created_by is not None:
+            # The concept's creator is the author of its first version.
+            conditions.append(
+                """
+                EXISTS (
+                    SELECT 1 FROM concept_versions first
+                    WHERE first.concept_id = c.id
+                    AND first.version_number = 1
+                    AND first.created_by = ?
+                )
                 """
-                SELECT *
-                FROM concept_versions
-                WHERE concept_id = ?
-                ORDER BY version_number ASC
+            )
+            params.append(created_by)
+
+        if after is not None:
+            # Keyset: seek straight past the last row of the previous page.
+            conditions.append("(c.updated_at, c.id) < (?, ?)")
+            params.extend([after[0].isoformat(), after[1]])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT {_JOINED_COLUMNS}
+                FROM concepts c
+                JOIN concept_versions v
+                    ON v.concept_id = c.id
+                    AND v.version_number = c.current_version
+                {where}
+                ORDER BY c.updated_at DESC, c.id DESC
+                LIMIT ?
                 """,
-                (concept_id,),
+                params,
             ).fetchall()
 
-        versions = []
+        return [(_joined_row_to_concept(row), _row_to_version(row)) for row in rows]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[SearchHit]:
+        match = _fts_query(query)
+        if not match:
+            return []
+
+        with self._connection() as conn:
+            rows = conn.execute(_SEARCH, (match, limit, offset)).fetchall()
+
+        return [
+            SearchHit(
+                concept_id=row["concept_id"],
+                version_number=row["version_number"],
+                name=row["name"],
+                score=row["score"],
+                snippet=row["snippet"],
+            )
+            for row in rows
+        ]
+
+    def find_similar(
+        self,
+        version: ConceptVersion,
+        limit: int = 10,
+        min_similarity: float = 0.0,
+    ) -> List[SimilarConcept]:
+        signature = minhash.signature(version.core_definition)
+        if not signature:
+            return []
+
+        params: list = [value for key in minhash.band_keys(signature) for value in key]
+        params += [version.concept_id, config.SIMILARITY_MAX_CANDIDATES]
 
+        with self._connection() as conn:
+            rows = conn.execute(_SIMILAR_CANDIDATES, params).fetchall()
+
+        matches = []
         for row in rows:
-            versions.append(
-                ConceptVersion(
-                    id=row["id"],
+            score = minhash.similarity(signature, minhash.from_bytes(row["signature"]))
+            if score >= min_similarity:
+                matches.append(SimilarConcept(
                     concept_id=row["concept_id"],
                     version_number=row["version_number"],
                     name=row["name"],
-                    core_definition=row["core_definition"],
-                    expanded_explanation=row["expanded_explanation"],
-                    learning_objective=row["learning_objective"],
-                    examples=json.loads(row["examples"]),
-                    misconceptions=json.loads(row["misconceptions"]),
-                    prerequisites=json.loads(row["prerequisites"]),
-                    scope_boundaries=row["scope_boundaries"],
-                    created_by=row["created_by"],
-                    created_at=datetime.fromisoformat(row["created_at"]),
-                    change_note=row["change_note"],
+                    similarity=score,
+                ))
+
+        matches.sort(key=lambda match: (-match.similarity, match.concept_id))
+        return matches[:limit]
+
+    def backfill_similarity_index(self, batch_size: int = 500) -> int:
+        """
+        Indexes current versions missing from the similarity index
+        (concepts saved before it existed). Returns how many it indexed;
+        0, after one cheap query, once everything is indexed.
+        """
+        with self._connection() as conn:
+            rows = conn.execute(_SELECT_UNINDEXED_SIGNATURES).fetchall()
+
+        for start in range(0, len(rows), batch_size):
+            entries = [
+                (
+                    row["concept_id"],
+                    row["version_number"],
+                    minhash.signature(row["core_definition"]),
                 )
+                for row in rows[start:start + batch_size]
+            ]
+
+            with self.unit_of_work() as uow:
+                uow._write(
+                    lambda conn, entries=entries: _index_signatures(conn, entries, replace=True)
+                )
+
+        return len(rows)
+
+    def list_prerequisite_nodes(
+        self,
+        updated_since: Optional[datetime] = None,
+    ) -> List[PrerequisiteNode]:
+        since = updated_since.isoformat() if updated_since is not None else ""
+
+        with self._connection() as conn:
+            nodes = conn.execute(_SELECT_GRAPH_NODES, (since,)).fetchall()
+            edges = conn.execute(_SELECT_GRAPH_EDGES, (since,)).fetchall()
+
+        prerequisites: Dict[str, List[str]] = {}
+        for concept_id, prerequisite in edges:
+            prerequisites.setdefault(concept_id, []).append(prerequisite)
+
+        return [
+            PrerequisiteNode(
+                concept_id=row["id"],
+                name=row["name"],
+                prerequisites=tuple(prerequisites.get(row["id"], ())),
+                updated_at=datetime.fromisoformat(row["updated_at"]),
             )
+            for row in nodes
+        ]
+
+    def iter_export(
+        self,
+        status: Optional[str] = None,
+        latest_only: bool = False,
+    ) -> Iterator[Tuple[Concept, ConceptVersion]]:
+        conditions = ["(v.concept_id, v.version_number) > (?, ?)"]
+        params: list = []
+
+        if latest_only:
+            conditions.append("v.version_number = c.current_version")
+
+        if status is not None:
+            conditions.append("c.status = ?")
+            params.append(status)
+
+        sql = f"""
+            SELECT {_JOINED_COLUMNS}
+            FROM concepts c
+            JOIN concept_versions v ON v.concept_id = c.id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY v.concept_id, v.version_number
+            LIMIT ?
+        """
+
+        # One keyset-paginated chunk per query, decoded and yielded after
+        # the connection is back in the pool: memory stays bounded however
+        # large the store is, and a slow client holds no connection.
+        after: Tuple[str, int] = ("", 0)
+        while True:
+            with self._connection() as conn:
+                rows = conn.execute(sql, [*after, *params, _STREAM_CHUNK_SIZE]).fetchall()
+
+            for row in rows:
+                yield _joined_row_to_concept(row), _row_to_version(row)
+
+            if len(rows) < _STREAM_CHUNK_SIZE:
+                break
+
+            after = (rows[-1]["concept_id"], rows[-1]["version_number"])
+
+
+    # -------------------------
+    # Stored validation results
+    # -------------------------
+
+    def save_warnings(self, records: Sequence[VersionWarnings]) -> None:
+        if not records:
+            return
+
+        params = [_warnings_params(record) for record in records]
+
+        with self.unit_of_work() as uow:
+            uow._write(lambda conn: conn.executemany(_UPSERT_WARNINGS, params))
+
+    def get_warnings(
+        self,
+        version_ids: Collection[str]
+    ) -> Dict[str, VersionWarnings]:
+        ids = list(version_ids)
+        if not ids:
+            return {}
+
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT * FROM version_warnings
+                WHERE version_id IN ({_placeholders(len(ids))})
+                """,
+                ids,
+            ).fetchall()
+
+        return {row["version_id"]: _row_to_warnings(row) for row in rows}
+
+    def get_warnings_by_content(
+        self,
+        content_hashes: Collection[str],
+        ruleset_version: str,
+    ) -> Dict[str, List[str]]:
+        hashes = list(content_hashes)
+        if not hashes:
+            return {}
+
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT content_hash, warnings FROM version_warnings
+                WHERE ruleset_version = ?
+                  AND content_hash IN ({_placeholders(len(hashes))})
+                """,
+                [ruleset_version, *hashes],
+            ).fetchall()
+
+        return {row["content_hash"]: json.loads(row["warnings"]) for row in rows}
+
+    def list_stale_versions(
+        self,
+        ruleset_version: str,
+        after: Optional[str] = None,
+        limit: int = 500,
+    ) -> List[ConceptVersion]:
+        with self._connection() as conn:
+            rows = conn.execute(
+                _SELECT_STALE_VERSIONS,
+                (after or "", ruleset_version, limit),
+            ).fetchall()
+
+        return [_row_to_version(row) for row in rows]
+
+
+class _SQLiteUnitOfWork(SQLiteConceptRepository):
+    """
+    Repository view pinned to one connection inside an open transaction.
+
+    Every method runs on that connection; the owning `unit_of_work`
+    block commits (or rolls back) once at the end.
+    """
+
+    def __init__(self, parent: SQLiteConceptRepository, conn) -> None:
+        # Same configuration as the repository it was opened from.
+        vars(self).update(vars(parent))
+        self.writer = None
+        self._conn = conn
 
-        return versions
+    @contextmanager
+    def _connection(self):
+        yield self._conn
 
+    @contextmanager
+    def unit_of_work(self) -> Iterator["_SQLiteUnitOfWork"]:
+        # Already inside a transaction: nested blocks join it.
+        yield self
@@ -0,0 +1,363 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from app.core import config
+from app.persistence.db import ConnectionPool
+
+
+T = TypeVar("T")
+
+WriteOp = Callable[[sqlite3.Connection], T]
+
+# Upper bounds of the batch-size histogram buckets (the last one is open).
+_BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+_STOP = object()
+
+
+class _BlockFailed(Exception):
+    """
+    A `hold` block raised: its operation fails, so its writes roll back.
+    The block's own exception is what its caller sees.
+    """
+
+
+@dataclass(frozen=True)
+class WriterStats:
+    """
+    Point-in-time snapshot of a GroupCommitWriter, for tuning the window.
+
+    - queue_depth / max_queue_depth: operations waiting for the writer
+    - batch_size_histogram: "<=N" -> number of batches of at most N ops
+    - commit_seconds: total time spent running batches, BEGIN to COMMIT
+    """
+    running: bool
+    queue_depth: int
+    max_queue_depth: int
+    submitted: int
+    succeeded: int
+    failed: int
+    batches: int
+    failed_batches: int
+    max_batch_size: int
+    avg_batch_size: float
+    batch_size_histogram: Dict[str, int]
+    commit_seconds: float
+
+
+class GroupCommitWriter:
+    """
+    Single writer thread that group-commits operations from many callers.
+
+    Request threads `submit` write operations (callables taking a
+    connection). The writer collects everything queued within
+    `window_ms` of the first operation, up to `max_batch_size`, and runs
+    the batch in one transaction with one commit. Each operation runs in
+    its own savepoint, so a failing operation is rolled back alone and
+    its caller gets the error while the rest of the batch commits.
+
+    Futures resolve only after the batch has committed.
+
+    `hold` runs a caller's block as one such operation, on the writer's
+    connection: for read-check-write sequences that must not interleave
+    with other writes.
+    """
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        max_batch_size: int = config.DB_GROUP_COMMIT_MAX_BATCH,
+        window_ms: float = config.DB_GROUP_COMMIT_WINDOW_MS,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.pool = pool
+        self.max_batch_size = max_batch_size
+        self.window_seconds = window_ms / 1000.0
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        # The connection handed to this thread by `hold`, while it holds it.
+        self._held = threading.local()
+
+        self._max_queue_depth = 0
+        self._submitted = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._batches = 0
+        self._failed_batches = 0
+        self._batched_ops = 0
+        self._max_batch_size_seen = 0
+        self._histogram = [0] * (len(_BATCH_SIZE_BUCKETS) + 1)
+        self._commit_seconds = 0.0
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            self._thread = threading.Thread(
+                target=self._run,
+                name="group-commit-writer",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Commits everything already queued, then stops the writer thread.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+
+        if thread is None:
+            return
+
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    # -------------------------
+    # Submitting
+    # -------------------------
+
+    def submit(self, op: WriteOp) -> "Future[T]":
+        future: "Future[T]" = Future()
+
+        held = getattr(self._held, "conn", None)
+        if held is not None:
+            # Inside `hold`: waiting for the writer would deadlock, and
+            # the block's transaction is the one to join anyway.
+            try:
+                future.set_result(_run_in_savepoint(held, op, "group_commit_nested"))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        with self._lock:
+            if self._thread is None:
+                raise RuntimeError("Writer is not running")
+
+            self._queue.put((op, future))
+            self._submitted += 1
+            depth = self._queue.qsize()
+            if depth > self._max_queue_depth:
+                self._max_queue_depth = depth
+
+        return future
+
+    def execute(self, op: WriteOp) -> T:
+        """
+        Submits `op` and blocks until its batch has committed.
+        """
+        return self.submit(op).result()
+
+    @contextmanager
+    def hold(self) -> Iterator[sqlite3.Connection]:
+        """
+        Runs the block as one operation of a batch: it gets the writer's
+        connection, inside the batch transaction, and no other write runs
+        until it exits. Reads in the block see every committed write, so
+        a read-check-write sequence cannot interleave with another one.
+
+        An exception rolls the block's writes back (and is re-raised);
+        otherwise the block returns once its batch has committed. Writes
+        submitted from inside the block run in it directly. The writer
+        waits for the block: keep it short.
+        """
+        if getattr(self._held, "conn", None) is not None:
+            yield self._held.conn
+            return
+
+        handed: "Future[sqlite3.Connection]" = Future()
+        released = threading.Event()
+        failed = False
+
+        def op(conn):
+            handed.set_result(conn)
+            released.wait()
+            if failed:
+                raise _BlockFailed()
+
+        future = self.submit(op)
+
+        # The batch may fail (BEGIN) before the operation ever runs.
+        wait([handed, future], return_when=FIRST_COMPLETED)
+        if not handed.done():
+            future.result()
+
+        self._held.conn = handed.result()
+        try:
+            yield self._held.conn
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._held.conn = None
+            released.set()
+
+        future.result()
+
+    # -------------------------
+    # Monitoring
+    # -------------------------
+
+    def stats(self) -> WriterStats:
+        with self._lock:
+            histogram = {
+                f"<={bound}": count
+                for bound, count in zip(_BATCH_SIZE_BUCKETS, self._histogram)
+            }
+            histogram[f">{_BATCH_SIZE_BUCKETS[-1]}"] = self._histogram[-1]
+
+            return WriterStats(
+                running=self._thread is not None,
+                queue_depth=self._queue.qsize(),
+                max_queue_depth=self._max_queue_depth,
+                submitted=self._submitted,
+                succeeded=self._succeeded,
+                failed=self._failed,
+                batches=self._batches,
+                failed_batches=self._failed_batches,
+                max_batch_size=self._max_batch_size_seen,
+                avg_batch_size=(
+                    self._batched_ops / self._batches if self._batches else 0.0
+                ),
+                batch_size_histogram=histogram,
+                commit_seconds=self._commit_seconds,
+            )
+
+    # -------------------------
+    # Writer thread
+    # -------------------------
+
+    def _run(self) -> None:
+        stopping = False
+
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.window_seconds
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    # Anything already queued joins without waiting.
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+
+                if item is _STOP:
+                    stopping = True
+                    break
+
+                batch.append(item)
+
+            self._commit(batch)
+
+    def _commit(self, batch: List[Tuple[WriteOp, Future]]) -> None:
+        started = time.perf_counter()
+        outcomes: List[Tuple[Future, Any, Optional[BaseException]]] = []
+
+        try:
+            with self.pool.connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+
+                for op, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+
+                    try:
+                        result = _run_in_savepoint(conn, op, "group_commit_op")
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+                    else:
+                        outcomes.append((future, result, None))
+
+                conn.execute("COMMIT")
+
+        except Exception as e:
+            # BEGIN or COMMIT failed: nothing in the batch was written.
+            self._record(batch, outcomes, started, batch_error=e)
+
+            for _, future in batch:
+                if not future.done():
+                    if not future.running():
+                        future.set_running_or_notify_cancel()
+                    future.set_exception(e)
+            return
+
+        self._record(batch, outcomes, started)
+
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _record(
+        self,
+        batch: list,
+        outcomes: list,
+        started: float,
+        batch_error: Optional[BaseException] = None,
+    ) -> None:
+        size = len(batch)
+        failed = (
+            size if batch_error is not None
+            else sum(1 for _, _, error in outcomes if error is not None)
+        )
+
+        bucket = len(_BATCH_SIZE_BUCKETS)
+        for i, bound in enumerate(_BATCH_SIZE_BUCKETS):
+            if size <= bound:
+                bucket = i
+                break
+
+        with self._lock:
+            self._batches += 1
+            self._batched_ops += size
+            self._histogram[bucket] += 1
+            self._max_batch_size_seen = max(self._max_batch_size_seen, size)
+            self._failed += failed
+            self._succeeded += size - failed
+            self._commit_seconds += time.perf_counter() - started
+
+            if batch_error is not None:
+                self._failed_batches += 1
+
+
+def _run_in_savepoint(conn: sqlite3.Connection, op: WriteOp, name: str) -> T:
+    """
+    Runs `op`; if it raises, its writes are rolled back alone.
+    """
+    conn.execute(f"SAVEPOINT {name}")
+    try:
+        result = op(conn)
+    except BaseException:
+        conn.execute(f"ROLLBACK TO {name}")
+        conn.execute(f"RELEASE {name}")
+        raise
+
+    conn.execute(f"RELEASE {name}")
+    return result
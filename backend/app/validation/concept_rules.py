@@ -0,0 +1,109 @@
+from app.validation.concept_validation import validate_concept_version
+from app.validation.engine import Rule, RuleEngine, VersionView
+
+
+OBSERVABLE_VERBS = ("identify", "explain", "describe", "calculate", "compare")
+
+
+# --- Length & structure checks ---
+
+def core_definition_empty(v: VersionView) -> bool:
+    return v.core_definition_blank
+
+
+def core_definition_too_long(v: VersionView) -> bool:
+    return len(v.core_definition) > 300
+
+
+def expanded_explanation_empty(v: VersionView) -> bool:
+    return v.expanded_explanation_blank
+
+
+# --- Learning objective checks ---
+
+def learning_objective_missing(v: VersionView) -> bool:
+    return v.learning_objective_blank
+
+
+def learning_objective_not_observable(v: VersionView) -> bool:
+    return not v.learning_objective_lower.startswith(OBSERVABLE_VERBS)
+
+
+# --- Concept clarity checks ---
+
+def core_definition_circular(v: VersionView) -> bool:
+    return v.name_lower in v.core_definition_lower
+
+
+def examples_missing(v: VersionView) -> bool:
+    return not v.examples
+
+
+# --- Dependency checks ---
+
+def prerequisites_missing(v: VersionView) -> bool:
+    return "fraction" in v.core_definition_lower and not v.prerequisites
+
+
+# --- Scope checks ---
+
+def scope_boundaries_missing(v: VersionView) -> bool:
+    return v.scope_boundaries_blank
+
+
+# Registered concept version checks, in the order their warnings appear.
+CONCEPT_RULES = [
+    Rule(
+        id="core_definition.empty",
+        message="Core definition is empty",
+        check=core_definition_empty,
+    ),
+    Rule(
+        id="core_definition.too_long",
+        message="Core definition may be too long",
+        check=core_definition_too_long,
+    ),
+    Rule(
+        id="expanded_explanation.empty",
+        message="Expanded explanation is empty",
+        check=expanded_explanation_empty,
+    ),
+    Rule(
+        id="learning_objective.missing",
+        message="Learning objective is missing",
+        check=learning_objective_missing,
+    ),
+    Rule(
+        id="learning_objective.observable_verb",
+        message=(
+            "Learning objective should start with an observable verb "
+            "(e.g., identify, explain, calculate)"
+        ),
+        check=learning_objective_not_observable,
+    ),
+    Rule(
+        id="core_definition.circular",
+        message="Core definition may be circular (concept name appears in definition)",
+        check=core_definition_circular,
+    ),
+    Rule(
+        id="examples.missing",
+        message="No examples provided",
+        check=examples_missing,
+    ),
+    Rule(
+        id="prerequisites.missing",
+        message="Concept references other ideas but has no prerequisites listed",
+        check=prerequisites_missing,
+    ),
+    Rule(
+        id="scope_boundaries.missing",
+        message="Scope boundaries are not defined",
+        check=scope_boundaries_missing,
+    ),
+]
+
+
+# validate_concept_version is these rules written out inline: same
+# warnings, without a Python call per rule on every write.
+concept_rule_engine = RuleEngine(CONCEPT_RULES, inline=validate_concept_version)
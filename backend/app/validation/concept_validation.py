@@ -8,6 +8,10 @@ def validate_concept_version(version: ConceptVersion) -> List[str]:
 
     Returns a list of human-readable warning messages.
     Does NOT raise exceptions.
+
+    The same checks as CONCEPT_RULES (concept_rules.py), written out in
+    one pass; the rule engine runs this on every write. Change both
+    together.
     """
     warnings: List[str] = []
 
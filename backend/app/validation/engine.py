@@ -0,0 +1,208 @@
+import hashlib
+import inspect
+import json
+import time
+from collections import namedtuple
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from app.domain.concept.models import ConceptVersion
+
+
+# Fields a rule can look at, read straight off the ConceptVersion.
+_RAW_FIELDS = (
+    "name",
+    "core_definition",
+    "expanded_explanation",
+    "learning_objective",
+    "examples",
+    "misconceptions",
+    "scope_boundaries",
+    "prerequisites",
+)
+
+
+class VersionView:
+    """
+    What rules see of a version: the raw fields above plus lower-cased
+    and blank-checked forms, each computed once per version however many
+    rules use it.
+    """
+    __slots__ = _RAW_FIELDS + (
+        "name_lower",
+        "core_definition_lower",
+        "learning_objective_lower",
+        "core_definition_blank",
+        "expanded_explanation_blank",
+        "learning_objective_blank",
+        "scope_boundaries_blank",
+    )
+
+    def __init__(self, version: ConceptVersion) -> None:
+        self.name = version.name
+        self.core_definition = version.core_definition
+        self.expanded_explanation = version.expanded_explanation
+        self.learning_objective = version.learning_objective
+        self.examples = version.examples
+        self.misconceptions = version.misconceptions
+        self.scope_boundaries = version.scope_boundaries
+        self.prerequisites = version.prerequisites
+
+        self.name_lower = self.name.lower()
+        self.core_definition_lower = self.core_definition.lower()
+        self.learning_objective_lower = self.learning_objective.lower()
+        self.core_definition_blank = not self.core_definition.strip()
+        self.expanded_explanation_blank = not self.expanded_explanation.strip()
+        self.learning_objective_blank = not self.learning_objective.strip()
+        self.scope_boundaries_blank = (
+            self.scope_boundaries is None or not self.scope_boundaries.strip()
+        )
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    One validation check: the warning `message` is emitted when
+    `check(view)` is true for a version's VersionView.
+
+    Checks run in worker processes too, so they must be picklable
+    (module-level functions, not lambdas).
+    """
+    id: str
+    message: str
+    check: Callable[[VersionView], bool]
+
+
+def _fingerprint(check: Callable) -> str:
+    """
+    Source of a check, plus the values of any module constants it uses,
+    so that editing either marks stored results stale.
+    """
+    try:
+        source = inspect.getsource(check)
+    except (OSError, TypeError):
+        source = check.__code__.co_code.hex()
+
+    constants = []
+    for name in sorted(set(check.__code__.co_names)):
+        value = check.__globals__.get(name)
+        if isinstance(value, (frozenset, set)):
+            constants.append(f"{name}={sorted(map(repr, value))!r}")
+        elif isinstance(value, (str, int, float, bool, tuple)):
+            constants.append(f"{name}={value!r}")
+
+    return "\n".join([source] + constants)
+
+
+# Just the fields rules can see: cheap to pickle when validation runs
+# in worker processes, and accepted anywhere a ConceptVersion is.
+VersionContent = namedtuple("VersionContent", _RAW_FIELDS)
+
+
+def version_content(version: ConceptVersion) -> VersionContent:
+    return VersionContent(*(getattr(version, field) for field in _RAW_FIELDS))
+
+
+def content_hash(version: ConceptVersion) -> str:
+    """
+    Hash of everything a rule can look at. Versions with equal hashes
+    get equal warnings from the same rule set.
+    """
+    content = [getattr(version, field) for field in _RAW_FIELDS]
+    raw = json.dumps(content, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class RuleTiming:
+    rule_id: str
+    seconds: float
+    fired: bool
+
+
+@dataclass(frozen=True)
+class ValidationProfile:
+    """
+    Warnings for one version plus where the time went: reading and
+    normalizing its fields, then each rule in order.
+    """
+    warnings: List[str]
+    normalize_seconds: float
+    rules: Tuple[RuleTiming, ...]
+
+
+class RuleEngine:
+    """
+    Runs a fixed list of rules over concept versions.
+
+    Each version is normalized into a VersionView once (fields read,
+    lower-cased, blank-checked), then every rule's check runs over that
+    view; `profile` also times the normalization and every rule.
+
+    `inline`, if given, is a hand-written function returning the same
+    warnings as the rules in one straight pass, without a call per rule;
+    `validate` uses it instead. The rules still drive `profile`, and both
+    are part of `version`.
+
+    Warnings come out in rule order.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Rule],
+        inline: Optional[Callable[[ConceptVersion], List[str]]] = None,
+    ) -> None:
+        self.rules: Tuple[Rule, ...] = tuple(rules)
+        self.inline = inline
+
+        seen_ids = set()
+        for rule in self.rules:
+            if rule.id in seen_ids:
+                raise ValueError(f"Duplicate rule id: {rule.id}")
+            seen_ids.add(rule.id)
+
+        self._checks = tuple((rule.check, rule.message) for rule in self.rules)
+
+        # Changes whenever any rule does: stored results computed under a
+        # different version are stale.
+        fingerprint = json.dumps(
+            [
+                [rule.id, rule.message, _fingerprint(rule.check)]
+                for rule in self.rules
+            ] + [
+                _fingerprint(VersionView.__init__),
+                _fingerprint(inline) if inline is not None else None,
+            ],
+            separators=(",", ":"),
+        )
+        self.version = hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
+
+    def validate(self, version: ConceptVersion) -> List[str]:
+        if self.inline is not None:
+            return self.inline(version)
+
+        view = VersionView(version)
+        return [message for check, message in self._checks if check(view)]
+
+    def profile(self, version: ConceptVersion) -> ValidationProfile:
+        """
+        Same warnings as `validate`, with per-rule timings. Slower: use it
+        for sampling and diagnostics, not on every call.
+        """
+        clock = time.perf_counter
+
+        start = clock()
+        view = VersionView(version)
+        normalize_seconds = clock() - start
+
+        warnings = []
+        timings = []
+        for rule in self.rules:
+            start = clock()
+            fired = bool(rule.check(view))
+            seconds = clock() - start
+            if fired:
+                warnings.append(rule.message)
+            timings.append(RuleTiming(rule.id, seconds, fired))
+
+        return ValidationProfile(warnings, normalize_seconds, tuple(timings))
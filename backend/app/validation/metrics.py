@@ -0,0 +1,130 @@
+import random
+import threading
+from dataclasses import dataclass
+from typing import Dict, List
+
+from app.core import config
+from app.validation.engine import ValidationProfile
+
+
+# Upper bounds (microseconds) of the duration histogram buckets; the last
+# one is open.
+_DURATION_BUCKETS_US = (1, 2, 5, 10, 20, 50, 100, 1000)
+
+NORMALIZE = "(normalize)"
+
+
+@dataclass(frozen=True)
+class RuleStats:
+    """
+    Aggregated timings of one rule over every profiled validation.
+
+    - evaluations / fired: how often the rule ran / produced its warning
+    - duration_histogram: "<=Nus" -> evaluations taking at most N µs
+    """
+    rule_id: str
+    evaluations: int
+    fired: int
+    total_seconds: float
+    max_seconds: float
+    avg_microseconds: float
+    duration_histogram: Dict[str, int]
+
+
+class _Counters:
+    __slots__ = ("evaluations", "fired", "total_seconds", "max_seconds", "histogram")
+
+    def __init__(self) -> None:
+        self.evaluations = 0
+        self.fired = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.histogram = [0] * (len(_DURATION_BUCKETS_US) + 1)
+
+    def add(self, seconds: float, fired: bool) -> None:
+        self.evaluations += 1
+        self.fired += fired
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+        microseconds = seconds * 1_000_000
+        bucket = len(_DURATION_BUCKETS_US)
+        for i, bound in enumerate(_DURATION_BUCKETS_US):
+            if microseconds <= bound:
+                bucket = i
+                break
+        self.histogram[bucket] += 1
+
+
+class RuleMetrics:
+    """
+    Thread-safe aggregation of ValidationProfiles, per rule.
+
+    Profiling every validation would slow every write, so callers record
+    a sample (`should_sample`) plus whatever was profiled on request.
+    Field normalization is reported as its own pseudo-rule, NORMALIZE.
+    """
+
+    def __init__(self, sample_rate: float = config.VALIDATION_PROFILE_SAMPLE_RATE) -> None:
+        self.sample_rate = sample_rate
+        self._counters: Dict[str, _Counters] = {}
+        self._profiled = 0
+        self._lock = threading.Lock()
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def record(self, profile: ValidationProfile) -> None:
+        with self._lock:
+            self._profiled += 1
+            self._counter(NORMALIZE).add(profile.normalize_seconds, False)
+            for timing in profile.rules:
+                self._counter(timing.rule_id).add(timing.seconds, timing.fired)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters = {}
+            self._profiled = 0
+
+    @property
+    def profiled(self) -> int:
+        return self._profiled
+
+    def stats(self) -> List[RuleStats]:
+        """
+        Per-rule stats, most total time first.
+        """
+        with self._lock:
+            stats = [
+                RuleStats(
+                    rule_id=rule_id,
+                    evaluations=c.evaluations,
+                    fired=c.fired,
+                    total_seconds=c.total_seconds,
+                    max_seconds=c.max_seconds,
+                    avg_microseconds=(
+                        c.total_seconds / c.evaluations * 1_000_000
+                        if c.evaluations else 0.0
+                    ),
+                    duration_histogram=self._histogram(c),
+                )
+                for rule_id, c in self._counters.items()
+            ]
+
+        stats.sort(key=lambda s: s.total_seconds, reverse=True)
+        return stats
+
+    def _counter(self, rule_id: str) -> _Counters:
+        counter = self._counters.get(rule_id)
+        if counter is None:
+            counter = self._counters[rule_id] = _Counters()
+        return counter
+
+    @staticmethod
+    def _histogram(counters: _Counters) -> Dict[str, int]:
+        histogram = {
+            f"<={bound}us": count
+            for bound, count in zip(_DURATION_BUCKETS_US, counters.histogram)
+        }
+        histogram[f">{_DURATION_BUCKETS_US[-1]}us"] = counters.histogram[-1]
+        return histogram
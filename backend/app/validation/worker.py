@@ -0,0 +1,42 @@
+"""
+Entry points for validation in worker processes (ProcessPoolExecutor).
+
+Each worker receives the parent's RuleEngine once (pickled, with its
+rules and inline function), then validates chunks of VersionContent
+tuples.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+from app.validation.engine import RuleEngine, VersionContent, content_hash
+
+
+_engine: Optional[RuleEngine] = None
+
+
+def init_worker(engine: RuleEngine) -> None:
+    global _engine
+    _engine = engine
+
+
+def validate_chunk(contents: Sequence[tuple]) -> List[Tuple[str, List[str]]]:
+    return validate_contents(_engine, contents)
+
+
+def validate_contents(
+    engine: RuleEngine,
+    contents: Sequence[tuple],
+) -> List[Tuple[str, List[str]]]:
+    """
+    (content hash, warnings) for each content tuple, in order. Identical
+    contents are validated once.
+    """
+    versions = [VersionContent(*content) for content in contents]
+    hashes = [content_hash(version) for version in versions]
+
+    distinct = {}
+    for version, digest in zip(versions, hashes):
+        distinct.setdefault(digest, version)
+
+    results = {digest: engine.validate(version) for digest, version in distinct.items()}
+
+    return [(digest, results[digest]) for digest in hashes]
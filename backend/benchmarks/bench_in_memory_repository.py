@@ -0,0 +1,101 @@
+"""
+Micro-benchmark of InMemoryConceptRepository's hot operations.
+
+Usage (from backend/):
+    python -m benchmarks.bench_in_memory_repository [--concepts N] [--versions N]
+
+Prints the mean time per call of each operation, in microseconds.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app.domain.concept.models import Concept, ConceptVersion
+from app.persistence.repositories.in_memory.in_memory_concept_repository import (
+    InMemoryConceptRepository,
+)
+
+
+def _version(concept_id: str, number: int) -> ConceptVersion:
+    return ConceptVersion(
+        id=f"{concept_id}-v{number}",
+        concept_id=concept_id,
+        version_number=number,
+        name=f"Concept {concept_id}",
+        core_definition="The top number in a fraction, which tells how many parts are taken.",
+        expanded_explanation="It tells how many equal parts of the whole are being counted. " * 4,
+        learning_objective="Identify the numerator in a fraction",
+        examples=["In 3/4, the numerator is 3", "In 5/8, the numerator is 5"],
+        misconceptions=["The numerator is always smaller than the denominator"],
+        scope_boundaries="Proper and improper fractions only",
+        prerequisites=["Fraction", "Whole number"],
+        created_by="bench",
+        created_at=datetime(2024, 1, 1),
+        change_note=f"Revision {number}",
+    )
+
+
+def _concept(concept_id: str, versions: int, index: int) -> Concept:
+    updated = datetime(2024, 1, 1) + timedelta(seconds=index)
+    return Concept(
+        id=concept_id,
+        current_version=versions,
+        status="DRAFT",
+        created_at=datetime(2024, 1, 1),
+        updated_at=updated,
+    )
+
+
+def _timed(label: str, calls: int, op) -> None:
+    start = time.perf_counter()
+    for i in range(calls):
+        op(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / calls * 1e6:10.2f} us/call  ({calls} calls)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concepts", type=int, default=2000)
+    parser.add_argument("--versions", type=int, default=10)
+    args = parser.parse_args()
+
+    repo = InMemoryConceptRepository()
+    ids = [f"c{i}" for i in range(args.concepts)]
+    versions = {
+        concept_id: [_version(concept_id, n) for n in range(1, args.versions + 1)]
+        for concept_id in ids
+    }
+
+    def save(i: int) -> None:
+        concept_id = ids[i // args.versions]
+        number = i % args.versions + 1
+        if number == 1:
+            repo.save_concept(_concept(concept_id, args.versions, i))
+        repo.save_version(versions[concept_id][number - 1])
+
+    n = len(ids)
+    _timed("save_version", n * args.versions, save)
+    _timed("get_concept", n * 5, lambda i: repo.get_concept(ids[i % n]))
+    _timed("get_latest_version", n * 5, lambda i: repo.get_latest_version(ids[i % n]))
+    _timed("get_version", n * 5, lambda i: repo.get_version(ids[i % n], 1))
+    _timed(f"list_versions ({args.versions})", n, lambda i: repo.list_versions(ids[i]))
+    _timed("list_concepts (50)", 200, lambda i: repo.list_concepts(limit=50))
+    _timed("iter_export (latest)", 5, lambda i: sum(1 for _ in repo.iter_export(latest_only=True)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "concepts.snapshot")
+        _timed("snapshot", 1, lambda i: repo.snapshot(path))
+        print(f"{'snapshot size':<28} {os.path.getsize(path) / 1e6:10.1f} MB")
+
+        restored = []
+        _timed("from_snapshot", 1, lambda i: restored.append(
+            InMemoryConceptRepository.from_snapshot(path)
+        ))
+        _timed("first search (index build)", 1, lambda i: restored[0].search("numerator"))
+
+
+if __name__ == "__main__":
+    main()
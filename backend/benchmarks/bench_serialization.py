@@ -0,0 +1,77 @@
+"""
+Micro-benchmark of response encoding: FastAPI's default path
+(jsonable_encoder + JSONResponse) against app.api.serialization.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization [--versions N] [--calls N]
+
+Prints the mean time per response body, in microseconds.
+"""
+import argparse
+import copy
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.serialization import json_response
+from benchmarks.bench_in_memory_repository import _concept, _version
+
+
+def _default(body) -> bytes:
+    return JSONResponse(jsonable_encoder(body)).body
+
+
+def _fast(body) -> bytes:
+    return json_response(body).body
+
+
+def _timed(label: str, calls: int, encode, bodies) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        encode(bodies[i % len(bodies)])
+    per_call = (time.perf_counter() - start) / calls * 1e6
+    print(f"{label:<44} {per_call:10.1f} us/body")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--versions", type=int, default=100)
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    versions = [_version("c0", n) for n in range(1, args.versions + 1)]
+    concept = _concept("c0", args.versions, 0)
+
+    def history(items):
+        return {"versions": items, "next_cursor": None, "warnings": []}
+
+    def single(version):
+        return {"concept": concept, "version": version, "warnings": []}
+
+    cases = [
+        (
+            f"GET /concepts/{{id}} (x{args.versions} concepts)",
+            [single(version) for version in versions],
+            # A fresh (equal) version per request, as read from SQLite.
+            [single(copy.copy(version)) for version in versions],
+        ),
+        (
+            f"GET /concepts/{{id}}/versions ({args.versions} versions)",
+            [history(versions)],
+            [history([copy.copy(version) for version in versions])],
+        ),
+    ]
+
+    for label, bodies, fresh in cases:
+        assert _fast(bodies[0]) == _default(bodies[0])
+        print(label)
+        before = _timed("  jsonable_encoder + JSONResponse", args.calls, _default, bodies)
+        after = _timed("  json_response, same objects (cached repo)", args.calls, _fast, bodies)
+        _timed("  json_response, equal objects (SQLite)", args.calls, _fast, fresh)
+        print(f"  speed-up (cached repo): {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
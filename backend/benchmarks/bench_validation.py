@@ -0,0 +1,46 @@
+"""
+Micro-benchmark of concept validation: the engine's write path (the
+inline `validate_concept_version`) against the same rules run one check
+call per rule over a VersionView, as `profile` and engines without an
+inline function do.
+
+Usage (from backend/):
+    python -m benchmarks.bench_validation [--versions N] [--rounds N]
+
+Prints the best time over the rounds for the whole batch, in milliseconds.
+"""
+import argparse
+import time
+
+from app.validation.concept_rules import CONCEPT_RULES, concept_rule_engine
+from app.validation.engine import RuleEngine
+from benchmarks.bench_in_memory_repository import _version
+
+
+def _best(label: str, rounds: int, run) -> None:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best * 1e3:10.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--versions", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    versions = [_version(f"c{i}", 1) for i in range(args.versions)]
+    inline = concept_rule_engine
+    per_rule = RuleEngine(CONCEPT_RULES)
+
+    assert [inline.validate(v) for v in versions] == [per_rule.validate(v) for v in versions]
+
+    _best("inline (write path)", args.rounds, lambda: [inline.validate(v) for v in versions])
+    _best("one call per rule", args.rounds, lambda: [per_rule.validate(v) for v in versions])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import sys
+
+from app.api.serialization import concept_to_dict, ndjson_line, version_to_dict
+from app.core import config
+from app.persistence.db import ConnectionPool
+from app.persistence.repositories.sqlite.sqlite_concept_repository import (
+    SQLiteConceptRepository,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export the concept store as NDJSON.",
+    )
+    parser.add_argument("--db", default=config.DB_PATH, help="SQLite database path")
+    parser.add_argument("--status", help="Only concepts with this status")
+    parser.add_argument(
+        "--latest-only",
+        action="store_true",
+        help="Only each concept's current version",
+    )
+    parser.add_argument("--output", "-o", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    pool = ConnectionPool(args.db, size=1)
+    repo = SQLiteConceptRepository(pool=pool)
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    count = 0
+
+    try:
+        for concept, version in repo.iter_export(
+            status=args.status,
+            latest_only=args.latest_only,
+        ):
+            out.write(ndjson_line({
+                "concept": concept_to_dict(concept),
+                "version": version_to_dict(version),
+            }))
+            count += 1
+    finally:
+        if args.output:
+            out.close()
+        pool.close()
+
+    print(f"Exported {count} records.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+-- Keyset pagination for GET /concepts: newest first, (updated_at, id)
+-- as the cursor, optionally narrowed to one status.
+CREATE INDEX idx_concepts_updated_at
+    ON concepts (updated_at DESC, id DESC);
+
+CREATE INDEX idx_concepts_status_updated_at
+    ON concepts (status, updated_at DESC, id DESC);
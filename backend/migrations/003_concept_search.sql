@@ -0,0 +1,23 @@
+-- Full-text search over concept content (GET /concepts/search).
+-- rowid is the rowid of the indexed concept_versions row. By default
+-- only each concept's current version is kept in the index.
+CREATE VIRTUAL TABLE concept_search USING fts5(
+    concept_id UNINDEXED,
+    version_number UNINDEXED,
+    name,
+    core_definition,
+    expanded_explanation,
+    tokenize = 'porter unicode61'
+);
+
+INSERT INTO concept_search (
+    rowid, concept_id, version_number,
+    name, core_definition, expanded_explanation
+)
+SELECT
+    v.rowid, v.concept_id, v.version_number,
+    v.name, v.core_definition, v.expanded_explanation
+FROM concepts c
+JOIN concept_versions v
+    ON v.concept_id = c.id
+    AND v.version_number = c.current_version;
@@ -0,0 +1,15 @@
+-- Validation warnings of each (immutable) version, computed at write
+-- time and recomputed only when the rule set changes.
+CREATE TABLE version_warnings (
+    version_id TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    ruleset_version TEXT NOT NULL,
+    warnings TEXT NOT NULL,
+    validated_at TEXT NOT NULL,
+
+    FOREIGN KEY (version_id) REFERENCES concept_versions(id)
+);
+
+-- Reuse of results across versions with identical content.
+CREATE INDEX idx_version_warnings_content
+    ON version_warnings (content_hash, ruleset_version);
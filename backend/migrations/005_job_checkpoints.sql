@@ -0,0 +1,8 @@
+-- Resume points of long-running background jobs (one row per job).
+CREATE TABLE job_checkpoints (
+    job TEXT PRIMARY KEY,
+    run_key TEXT NOT NULL,
+    position TEXT,
+    processed INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
@@ -0,0 +1,25 @@
+-- MinHash near-duplicate index over each concept's current core
+-- definition (app/persistence/minhash.py). Rows are written by the
+-- application, which computes the signatures; concepts saved before
+-- this migration are indexed by the repository's
+-- backfill_similarity_index() at startup.
+CREATE TABLE concept_signatures (
+    concept_id TEXT PRIMARY KEY,
+    version_number INTEGER NOT NULL,
+    -- NUM_PERMUTATIONS uint32 values; empty for an empty definition.
+    signature BLOB NOT NULL,
+
+    FOREIGN KEY (concept_id) REFERENCES concepts(id)
+);
+
+-- LSH buckets: concepts sharing any (band, bucket) are candidates.
+CREATE TABLE concept_signature_bands (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    concept_id TEXT NOT NULL,
+
+    PRIMARY KEY (band, bucket, concept_id)
+) WITHOUT ROWID;
+
+CREATE INDEX idx_concept_signature_bands_concept
+    ON concept_signature_bands (concept_id);
@@ -0,0 +1,19 @@
+-- Prerequisite graph edges: the prerequisite names listed by each
+-- concept's current version, one row per name, in listed order.
+-- Names are resolved to concepts by the application.
+CREATE TABLE concept_prerequisites (
+    concept_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    prerequisite TEXT NOT NULL,
+
+    PRIMARY KEY (concept_id, position),
+    FOREIGN KEY (concept_id) REFERENCES concepts(id)
+) WITHOUT ROWID;
+
+INSERT INTO concept_prerequisites (concept_id, position, prerequisite)
+SELECT c.id, p.key, p.value
+FROM concepts c
+JOIN concept_versions v
+    ON v.concept_id = c.id
+    AND v.version_number = c.current_version,
+    json_each(v.prerequisites) AS p;
@@ -0,0 +1,8 @@
+-- Which process is running a background job (one row per job), so the
+-- same job never runs in two processes at once. A lease that is not
+-- renewed by `expires_at` may be taken over.
+CREATE TABLE job_leases (
+    job TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at TEXT NOT NULL
+);
@@ -0,0 +1,83 @@
+import argparse
+import sys
+
+from app.application.concept_app_service import ConceptApplicationService
+from app.application.revalidation import RevalidationJob
+from app.core import config
+from app.domain.concept.service import ConceptService
+from app.persistence.checkpoints import SQLiteCheckpointStore
+from app.persistence.db import ConnectionPool
+from app.persistence.migrations import apply_migrations
+from app.persistence.repositories.sqlite.sqlite_concept_repository import (
+    SQLiteConceptRepository,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Recompute stored validation warnings that are stale for the "
+            "current rules, across a pool of worker processes."
+        ),
+    )
+    parser.add_argument("--db", default=config.DB_PATH, help="SQLite database path")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=config.VALIDATION_REVALIDATE_WORKERS,
+        help="Worker processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=config.VALIDATION_REVALIDATE_BATCH_SIZE,
+        help="Versions per chunk and per transaction",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the saved checkpoint and start from the beginning",
+    )
+    args = parser.parse_args()
+
+    apply_migrations(args.db)
+
+    pool = ConnectionPool(args.db, size=2)
+    repo = SQLiteConceptRepository(pool=pool)
+    app_service = ConceptApplicationService(ConceptService(), repo)
+
+    job = RevalidationJob(
+        app_service,
+        SQLiteCheckpointStore(pool),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+
+    def report(progress):
+        print(
+            f"  {progress.processed} versions "
+            f"({progress.versions_per_second:.0f}/s, {progress.elapsed_seconds:.1f}s)",
+            file=sys.stderr,
+        )
+
+    try:
+        progress = job.run(restart=args.restart, on_progress=report)
+    except KeyboardInterrupt:
+        print("Interrupted; rerun to resume from the last checkpoint.", file=sys.stderr)
+        sys.exit(130)
+    finally:
+        pool.close()
+
+    if progress.resumed_from:
+        print(f"Resumed after {progress.resumed_from} versions.", file=sys.stderr)
+
+    print(
+        f"Revalidated {progress.processed} versions "
+        f"with {progress.workers} workers "
+        f"(rule set {progress.ruleset_version}).",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,14 @@
-import sqlite3
-from pathlib import Path
+from app.core import config
+from app.persistence.migrations import apply_migrations
 
-DB_PATH = Path("data/app.db")
-MIGRATION_PATH = Path("migrations/001_init.sql")
 
 def main():
     print("Running migrations...")
 
-    sql = MIGRATION_PATH.read_text()
+    applied = apply_migrations(config.DB_PATH)
 
-    conn = sqlite3.connect(DB_PATH)
-    try:
-        conn.executescript(sql)
-        conn.commit()
-    finally:
-        conn.close()
+    for name in applied:
+        print(f"  applied {name}")
 
     print("Migrations applied successfully.")
 
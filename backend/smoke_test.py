@@ -1,11 +1,13 @@
-from app.container import get_concept_app_service
+from app.container import Container
 
 
 def main():
     print("\n--- SYSTEM SMOKE TEST ---\n")
 
     # Build the application service the same way the API will
-    concept_app_service = get_concept_app_service()
+    container = Container()
+    container.startup()
+    concept_app_service = container.resolve("concept_app_service")
 
     data = {
         "name": "Gravity",
@@ -75,6 +77,8 @@ def main():
 
     print("✅ Version count:", len(versions))
 
+    container.shutdown()
+
     print("\n--- SYSTEM BOOT SUCCESSFUL ---\n")
 
 
@@ -0,0 +1,31 @@
+import argparse
+import sys
+import time
+
+from app.core import config
+from app.persistence.repositories.in_memory.in_memory_concept_repository import (
+    InMemoryConceptRepository,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Write a snapshot of the concept store for in-memory preview "
+            "instances (VALIDATOR_REPOSITORY=memory VALIDATOR_MEMORY_SEED=<file>)."
+        ),
+    )
+    parser.add_argument("--db", default=config.DB_PATH, help="SQLite database path")
+    parser.add_argument("--output", "-o", required=True, help="Snapshot file to write")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    repo = InMemoryConceptRepository.from_sqlite(args.db)
+    count = repo.snapshot(args.output)
+    elapsed = time.perf_counter() - start
+
+    print(f"Wrote {count} versions to {args.output} in {elapsed:.1f}s.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.testclient import TestClient
+
+from app.api.http_caching import (
+    REVALIDATE,
+    EncodedETagMiddleware,
+    concept_etag,
+    etag_matches,
+    if_match_satisfied,
+    not_modified,
+    set_validators,
+    version_etag,
+)
+from app.api.serialization import json_response
+from tests.factories import make_concept
+
+
+def test_concept_etag_changes_with_every_write_and_rule_change():
+    concept = make_concept()
+    before = concept_etag(concept, "r1")
+
+    assert concept_etag(concept, "r2") != before
+
+    concept.status = "REVIEW"
+    assert concept_etag(concept, "r1") != before
+
+
+def test_version_etag_changes_only_with_the_rules():
+    assert version_etag("c1", 2, "r1") == version_etag("c1", 2, "r1")
+    assert version_etag("c1", 2, "r1") != version_etag("c1", 3, "r1")
+    assert version_etag("c1", 2, "r1") != version_etag("c1", 2, "r2")
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = version_etag("c1", 1, "r1")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_if_match_uses_strong_comparison():
+    etag = version_etag("c1", 1, "r1")
+
+    assert if_match_satisfied(None, etag)
+    assert if_match_satisfied(f'"other", {etag}', etag)
+    assert if_match_satisfied("*", etag)
+    assert not if_match_satisfied(f"W/{etag}", etag)
+    assert not if_match_satisfied('"other"', etag)
+    assert if_match_satisfied(etag[:-1] + '-gzip"', etag)
+
+
+def test_gzip_responses_get_their_own_etag():
+    app = FastAPI()
+    app.add_middleware(GZipMiddleware, minimum_size=100)
+    app.add_middleware(EncodedETagMiddleware)
+    etag = version_etag("c1", 1, "r1")
+
+    @app.get("/{size}")
+    def get(size: int, request: Request):
+        unchanged = not_modified(request, etag, REVALIDATE)
+        if unchanged is not None:
+            return unchanged
+        response = json_response({"text": "x" * size})
+        set_validators(response, etag, REVALIDATE)
+        return response
+
+    client = TestClient(app)
+
+    identity = client.get("/1000", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/1000", headers={"Accept-Encoding": "gzip"})
+    small = client.get("/10", headers={"Accept-Encoding": "gzip"})
+
+    assert identity.headers["etag"] == small.headers["etag"] == etag
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == etag[:-1] + '-gzip"'
+    for response in (identity, gzipped, small):
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    revalidated = client.get(
+        "/1000",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == gzipped.headers["etag"]
+    assert revalidated.headers["vary"] == "Accept-Encoding"
@@ -0,0 +1,55 @@
+import json
+from dataclasses import replace
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.serialization import json_bytes
+from app.domain.concept.models import SearchHit, SimilarConcept, VersionSummary
+from tests.factories import make_concept, make_version
+
+
+def _jsonable(body) -> bytes:
+    # What JSONResponse sends for the same body.
+    return json.dumps(
+        jsonable_encoder(body),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def test_json_bytes_matches_the_generic_encoder():
+    version = make_version(name='Zähler "top"\n', scope_boundaries=None, change_note=None)
+    summary = VersionSummary(
+        id=version.id,
+        concept_id=version.concept_id,
+        version_number=version.version_number,
+        name=version.name,
+        created_by=version.created_by,
+        created_at=version.created_at,
+        change_note="Initial version",
+    )
+    body = {
+        "concept": make_concept(),
+        "version": version,
+        "versions": [summary],
+        "warnings": ["Too short"],
+        "similar_concepts": (SimilarConcept("c2", 3, "Top number", 0.875),),
+        "prerequisite_cycle": ("Fraction", "Numerator", "Fraction"),
+        "hits": [SearchHit("c1", 1, "Numerator", 2.5, "the <mark>top</mark> number")],
+        "next_cursor": None,
+        "validation_profile": {"normalize_seconds": 0.5, "rules": [{"fired": True}]},
+    }
+
+    assert json_bytes(body) == _jsonable(body)
+
+
+def test_cached_version_json_is_only_reused_for_the_same_version():
+    version = make_version()
+    json_bytes(version)
+
+    # Same id, different content: must not get the first one's JSON.
+    edited = replace(version, name="Denominator")
+
+    assert json.loads(json_bytes(edited))["name"] == "Denominator"
+    assert json.loads(json_bytes(version))["name"] == version.name
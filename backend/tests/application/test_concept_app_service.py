@@ -0,0 +1,525 @@
+import threading
+import time
+from copy import copy
+
+import pytest
+
+from app.application.concept_app_service import ConceptApplicationService
+from app.application.prerequisite_index import PrerequisiteIndex
+from app.application.revalidation import RevalidationJob
+from app.domain.common.errors import StatusConflict, VersionConflict
+from app.domain.concept.service import ConceptService
+from app.persistence.checkpoints import InMemoryCheckpointStore
+from app.validation.concept_rules import CONCEPT_RULES
+from app.validation.engine import Rule, RuleEngine
+from app.persistence.db import ConnectionPool
+from app.persistence.writer import GroupCommitWriter
+from app.persistence.repositories.in_memory.in_memory_concept_repository import (
+    InMemoryConceptRepository,
+)
+from app.persistence.repositories.sqlite.sqlite_concept_repository import (
+    SQLiteConceptRepository,
+)
+
+
+def always(v):
+    return True
+
+
+@pytest.fixture(params=["in_memory", "sqlite"])
+def repo(request):
+    if request.param == "in_memory":
+        yield InMemoryConceptRepository()
+        return
+
+    pool = ConnectionPool(request.getfixturevalue("db_path"), size=2)
+    yield SQLiteConceptRepository(pool=pool)
+    pool.close()
+
+
+@pytest.fixture
+def app_service(repo):
+    return ConceptApplicationService(ConceptService(), repo)
+
+
+@pytest.fixture
+def base_data():
+    return {
+        "name": "Numerator",
+        "core_definition": "The top number in a fraction.",
+        "expanded_explanation": "It tells how many parts are taken.",
+        "learning_objective": "Identify the numerator in a fraction",
+        "examples": ["In 3/4, the numerator is 3"],
+        "misconceptions": [],
+        "prerequisites": ["Fraction"],
+    }
+
+
+def test_create_then_update_moves_pointer(app_service, base_data):
+    concept, _ = app_service.create_concept(base_data, "tester").value
+
+    app_service.update_concept(
+        concept.id, {"name": "Top number"}, "tester", "Renamed"
+    )
+
+    concept, latest = app_service.get_concept(concept.id).value
+    assert concept.current_version == 2
+    assert latest.version_number == 2
+    assert latest.name == "Top number"
+
+
+def test_version_summaries_list_history_without_content(app_service, base_data):
+    concept, _ = app_service.create_concept(base_data, "tester").value
+    app_service.update_concept(concept.id, {"name": "Top number"}, "editor", "Renamed")
+
+    summaries = app_service.list_version_summaries(concept.id).value
+    versions = app_service.list_versions(concept.id).value
+
+    assert [(s.version_number, s.name, s.created_by, s.change_note) for s in summaries] == [
+        (1, "Numerator", "tester", versions[0].change_note),
+        (2, "Top number", "editor", "Renamed"),
+    ]
+    assert [s.created_at for s in summaries] == [v.created_at for v in versions]
+    assert not hasattr(summaries[0], "core_definition")
+
+    with pytest.raises(ValueError):
+        app_service.list_version_summaries("missing")
+
+def test_version_history_pages_and_streams_in_either_order(app_service, base_data):
+    concept, _ = app_service.create_concept(base_data, "tester").value
+    for n in range(2, 6):
+        app_service.update_concept(concept.id, {"name": f"Numerator {n}"}, "tester", "Edit")
+
+    def numbers(versions):
+        return [v.version_number for v in versions]
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = app_service.list_versions_page(concept.id, cursor=cursor, limit=2).value
+        pages.append(numbers(page))
+        if cursor is None:
+            break
+    assert pages == [[1, 2], [3, 4], [5]]
+
+    page, cursor = app_service.list_versions_page(
+        concept.id, limit=3, descending=True, summary=True
+    ).value
+    assert numbers(page) == [5, 4, 3]
+    page, cursor = app_service.list_versions_page(
+        concept.id, cursor=cursor, limit=3, descending=True, summary=True
+    ).value
+    assert (numbers(page), cursor) == ([2, 1], None)
+
+    assert numbers(app_service.stream_versions(concept.id).value) == [1, 2, 3, 4, 5]
+    assert numbers(app_service.stream_versions(concept.id, limit=2, descending=True).value) == [5, 4]
+
+    with pytest.raises(ValueError):
+        app_service.list_versions_page(concept.id, cursor="not-a-cursor")
+
+
+def test_sparse_fieldsets_read_only_the_requested_fields(app_service, base_data):
+    concept, first = app_service.create_concept(base_data, "tester").value
+    for n in range(2, 5):
+        app_service.update_concept(concept.id, {"name": f"Numerator {n}"}, "tester", "Edit")
+
+    _, latest = app_service.get_concept(concept.id, fields=["examples", "name"]).value
+    assert list(latest) == ["id", "version_number", "name", "examples"]
+    assert (latest["version_number"], latest["name"]) == (4, "Numerator 4")
+    assert list(latest["examples"]) == ["In 3/4, the numerator is 3"]
+
+    result = app_service.get_version(concept.id, 1, fields=["created_at"])
+    assert result.value == {
+        "id": first.id,
+        "version_number": 1,
+        "created_at": first.created_at,
+    }
+    assert result.warnings == app_service.get_version(concept.id, 1).warnings
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = app_service.list_versions_page(
+            concept.id, cursor=cursor, limit=3, descending=True, fields=["name"]
+        ).value
+        pages.append([(v["version_number"], v["name"]) for v in page])
+        if cursor is None:
+            break
+    assert pages == [
+        [(4, "Numerator 4"), (3, "Numerator 3"), (2, "Numerator 2")],
+        [(1, "Numerator")],
+    ]
+
+    with pytest.raises(ValueError):
+        app_service.get_concept(concept.id, fields=["name", "concept_id; DROP TABLE x"])
+
+def test_get_concepts_many_returns_current_versions_and_missing_ids(app_service, base_data):
+    first, _ = app_service.create_concept(base_data, "tester").value
+    second, _ = app_service.create_concept({**base_data, "name": "Denominator"}, "tester").value
+    app_service.update_concept(second.id, {"name": "Bottom number"}, "tester", "Renamed")
+
+    items, missing = app_service.get_concepts_many(
+        [second.id, "missing", first.id, second.id]
+    ).value
+
+    assert [(c.id, v.version_number, v.name) for c, v, _ in items] == [
+        (second.id, 2, "Bottom number"),
+        (first.id, 1, "Numerator"),
+    ]
+    assert [w for _, _, w in items] == [
+        app_service.get_concept(second.id).warnings,
+        app_service.get_concept(first.id).warnings,
+    ]
+    assert missing == ["missing"]
+
+def test_change_status_many_is_all_or_nothing_unless_best_effort(app_service, base_data):
+    first, _ = app_service.create_concept(base_data, "tester").value
+    second, _ = app_service.create_concept({**base_data, "name": "Denominator"}, "tester").value
+
+    def status(concept_id):
+        return app_service.get_concept_metadata(concept_id).value.status
+
+    changes = [
+        (first.id, "REVIEW", "DRAFT"),
+        (first.id, "APPROVED", None),
+        (second.id, "PUBLISHED", None),
+        ("missing", "REVIEW", None),
+    ]
+
+    outcomes = app_service.change_status_many(changes).value
+    assert [(o.applied, o.error is None) for o in outcomes] == [
+        (False, True), (False, True), (False, False), (False, False)
+    ]
+    assert (status(first.id), status(second.id)) == ("DRAFT", "DRAFT")
+
+    outcomes = app_service.change_status_many(changes, atomic=False).value
+    assert [o.applied for o in outcomes] == [True, True, False, False]
+    assert outcomes[2].error == "Invalid status transition: DRAFT → PUBLISHED"
+    assert outcomes[3].error == "Concept not found"
+    assert (status(first.id), status(second.id)) == ("APPROVED", "DRAFT")
+
+    [outcome] = app_service.change_status_many([(first.id, "PUBLISHED", "REVIEW")]).value
+    assert (outcome.applied, outcome.status) == (False, "APPROVED")
+    assert outcome.error == "Status is APPROVED, expected REVIEW"
+
+def test_change_status_many_writes_are_conditional_on_the_status_read(
+    repo, app_service, base_data, monkeypatch
+):
+    first, _ = app_service.create_concept(base_data, "tester").value
+    second, _ = app_service.create_concept({**base_data, "name": "Denominator"}, "tester").value
+
+    # The batch reads both concepts as they were before this change.
+    stale = repo.get_concepts_many([first.id, second.id])
+    app_service.change_status(first.id, "REVIEW")
+    monkeypatch.setattr(
+        repo, "get_concepts_many", lambda ids: {i: copy(stale[i]) for i in ids if i in stale}
+    )
+
+    changes = [(first.id, "REVIEW", None), (second.id, "REVIEW", None)]
+
+    with pytest.raises(StatusConflict):
+        app_service.change_status_many(changes)
+    assert app_service.get_concept_metadata(second.id).value.status == "DRAFT"
+
+    outcomes = app_service.change_status_many(changes, atomic=False).value
+    assert [(o.applied, o.status) for o in outcomes] == [(False, "REVIEW"), (True, "REVIEW")]
+    assert outcomes[0].error == "Status is REVIEW, expected DRAFT"
+    assert repo.get_concept(first.id).current_version == 1
+
+
+def test_update_with_stale_expected_version_conflicts(repo, app_service, base_data):
+    concept, _ = app_service.create_concept(base_data, "tester").value
+    app_service.update_concept(concept.id, {"name": "Top number"}, "tester", "Renamed", expected_version=1)
+
+    with pytest.raises(VersionConflict) as conflict:
+        app_service.update_concept(concept.id, {"name": "Other"}, "tester", "Stale", expected_version=1)
+
+    assert conflict.value.current_version == 2
+    assert repo.get_latest_version(concept.id).name == "Top number"
+
+
+def test_update_validates_outside_the_writer(db_path, base_data):
+    # Only the compare-and-swap and the inserts hold the writer: another
+    # update commits while this one is still validating, and this one
+    # then loses the swap without writing anything.
+    pool = ConnectionPool(db_path, size=4)
+    writer = GroupCommitWriter(pool)
+    writer.start()
+
+    try:
+        repo = SQLiteConceptRepository(pool=pool, writer=writer)
+        app_service = ConceptApplicationService(ConceptService(), repo)
+        concept, _ = app_service.create_concept(base_data, "tester").value
+
+        has_read = threading.Event()
+        outcome = []
+
+        class SlowService(ConceptService):
+            def update_concept(self, *args, **kwargs):
+                has_read.set()
+                time.sleep(0.2)  # the other update commits meanwhile
+                return super().update_concept(*args, **kwargs)
+
+        slow = ConceptApplicationService(SlowService(), repo)
+
+        def update_mine():
+            try:
+                slow.update_concept(concept.id, {"name": "Mine"}, "tester", "Mine")
+            except VersionConflict as conflict:
+                outcome.append(conflict)
+
+        mine = threading.Thread(target=update_mine)
+        mine.start()
+        has_read.wait(5)
+
+        app_service.update_concept(concept.id, {"name": "Theirs"}, "other", "Theirs")
+        assert mine.is_alive()
+        mine.join(5)
+
+        [conflict] = outcome
+        assert (conflict.current_version, conflict.expected_version) == (2, 1)
+        assert [v.name for v in repo.list_versions(concept.id)] == ["Numerator", "Theirs"]
+        assert repo.get_concept(concept.id).current_version == 2
+    finally:
+        writer.stop()
+        pool.close()
+
+def test_status_change_racing_an_update_keeps_the_new_version(repo, app_service, base_data):
+    concept, _ = app_service.create_concept(base_data, "tester").value
+
+    # A status change checked against version 1 is saved after an update.
+    moved = ConceptService().change_status(concept, "REVIEW").value
+    app_service.update_concept(concept.id, {"name": "Top number"}, "tester", "Renamed")
+    repo.save_status_if_current(moved, expected_status="DRAFT")
+
+    stored = repo.get_concept(concept.id)
+    assert (stored.current_version, stored.status) == (2, "REVIEW")
+    app_service.update_concept(
+        concept.id, {"name": "Numerator"}, "tester", "Back", expected_version=2
+    )
+
+    # Checked against a status that another change has since replaced.
+    with pytest.raises(StatusConflict) as conflict:
+        repo.save_status_if_current(moved, expected_status="DRAFT")
+    assert conflict.value.current_status == "REVIEW"
+
+    # An update built from a read taken before the status change moves
+    # only the pointer: the status it read is not written back.
+    stale = repo.get_concept(concept.id)
+    app_service.change_status(concept.id, "APPROVED")
+    updated, _ = ConceptService().update_concept(
+        stale, repo.get_latest_version(concept.id), {}, "tester", "Edit"
+    ).value
+    repo.save_concept_if_current(updated, expected_version=3)
+    stored = repo.get_concept(concept.id)
+    assert (stored.current_version, stored.status) == (4, "APPROVED")
+
+
+def test_unit_of_work_rolls_back_every_write(repo, app_service, base_data):
+    concept, version = app_service.create_concept(base_data, "tester").value
+
+    with pytest.raises(ValueError):
+        with repo.unit_of_work() as uow:
+            moved = ConceptService().change_status(concept, "REVIEW").value
+            uow.save_concept(moved)
+            # Duplicate version number: the whole unit must be discarded.
+            uow.save_version(version)
+
+    assert repo.get_concept(concept.id).status == "DRAFT"
+
+
+
+def test_bulk_create_saves_every_record(repo, app_service, base_data):
+    records = [dict(base_data, name=f"Concept {i}") for i in range(5)]
+
+    results = app_service.bulk_create_concepts(records, "importer").value
+
+    assert len(results) == 5
+    for i, result in enumerate(results):
+        concept, version = result.value
+        assert repo.get_concept(concept.id).current_version == 1
+        assert repo.get_latest_version(concept.id).name == f"Concept {i}"
+
+
+def test_list_concepts_pages_with_cursor(app_service, base_data):
+    created = [
+        app_service.create_concept(dict(base_data, name=f"C{i}"), "tester").value[0].id
+        for i in range(5)
+    ]
+    app_service.change_status(created[0], "REVIEW")
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = app_service.list_concepts(cursor=cursor, limit=2).value
+        assert len(page) <= 2
+        seen.extend(concept.id for concept, _ in page)
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(created)
+    assert seen[0] == created[0]  # most recently updated first
+
+    review, _ = app_service.list_concepts(status="REVIEW").value
+    assert [concept.id for concept, _ in review] == [created[0]]
+
+    with pytest.raises(ValueError):
+        app_service.list_concepts(cursor="not-a-cursor")
+
+
+def test_list_concepts_filters_by_creator_not_last_editor(app_service, base_data):
+    mine, _ = app_service.create_concept(dict(base_data, name="Mine"), "alice").value
+    theirs, _ = app_service.create_concept(dict(base_data, name="Theirs"), "bob").value
+    app_service.update_concept(mine.id, {"name": "Mine, edited"}, "bob", "Edit")
+
+    by_alice, _ = app_service.list_concepts(created_by="alice").value
+    assert [(concept.id, version.version_number) for concept, version in by_alice] == [
+        (mine.id, 2)
+    ]
+
+    by_bob, _ = app_service.list_concepts(created_by="bob").value
+    assert [concept.id for concept, _ in by_bob] == [theirs.id]
+
+
+def test_search_finds_latest_version_by_content(app_service, base_data):
+    numerator, _ = app_service.create_concept(base_data, "tester").value
+    app_service.create_concept(
+        dict(base_data, name="Denominator", core_definition="The bottom number."),
+        "tester",
+    )
+
+    hits = app_service.search_concepts("numerator").value
+    assert [hit.concept_id for hit in hits] == [numerator.id]
+    assert "<mark>" in hits[0].snippet
+
+    app_service.update_concept(
+        numerator.id, {"name": "Top part"}, "tester", "Renamed"
+    )
+
+    assert app_service.search_concepts("numerator").value == []
+    hits = app_service.search_concepts("top part").value
+    assert [(hit.concept_id, hit.version_number) for hit in hits] == [(numerator.id, 2)]
+
+    hits = app_service.search_concepts("number fraction").value
+    assert len(hits) == 1
+
+
+def test_near_duplicate_definitions_warn_and_are_found(app_service, base_data):
+    definition = "The top number in a fraction, which tells how many equal parts are taken."
+    original, _ = app_service.create_concept(
+        dict(base_data, core_definition=definition), "tester"
+    ).value
+
+    copied = app_service.create_concept(
+        dict(base_data, name="Top number", core_definition=definition), "tester"
+    )
+    copy_id = copied.value[0].id
+
+    [match] = copied.similar
+    assert (match.concept_id, match.name, match.similarity) == (original.id, "Numerator", 1.0)
+    # Catalogue-dependent: reported apart from the stored warnings, so a
+    # read returns the same warnings as the write.
+    assert app_service.get_concept(copy_id).warnings == copied.warnings
+
+    [match] = app_service.find_similar(original.id).value
+    assert (match.concept_id, match.name, match.similarity) == (copy_id, "Top number", 1.0)
+
+    updated = app_service.update_concept(
+        copy_id, {"core_definition": "A shape with three sides."}, "tester", "Rewrite"
+    )
+    assert updated.similar == ()
+    assert app_service.find_similar(original.id).value == []
+
+
+def test_prerequisite_graph_follows_writes_and_warns_on_cycles(repo, app_service, base_data):
+    fraction, _ = app_service.create_concept(
+        dict(base_data, name="Fraction", prerequisites=[]), "tester"
+    ).value
+    numerator, _ = app_service.create_concept(base_data, "tester").value
+
+    [link] = app_service.get_prerequisites(numerator.id, depth=5).value.links
+    assert (link.concept_id, link.name, link.depth) == (fraction.id, "Fraction", 1)
+
+    closing = app_service.update_concept(
+        fraction.id, {"prerequisites": ["numerator"]}, "tester", "Oops"
+    )
+    assert closing.cycle == ("Fraction", "Numerator", "Fraction")
+    # Catalogue-dependent: kept out of the warnings, so a read returns
+    # the same warnings as the write.
+    assert app_service.get_concept(fraction.id).warnings == closing.warnings
+    assert app_service.prerequisite_order().value.cyclic == sorted([fraction.id, numerator.id])
+
+    # A second process writing to the same store: seen after a refresh.
+    other = ConceptApplicationService(ConceptService(), repo)
+    ratio, _ = other.create_concept(
+        dict(base_data, name="Ratio", prerequisites=["Numerator"]), "tester"
+    ).value
+
+    app_service.prerequisites = PrerequisiteIndex(repo, refresh_seconds=0)
+    app_service.prerequisites.load()
+    other.update_concept(ratio.id, {"prerequisites": []}, "tester", "Standalone")
+
+    dependents = app_service.get_dependents(numerator.id, depth=5).value
+    assert [link.name for link in dependents.links] == ["Fraction"]
+
+    with pytest.raises(ValueError):
+        app_service.get_prerequisites("missing")
+
+
+def test_warnings_are_stored_and_read_back(repo, app_service, base_data):
+    created = app_service.create_concept(base_data, "tester")
+    concept, version = created.value
+
+    record = repo.get_warnings([version.id])[version.id]
+    assert record.warnings == created.warnings
+    assert record.ruleset_version == app_service.domain.ruleset_version
+
+    assert app_service.get_concept(concept.id).warnings == created.warnings
+    assert app_service.get_version(concept.id, 1).warnings == created.warnings
+
+
+def test_rule_change_revalidates_stale_warnings(repo, base_data):
+    first = ConceptApplicationService(ConceptService(), repo)
+    concept, _ = first.create_concept(base_data, "tester").value
+    first.create_concept(dict(base_data, name="Other"), "tester")
+    first.update_concept(concept.id, {"examples": []}, "tester", "No examples")
+
+    strict = ConceptService(engine=RuleEngine(
+        CONCEPT_RULES + [Rule(id="always", message="Always", check=always)]
+    ))
+    second = ConceptApplicationService(strict, repo)
+
+    assert len(repo.list_stale_versions(strict.ruleset_version)) == 3
+
+    # Read path: recomputed for the response, but reads write nothing.
+    saves = []
+    save_warnings = repo.save_warnings
+    repo.save_warnings = lambda records: saves.append(records) or save_warnings(records)
+
+    assert "Always" in second.get_version(concept.id, 1).warnings
+    assert "Always" in second.get_concept(concept.id).warnings
+    assert saves == []
+    assert len(repo.list_stale_versions(strict.ruleset_version)) == 3
+
+    # Background path: the revalidation job rewrites them all.
+    job = RevalidationJob(second, InMemoryCheckpointStore(), workers=1, chunk_size=1)
+    progress = job.run()
+
+    assert (progress.state, progress.processed, progress.chunks) == ("done", 3, 3)
+    assert repo.list_stale_versions(strict.ruleset_version) == []
+
+
+def test_revalidate_reuses_warnings_by_content(base_data):
+    domain = ConceptService()
+    concept, version = domain.create_concept(base_data, "tester").value
+    twin = ConceptService().create_concept(base_data, "tester").value[1]
+
+    looked_up = []
+
+    def lookup(hashes):
+        looked_up.append(hashes)
+        return {h: ["Known"] for h in hashes}
+
+    records = domain.revalidate([version, twin], lookup=lookup)
+
+    assert len(looked_up[0]) == 1  # same content, one hash
+    assert [r.warnings for r in records] == [["Known"], ["Known"]]
+    assert records[0].content_hash == records[1].content_hash
@@ -0,0 +1,135 @@
+from datetime import datetime
+
+import pytest
+
+from app.application.concept_app_service import ConceptApplicationService
+from app.application.revalidation import JOB_NAME, RevalidationJob
+from app.domain.concept.service import ConceptService
+from app.persistence.checkpoints import (
+    Checkpoint,
+    InMemoryCheckpointStore,
+    SQLiteCheckpointStore,
+)
+from app.persistence.db import ConnectionPool
+from app.persistence.repositories.sqlite.sqlite_concept_repository import (
+    SQLiteConceptRepository,
+)
+from app.validation.concept_rules import CONCEPT_RULES
+from app.validation.engine import Rule, RuleEngine
+
+
+def always(v):
+    return True
+
+
+@pytest.fixture
+def pool(db_path):
+    pool = ConnectionPool(db_path, size=2)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def repo(pool):
+    return SQLiteConceptRepository(pool=pool)
+
+
+@pytest.fixture
+def stale_service(repo):
+    """
+    Seven concepts (two with identical content) validated under the
+    default rules, and a service running a stricter rule set.
+    """
+    seed = ConceptApplicationService(ConceptService(), repo)
+    base = {
+        "name": "Numerator",
+        "core_definition": "The top number in a fraction.",
+        "expanded_explanation": "It tells how many parts are taken.",
+        "learning_objective": "Identify the numerator in a fraction",
+        "examples": [],
+        "prerequisites": [],
+    }
+    seed.create_concept(base, "tester")
+    for i in range(6):
+        seed.create_concept(dict(base, name=f"Concept {i}"), "tester")
+
+    strict = ConceptService(engine=RuleEngine(
+        CONCEPT_RULES + [Rule(id="always", message="Always", check=always)]
+    ))
+    return ConceptApplicationService(strict, repo)
+
+
+def _stale(service):
+    return service.repo.list_stale_versions(service.domain.ruleset_version)
+
+
+def test_run_resumes_from_checkpoint(stale_service):
+    checkpoints = InMemoryCheckpointStore()
+    job = RevalidationJob(stale_service, checkpoints, workers=1, chunk_size=3)
+
+    def crash(progress):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        job.run(on_progress=crash)
+
+    assert job.progress().state == "failed"
+    assert checkpoints.load(JOB_NAME).processed == 3
+    assert len(_stale(stale_service)) == 4
+
+    progress = job.run()
+
+    assert (progress.state, progress.resumed_from, progress.processed) == ("done", 3, 7)
+    assert _stale(stale_service) == []
+    assert checkpoints.load(JOB_NAME) is None
+
+
+def test_checkpoint_from_other_rules_is_ignored(stale_service, pool):
+    checkpoints = SQLiteCheckpointStore(pool)
+    checkpoints.save(Checkpoint(
+        job=JOB_NAME,
+        run_key="older-rules",
+        position="\uffff",  # past every version id
+        processed=5,
+        updated_at=datetime(2024, 1, 1),
+    ))
+
+    progress = RevalidationJob(stale_service, checkpoints, workers=1).run()
+
+    assert (progress.resumed_from, progress.processed) == (0, 7)
+
+
+def test_workers_share_the_load(stale_service):
+    job = RevalidationJob(
+        stale_service,
+        InMemoryCheckpointStore(),
+        workers=2,
+        chunk_size=2,
+    )
+
+    progress = job.run()
+
+    assert (progress.state, progress.processed, progress.chunks) == ("done", 7, 4)
+    assert _stale(stale_service) == []
+
+    warnings = stale_service.repo.get_warnings(
+        [v.id for _, v in stale_service.repo.list_concepts()]
+    )
+    assert all("Always" in record.warnings for record in warnings.values())
+
+
+def test_only_one_process_runs_the_job(stale_service, pool):
+    checkpoints = SQLiteCheckpointStore(pool)
+    other = RevalidationJob(stale_service, SQLiteCheckpointStore(pool), workers=1)
+    assert checkpoints.acquire_lease(JOB_NAME, "another-process", 60)
+
+    with pytest.raises(RuntimeError, match="another process"):
+        other.run()
+    with pytest.raises(RuntimeError, match="another process"):
+        other.start()
+    assert len(_stale(stale_service)) == 7
+
+    # An expired lease is taken over, and released when the run ends.
+    assert checkpoints.acquire_lease(JOB_NAME, "another-process", -1)
+    assert other.run().processed == 7
+    assert checkpoints.acquire_lease(JOB_NAME, "another-process", 60)
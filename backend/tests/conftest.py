@@ -0,0 +1,13 @@
+import pytest
+
+from app.persistence.migrations import apply_migrations
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """
+    Path to a fresh SQLite database with every migration applied.
+    """
+    path = str(tmp_path / "test.db")
+    apply_migrations(path)
+    return path
@@ -0,0 +1,63 @@
+import pytest
+
+from app.domain.concept.graph import PrerequisiteGraph
+
+
+@pytest.fixture
+def graph():
+    # Whole number <- Fraction <- Numerator, Denominator <- Ratio
+    graph = PrerequisiteGraph()
+    graph.update("whole", "Whole number", [])
+    graph.update("fraction", "Fraction", ["whole NUMBER", "Division"])
+    graph.update("numerator", "Numerator", ["Fraction"])
+    graph.update("denominator", "Denominator", ["fraction"])
+    graph.update("ratio", "Ratio", ["Numerator", "Denominator"])
+    return graph
+
+
+def test_prerequisites_are_transitive_up_to_depth(graph):
+    direct = graph.prerequisites("ratio", max_depth=1, limit=100)
+    assert [link.concept_id for link in direct.links] == ["numerator", "denominator"]
+
+    deep = graph.prerequisites("ratio", max_depth=10, limit=100)
+    assert [(link.concept_id, link.depth) for link in deep.links] == [
+        ("numerator", 1), ("denominator", 1), ("fraction", 2), ("whole", 3),
+    ]
+    assert deep.unresolved == ["division"]
+    assert not deep.truncated
+
+    assert graph.prerequisites("ratio", max_depth=10, limit=2).truncated
+
+
+def test_dependents_are_transitive(graph):
+    dependents = graph.dependents("whole", max_depth=10, limit=100)
+
+    assert [(link.concept_id, link.depth) for link in dependents.links] == [
+        ("fraction", 1), ("denominator", 2), ("numerator", 2), ("ratio", 3),
+    ]
+
+
+def test_topological_order_puts_prerequisites_first_and_is_cached(graph):
+    order = graph.topological_order()
+
+    assert order.cyclic == []
+    position = {concept_id: i for i, concept_id in enumerate(order.order)}
+    assert position["whole"] < position["fraction"] < position["numerator"] < position["ratio"]
+
+    graph.update("ratio", "Ratio", ["numerator", "denominator"])  # same edges
+    assert graph.topological_order() is order
+
+    graph.update("whole", "Whole number", ["Ratio"])
+    assert graph.topological_order().cyclic == [
+        "denominator", "fraction", "numerator", "ratio", "whole",
+    ]
+
+
+def test_find_cycle_returns_shortest_path_back(graph):
+    assert graph.find_cycle("ratio") is None
+
+    graph.update("whole", "Whole number", ["Numerator"])
+    assert graph.find_cycle("whole") == ["whole", "numerator", "fraction", "whole"]
+
+    graph.update("ratio", "Ratio", ["Ratio"])
+    assert graph.find_cycle("ratio") == ["ratio", "ratio"]
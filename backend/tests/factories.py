@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from app.domain.concept.models import Concept, ConceptVersion
+
+
+def make_concept(concept_id="c1", current_version=1, status="DRAFT"):
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    return Concept(
+        id=concept_id,
+        current_version=current_version,
+        status=status,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def make_version(concept_id="c1", version_number=1, **overrides):
+    fields = dict(
+        id=f"{concept_id}-v{version_number}",
+        concept_id=concept_id,
+        version_number=version_number,
+        name="Numerator",
+        core_definition="The top number in a fraction.",
+        expanded_explanation="It tells how many parts are taken.",
+        learning_objective="Identify the numerator in a fraction",
+        examples=["In 3/4, the numerator is 3"],
+        misconceptions=[],
+        scope_boundaries=None,
+        prerequisites=["Fraction"],
+        created_by="tester",
+        created_at=datetime(2024, 1, 1, 12, 0, 0),
+        change_note="Initial version",
+    )
+    fields.update(overrides)
+    return ConceptVersion(**fields)
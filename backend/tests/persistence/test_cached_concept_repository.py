@@ -0,0 +1,185 @@
+from datetime import datetime
+
+import pytest
+
+from app.domain.common.errors import VersionConflict
+from app.domain.concept.models import VersionWarnings
+from app.persistence.cache import LRUCache
+from app.persistence.repositories.cached.cached_concept_repository import (
+    CachedConceptRepository,
+)
+from app.persistence.repositories.in_memory.in_memory_concept_repository import (
+    InMemoryConceptRepository,
+)
+from tests.factories import make_concept, make_version
+
+
+class CountingRepository(InMemoryConceptRepository):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def get_concept(self, concept_id):
+        self.calls += 1
+        return super().get_concept(concept_id)
+
+    def get_latest_version(self, concept_id):
+        self.calls += 1
+        return super().get_latest_version(concept_id)
+
+    def get_concepts_many(self, concept_ids):
+        self.calls += 1
+        return super().get_concepts_many(concept_ids)
+
+    def get_latest_versions_many(self, concept_ids):
+        self.calls += 1
+        return super().get_latest_versions_many(concept_ids)
+
+    def get_version_fields(self, concept_id, version_number, fields):
+        self.calls += 1
+        return super().get_version_fields(concept_id, version_number, fields)
+
+
+@pytest.fixture
+def inner():
+    repo = CountingRepository()
+    repo.save_concept(make_concept())
+    repo.save_version(make_version())
+    return repo
+
+
+@pytest.fixture
+def repo(inner):
+    return CachedConceptRepository(inner, max_entries=10, ttl_seconds=60)
+
+
+def test_reads_are_served_from_cache(repo, inner):
+    for _ in range(3):
+        assert repo.get_concept("c1").id == "c1"
+        assert repo.get_latest_version("c1").version_number == 1
+
+    assert inner.calls == 2
+    assert repo.stats()["current"]["hits"] == 4
+
+
+def test_batch_reads_load_only_cache_misses_in_one_call(repo, inner):
+    inner.save_concept(make_concept("c2"))
+    inner.save_version(make_version("c2"))
+    repo.get_concept("c1")
+    inner.calls = 0
+
+    concepts = repo.get_concepts_many(["c1", "c2", "missing"])
+    assert sorted(concepts) == ["c1", "c2"]
+    assert inner.calls == 1
+
+    repo.get_latest_versions_many(["c1", "c2"])
+    repo.get_latest_versions_many(["c1", "c2"])
+    assert repo.get_latest_version("c2").version_number == 1
+    assert inner.calls == 2
+
+    concepts["c1"].status = "PUBLISHED"
+    assert repo.get_concepts_many(["c1"])["c1"].status == "DRAFT"
+
+
+def test_unit_of_work_invalidates_after_commit(repo):
+    repo.get_concept("c1")
+    repo.get_latest_version("c1")
+
+    with repo.unit_of_work() as uow:
+        uow.save_version(make_version(version_number=2))
+        uow.save_concept(make_concept(current_version=2))
+
+    assert repo.get_concept("c1").current_version == 2
+    assert repo.get_latest_version("c1").version_number == 2
+
+
+def test_failed_unit_of_work_reads_committed_state(repo):
+    repo.get_concept("c1")
+
+    with pytest.raises(ValueError):
+        with repo.unit_of_work() as uow:
+            uow.save_concept(make_concept(current_version=2))
+            uow.save_version(make_version())  # duplicate
+
+    assert repo.get_concept("c1").current_version == 1
+
+
+def test_lost_compare_and_swap_drops_the_stale_concept(repo, inner):
+    assert repo.get_concept("c1").current_version == 1
+
+    # Moved on behind the cache (e.g. by another process).
+    inner.save_version(make_version(version_number=2))
+    inner.save_concept(make_concept(current_version=2))
+
+    with pytest.raises(VersionConflict):
+        with repo.unit_of_work() as uow:
+            uow.save_concept_if_current(make_concept(current_version=2), expected_version=1)
+
+    assert repo.get_concept("c1").current_version == 2
+
+
+def test_returned_concepts_do_not_alias_the_cache(repo):
+    repo.get_concept("c1").status = "PUBLISHED"
+
+    assert repo.get_concept("c1").status == "DRAFT"
+
+
+def test_lru_evicts_and_expires():
+    cache = LRUCache(max_entries=2, ttl_seconds=0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert cache.get("a") is None
+
+    # ttl_seconds=0: everything is already stale.
+    assert cache.get("c") is None
+    assert cache.stats().expirations >= 1
+
+
+def test_put_if_current_skips_values_loaded_before_a_write():
+    cache = LRUCache(max_entries=10)
+    generation = cache.generation
+
+    cache.invalidate("k")
+    cache.put_if_current("k", "stale", generation)
+
+    assert cache.get("k") is None
+
+
+def test_uncached_methods_are_delegated(repo):
+    assert [v.version_number for v in repo.list_versions("c1")] == [1]
+    assert [c.id for c, _ in repo.list_concepts()] == ["c1"]
+
+
+def test_stored_warnings_are_cached_until_saved(repo, inner):
+    def record(warnings):
+        return VersionWarnings("c1-v1", "hash", "rules-1", warnings, datetime(2024, 1, 1))
+
+    inner.save_warnings([record(["Old"])])
+    assert repo.get_warnings(["c1-v1"])["c1-v1"].warnings == ["Old"]
+
+    inner.save_warnings([record(["Stale"])])  # behind the cache's back
+    assert repo.get_warnings(["c1-v1"])["c1-v1"].warnings == ["Old"]
+
+    with repo.unit_of_work() as uow:
+        uow.save_warnings([record(["New"])])
+    assert repo.get_warnings(["c1-v1"])["c1-v1"].warnings == ["New"]
+    assert repo.get_warnings(["missing"]) == {}
+
+
+def test_version_fields_are_projected_from_cached_versions(repo, inner):
+    # Not cached yet: read (projected) by the inner repository.
+    assert repo.get_version_fields("c1", 1, ["id", "name"]) == {"id": "c1-v1", "name": "Numerator"}
+    assert inner.calls == 1
+
+    repo.get_version("c1", 1)
+    calls = inner.calls
+
+    assert repo.get_version_fields("c1", 1, ["name"]) == {"name": "Numerator"}
+    assert inner.calls == calls
+
+    with pytest.raises(ValueError):
+        repo.get_version_fields("c1", 1, ["nope"])
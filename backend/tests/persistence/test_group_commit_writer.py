@@ -0,0 +1,135 @@
+import threading
+
+import pytest
+
+from app.persistence.db import ConnectionPool
+from app.persistence.repositories.sqlite.sqlite_concept_repository import (
+    SQLiteConceptRepository,
+)
+from app.persistence.writer import GroupCommitWriter
+from tests.factories import make_concept, make_version
+
+
+@pytest.fixture
+def pool(db_path):
+    pool = ConnectionPool(db_path, size=4, timeout=1)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def writer(pool):
+    writer = GroupCommitWriter(pool, max_batch_size=16, window_ms=20)
+    writer.start()
+    yield writer
+    writer.stop()
+
+
+def insert_concept(concept_id):
+    def op(conn):
+        conn.execute(
+            "INSERT INTO concepts VALUES (?, 1, 'DRAFT', 'x', 'x')",
+            (concept_id,),
+        )
+        return concept_id
+
+    return op
+
+
+def test_concurrent_writes_are_batched(pool, writer):
+    futures = [writer.submit(insert_concept(f"c{i}")) for i in range(10)]
+
+    assert [f.result(timeout=5) for f in futures] == [f"c{i}" for i in range(10)]
+
+    stats = writer.stats()
+    assert stats.succeeded == 10
+    assert stats.batches < 10
+    assert stats.max_batch_size > 1
+
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM concepts").fetchone()[0] == 10
+
+
+def test_failing_op_only_fails_its_own_caller(pool, writer):
+    ok = writer.submit(insert_concept("c1"))
+    duplicate = writer.submit(insert_concept("c1"))
+    other = writer.submit(insert_concept("c2"))
+
+    assert ok.result(timeout=5) == "c1"
+    assert other.result(timeout=5) == "c2"
+    with pytest.raises(Exception):
+        duplicate.result(timeout=5)
+
+    assert writer.stats().failed == 1
+
+
+def test_stop_drains_queue(pool):
+    writer = GroupCommitWriter(pool, window_ms=50)
+    writer.start()
+    futures = [writer.submit(insert_concept(f"c{i}")) for i in range(5)]
+    writer.stop()
+
+    assert all(f.done() for f in futures)
+    with pytest.raises(RuntimeError):
+        writer.submit(insert_concept("late"))
+
+
+def test_repository_unit_of_work_goes_through_writer(pool, writer):
+    repo = SQLiteConceptRepository(pool=pool, writer=writer)
+
+    def save(i):
+        with repo.unit_of_work() as uow:
+            uow.save_concept(make_concept(f"c{i}"))
+            uow.save_version(make_version(f"c{i}"))
+
+    threads = [threading.Thread(target=save, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert all(repo.get_latest_version(f"c{i}") for i in range(8))
+    assert writer.stats().succeeded == 8
+
+    with pytest.raises(ValueError):
+        with repo.unit_of_work() as uow:
+            uow.save_concept(make_concept("c0", status="REVIEW"))
+            uow.save_version(make_version("c0"))
+
+    assert repo.get_concept("c0").status == "DRAFT"
+
+
+def test_hold_keeps_other_writes_out_until_the_block_exits(pool, writer):
+    writer.execute(insert_concept("c1"))
+
+    def bump(conn):
+        conn.execute("UPDATE concepts SET current_version = current_version + 1")
+
+    with writer.hold() as conn:
+        (current,) = conn.execute("SELECT current_version FROM concepts").fetchone()
+
+        other = threading.Thread(target=writer.execute, args=(bump,))
+        other.start()
+        other.join(0.2)
+        assert other.is_alive()  # queued behind the block
+
+        conn.execute("UPDATE concepts SET current_version = ?", (current + 1,))
+        # Writes submitted from inside the block join it.
+        writer.execute(insert_concept("c2"))
+
+    other.join(5)
+    with pool.connection() as conn:
+        assert conn.execute("SELECT current_version FROM concepts WHERE id = 'c1'").fetchone()[0] == 3
+        assert conn.execute("SELECT COUNT(*) FROM concepts").fetchone()[0] == 2
+
+
+def test_hold_rolls_back_the_block_on_error(pool, writer):
+    with pytest.raises(KeyError):
+        with writer.hold() as conn:
+            insert_concept("c1")(conn)
+            raise KeyError("abort")
+
+    writer.execute(insert_concept("c2"))
+
+    with pool.connection() as conn:
+        assert [row[0] for row in conn.execute("SELECT id FROM concepts")] == ["c2"]
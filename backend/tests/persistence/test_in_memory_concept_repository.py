@@ -0,0 +1,133 @@
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+import pytest
+
+from app.domain.concept.models import VersionWarnings
+from app.persistence import minhash
+from app.persistence.db import ConnectionPool
+from app.persistence.repositories.in_memory.in_memory_concept_repository import (
+    InMemoryConceptRepository,
+)
+from app.persistence.repositories.sqlite.sqlite_concept_repository import (
+    SQLiteConceptRepository,
+)
+from tests.factories import make_concept, make_version
+
+
+@pytest.fixture
+def repo():
+    return InMemoryConceptRepository()
+
+
+def test_stored_state_cannot_be_changed_through_returned_objects(repo):
+    concept = make_concept()
+    repo.save_concept(concept)
+    repo.save_version(make_version(examples=["In 3/4, the numerator is 3"]))
+
+    concept.status = "PUBLISHED"
+    repo.get_concept("c1").status = "PUBLISHED"
+    assert repo.get_concept("c1").status == "DRAFT"
+
+    version = repo.get_latest_version("c1")
+    assert version.examples == ("In 3/4, the numerator is 3",)
+    with pytest.raises(AttributeError):
+        version.examples.append("In 5/8, the numerator is 5")
+
+    # Immutable, so shared rather than copied.
+    assert repo.get_version("c1", 1) is version
+    assert repo.list_versions("c1") == [version]
+
+
+def test_latest_version_pointer_follows_saves_and_rollbacks(repo):
+    repo.save_concept(make_concept())
+    repo.save_version(make_version())
+    repo.save_version(make_version(version_number=2))
+
+    with pytest.raises(RuntimeError):
+        with repo.unit_of_work() as uow:
+            uow.save_version(make_version(version_number=3))
+            assert uow.get_latest_version("c1").version_number == 3
+            raise RuntimeError("abort")
+
+    assert repo.get_latest_version("c1").version_number == 2
+    assert [v.version_number for v in repo.list_versions("c1")] == [1, 2]
+    assert repo.get_latest_version("missing") is None
+
+
+def _fill(repo):
+    repo.save_concept(make_concept())
+    repo.save_version(make_version())
+    repo.save_version(make_version(version_number=2, core_definition="The top number of a fraction."))
+    repo.save_concept(make_concept("c2"))
+    repo.save_version(make_version("c2", name="Denominator", core_definition="The top number in a fraction!"))
+
+
+def test_snapshot_restores_records_and_indexes(repo, tmp_path, monkeypatch):
+    _fill(repo)
+    repo.save_warnings([VersionWarnings("c1-v2", "abc", "r1", ["Too short"], datetime(2024, 1, 1))])
+    path = tmp_path / "concepts.snapshot"
+
+    assert repo.snapshot(str(path)) == 3
+
+    # Plain data, not pickle: nothing in it can run code when loaded.
+    payload = json.loads(path.read_bytes().split(b"\n", 1)[1])
+    assert sorted(payload["signatures"]) == ["c1", "c2"]
+
+    restored = InMemoryConceptRepository.from_snapshot(str(path))
+    assert restored.get_concept("c1") == repo.get_concept("c1")
+    assert restored.list_versions("c1") == repo.list_versions("c1")
+    assert restored.get_latest_version("c2") == repo.get_latest_version("c2")
+    assert restored.get_warnings(["c1-v2"]) == repo.get_warnings(["c1-v2"])
+
+    # Saved signatures are reused when the indexes are rebuilt; only the
+    # new version's is computed.
+    computed = []
+    signature = minhash.signature
+    monkeypatch.setattr(minhash, "signature", lambda text: computed.append(text) or signature(text))
+
+    # A write before the indexes are rebuilt is not lost from them.
+    restored.save_concept(make_concept("c3"))
+    restored.save_version(make_version("c3", name="Fraction bar"))
+    assert len(computed) == 1
+    assert [hit.concept_id for hit in restored.search("bar")] == ["c3"]
+    assert [hit.concept_id for hit in restored.search("denominator")] == ["c2"]
+
+    similar = restored.find_similar(restored.get_latest_version("c2"))
+    assert [(s.concept_id, s.similarity) for s in similar] == [("c3", 1.0)]
+
+
+def test_restore_rejects_foreign_files_and_orphan_versions(repo, tmp_path):
+    path = tmp_path / "not-a-snapshot"
+    path.write_bytes(b"SQLite format 3\x00")
+    with pytest.raises(ValueError):
+        InMemoryConceptRepository.from_snapshot(str(path))
+
+    with pytest.raises(ValueError):
+        repo.restore([make_concept()], [make_version("c2")])
+
+
+def test_from_sqlite_loads_every_version(db_path):
+    pool = ConnectionPool(db_path, size=1)
+    try:
+        _fill(SQLiteConceptRepository(pool=pool))
+    finally:
+        pool.close()
+
+    # A seed file as shipped: not in WAL mode, nothing beside it.
+    with closing(sqlite3.connect(db_path)) as conn:
+        conn.execute("PRAGMA journal_mode = DELETE")
+
+    repo = InMemoryConceptRepository.from_sqlite(db_path)
+
+    assert [v.version_number for v in repo.list_versions("c1")] == [1, 2]
+    assert repo.get_latest_version("c2").name == "Denominator"
+    assert [hit.concept_id for hit in repo.search("denominator")] == ["c2"]
+
+    # Opened read-only: the file is left exactly as it was.
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert not os.path.exists(db_path + "-wal")
@@ -0,0 +1,157 @@
+import threading
+
+import pytest
+
+from app.persistence.db import ConnectionPool
+from app.persistence.repositories.sqlite import sqlite_concept_repository
+from app.persistence.repositories.sqlite.sqlite_concept_repository import (
+    SQLiteConceptRepository,
+)
+from tests.factories import make_concept, make_version
+
+
+@pytest.fixture
+def pool(db_path):
+    pool = ConnectionPool(db_path, size=2, timeout=1)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def repo(pool):
+    return SQLiteConceptRepository(pool=pool)
+
+
+def test_round_trip_concept_and_versions(repo):
+    repo.save_concept(make_concept())
+    repo.save_version(make_version())
+    repo.save_version(make_version(version_number=2, name="Top number"))
+
+    assert repo.get_concept("c1") == make_concept()
+    assert repo.get_latest_version("c1").version_number == 2
+    assert repo.get_version("c1", 1) == make_version()
+    assert [v.version_number for v in repo.list_versions("c1")] == [1, 2]
+    assert repo.get_concept("missing") is None
+
+
+def test_pool_reuses_connections_and_tracks_checkouts(repo, pool):
+    repo.save_concept(make_concept())
+    for _ in range(10):
+        repo.get_concept("c1")
+
+    stats = pool.stats()
+    assert stats.open == 1
+    assert stats.checkouts == 11
+    assert stats.in_use == 0
+
+
+def test_pool_connections_use_wal(pool):
+    with pool.connection() as conn:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert mode == "wal"
+
+
+def test_pool_blocks_when_exhausted_and_counts_waits(pool):
+    pool.warm()
+    released = threading.Event()
+
+    def hold():
+        with pool.connection():
+            released.wait()
+
+    holders = [threading.Thread(target=hold) for _ in range(pool.size)]
+    for t in holders:
+        t.start()
+
+    threading.Timer(0.05, released.set).start()
+
+    with pool.connection():
+        pass
+
+    for t in holders:
+        t.join()
+
+    assert pool.stats().waits >= 1
+
+
+def test_pool_times_out_when_exhausted(pool):
+    pool.timeout = 0.01
+
+    with pool.connection(), pool.connection():
+        with pytest.raises(TimeoutError):
+            with pool.connection():
+                pass
+
+    assert pool.stats().timeouts == 1
+
+
+def test_transaction_rolls_back_on_error(repo, pool):
+    with pytest.raises(RuntimeError):
+        with pool.transaction() as conn:
+            conn.execute(
+                "INSERT INTO concepts VALUES ('c1', 1, 'DRAFT', 'x', 'x')"
+            )
+            raise RuntimeError("boom")
+
+    assert repo.get_concept("c1") is None
+
+
+def test_iter_export_filters_and_streams_in_order(repo):
+    repo.save_concept(make_concept("c1", current_version=2))
+    repo.save_version(make_version("c1"))
+    repo.save_version(make_version("c1", version_number=2))
+    repo.save_concept(make_concept("c2", status="REVIEW"))
+    repo.save_version(make_version("c2"))
+
+    everything = [(c.id, v.version_number) for c, v in repo.iter_export()]
+    assert everything == [("c1", 1), ("c1", 2), ("c2", 1)]
+
+    latest = [(c.id, v.version_number) for c, v in repo.iter_export(latest_only=True)]
+    assert latest == [("c1", 2), ("c2", 1)]
+
+    review = [c.id for c, _ in repo.iter_export(status="REVIEW")]
+    assert review == ["c2"]
+
+
+def test_streams_hold_no_connection_between_chunks(repo, pool, monkeypatch):
+    monkeypatch.setattr(sqlite_concept_repository, "_STREAM_CHUNK_SIZE", 2)
+    repo.save_concept(make_concept("c1", current_version=5))
+    for number in range(1, 6):
+        repo.save_version(make_version("c1", version_number=number))
+    repo.save_concept(make_concept("c2"))
+    repo.save_version(make_version("c2"))
+
+    exports = repo.iter_export()
+    versions = repo.iter_versions("c1", after=1, limit=3)
+    assert next(exports)[1].version_number == 1
+    assert next(versions).version_number == 2
+
+    # Both streams are paused mid-chunk, yet the whole pool is free.
+    pool.timeout = 0.01
+    with pool.connection(), pool.connection():
+        pass
+
+    assert [(c.id, v.version_number) for c, v in exports] == [
+        ("c1", 2), ("c1", 3), ("c1", 4), ("c1", 5), ("c2", 1),
+    ]
+    assert [v.version_number for v in versions] == [3, 4]
+    assert [v.version_number for v in repo.iter_versions("c1", descending=True)] == [5, 4, 3, 2, 1]
+
+
+def test_backfill_indexes_concepts_missing_from_similarity_index(repo, pool):
+    for concept_id in ("c1", "c2"):
+        repo.save_concept(make_concept(concept_id))
+        repo.save_version(make_version(concept_id))
+
+    # As if saved before the similarity index existed.
+    with pool.transaction() as conn:
+        conn.execute("DELETE FROM concept_signatures")
+        conn.execute("DELETE FROM concept_signature_bands")
+
+    assert repo.find_similar(make_version("c1")) == []
+    assert repo.backfill_similarity_index() == 2
+    assert repo.backfill_similarity_index() == 0
+
+    [match] = repo.find_similar(make_version("c1"))
+    assert (match.concept_id, match.similarity) == ("c2", 1.0)
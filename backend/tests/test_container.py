@@ -0,0 +1,63 @@
+from app.container import Container
+from app.persistence.repositories.in_memory.in_memory_concept_repository import (
+    InMemoryConceptRepository,
+)
+from tests.factories import make_concept, make_version
+
+
+def test_startup_builds_singletons_and_warms_pool(db_path):
+    container = Container(db_path=db_path, pool_size=2)
+    container.startup()
+
+    try:
+        service = container.resolve("concept_app_service")
+        assert container.resolve("concept_app_service") is service
+        assert container.resolve("pool").stats().open == 2
+    finally:
+        container.shutdown()
+
+
+def test_override_is_scoped(db_path):
+    container = Container(db_path=db_path, pool_size=1)
+    container.startup()
+
+    try:
+        original = container.resolve("concept_repository")
+        fake = InMemoryConceptRepository()
+
+        service = container.resolve("concept_app_service")
+
+        with container.override("concept_repository", fake):
+            assert container.resolve("concept_repository") is fake
+            # Services built from the repository are rebuilt from the fake.
+            assert container.resolve("concept_app_service").repo is fake
+            assert container.resolve("revalidation_job").app_service.repo is fake
+
+            with container.override("concept_app_service", service):
+                assert container.resolve("concept_app_service") is service
+
+            assert container.resolve("concept_app_service").repo is fake
+
+        assert container.resolve("concept_repository") is original
+        assert container.resolve("concept_app_service") is service
+    finally:
+        container.shutdown()
+
+
+def test_memory_backend_is_seeded_from_a_snapshot(tmp_path):
+    seed = InMemoryConceptRepository()
+    seed.save_concept(make_concept())
+    seed.save_version(make_version())
+    path = str(tmp_path / "concepts.snapshot")
+    seed.snapshot(path)
+
+    container = Container(backend="memory", memory_seed_path=path, revalidate_on_startup=False)
+    container.startup()
+
+    try:
+        repo = container.resolve("concept_repository")
+        assert isinstance(repo, InMemoryConceptRepository)
+        assert repo.get_latest_version("c1").name == "Numerator"
+        assert container.stats()["pool"] is None
+    finally:
+        container.shutdown()
@@ -0,0 +1,96 @@
+import inspect
+from dataclasses import replace
+
+import pytest
+
+from app.validation.concept_validation import validate_concept_version
+from app.validation.concept_rules import CONCEPT_RULES, concept_rule_engine
+from app.validation.engine import Rule, RuleEngine
+from tests.factories import make_version
+
+
+def test_warnings_follow_rule_order():
+    version = make_version(
+        name="Fraction",
+        core_definition="A fraction is part of a whole.",
+        learning_objective="know fractions",
+        examples=[],
+        prerequisites=[],
+        scope_boundaries="  ",
+    )
+
+    assert validate_concept_version(version) == [
+        "Learning objective should start with an observable verb "
+        "(e.g., identify, explain, calculate)",
+        "Core definition may be circular (concept name appears in definition)",
+        "No examples provided",
+        "Concept references other ideas but has no prerequisites listed",
+        "Scope boundaries are not defined",
+    ]
+
+
+def test_inline_validation_matches_the_rules():
+    versions = [
+        make_version(version_number=1),
+        make_version(version_number=2, core_definition="", scope_boundaries="Whole numbers"),
+        make_version(version_number=3, core_definition="x" * 301, learning_objective=""),
+        make_version(
+            version_number=4,
+            name="Fraction",
+            core_definition="A fraction is part of a whole.",
+            expanded_explanation=" ",
+            learning_objective="know fractions",
+            examples=[],
+            prerequisites=[],
+            scope_boundaries=None,
+        ),
+    ]
+    per_rule = RuleEngine(CONCEPT_RULES)
+
+    assert [concept_rule_engine.validate(v) for v in versions] == [
+        per_rule.validate(v) for v in versions
+    ]
+    assert per_rule.version != concept_rule_engine.version
+
+
+def _no_examples(v):
+    return not v.examples
+
+
+def test_rule_ids_are_unique():
+    rule = Rule(id="r", message="m", check=_no_examples)
+
+    with pytest.raises(ValueError, match="Duplicate rule id"):
+        RuleEngine([rule, rule])
+
+
+def test_ruleset_version_tracks_rule_changes():
+    rule = Rule(id="r", message="m", check=_no_examples)
+
+    assert RuleEngine([rule]).version == RuleEngine([rule]).version
+    assert RuleEngine([rule]).version != RuleEngine([replace(rule, message="n")]).version
+    assert RuleEngine([rule]).version != RuleEngine([replace(rule, check=lambda v: not v.prerequisites)]).version
+
+
+def test_ruleset_version_without_source_files(monkeypatch):
+    def no_source(obj):
+        raise OSError("could not get source code")
+
+    monkeypatch.setattr(inspect, "getsource", no_source)
+
+    assert RuleEngine(CONCEPT_RULES, inline=validate_concept_version).version
+
+
+def test_profile_times_every_rule():
+    engine = concept_rule_engine
+    version = make_version(examples=[])
+
+    profile = engine.profile(version)
+
+    assert profile.warnings == engine.validate(version)
+    assert [t.rule_id for t in profile.rules] == [r.id for r in engine.rules]
+    assert [t.rule_id for t in profile.rules if t.fired] == [
+        "examples.missing",
+        "scope_boundaries.missing",
+    ]
+    assert all(t.seconds >= 0 for t in profile.rules)
@@ -0,0 +1,46 @@
+from app.domain.concept.service import ConceptService
+from app.validation.metrics import NORMALIZE, RuleMetrics
+
+
+def _data():
+    return {
+        "name": "Numerator",
+        "core_definition": "The top number in a fraction.",
+        "expanded_explanation": "It tells how many parts are taken.",
+        "learning_objective": "Identify the numerator in a fraction",
+        "examples": [],
+        "prerequisites": ["Fraction"],
+    }
+
+
+def test_requested_profile_is_returned_and_recorded():
+    metrics = RuleMetrics(sample_rate=0)
+    service = ConceptService(metrics=metrics)
+
+    result = service.create_concept(_data(), "tester", profile=True)
+
+    assert result.profile is not None
+    assert result.profile.warnings == result.warnings
+    assert metrics.profiled == 1
+
+    stats = {s.rule_id: s for s in metrics.stats()}
+    assert NORMALIZE in stats
+    assert stats["examples.missing"].fired == 1
+    assert stats["core_definition.empty"].fired == 0
+    assert sum(stats["examples.missing"].duration_histogram.values()) == 1
+
+
+def test_unprofiled_validation_is_only_sampled():
+    metrics = RuleMetrics(sample_rate=0)
+    service = ConceptService(metrics=metrics)
+
+    result = service.create_concept(_data(), "tester")
+    assert result.profile is None
+    assert metrics.profiled == 0
+
+    metrics.sample_rate = 1.0
+    service.create_concept(_data(), "tester")
+    assert metrics.profiled == 1
+
+    metrics.reset()
+    assert metrics.stats() == []